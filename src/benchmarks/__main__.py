@@ -0,0 +1,136 @@
+"""
+Benchmark suite for PDFProcessor operations.
+
+Usage (from the src directory):
+    python -m benchmarks run -o results.json                 # default sizes and operations
+    python -m benchmarks run --sizes 10,100,1000 --ops compress,extract_text --repeats 10
+    python -m benchmarks corpus bench-corpus --sizes 10,100  # only generate the corpus
+    python -m benchmarks compare baseline.json results.json  # exit 1 on regressions
+    python -m benchmarks memory --sizes 200,1000             # exit 1 if a memory budget is exceeded
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+
+
+def _sizes(text: str):
+    return [int(size) for size in text.split(",") if size.strip()]
+
+
+def main(argv=None) -> int:
+    from benchmarks.compare import DEFAULT_THRESHOLD
+    from benchmarks.runner import DEFAULT_REPEATS, DEFAULT_SIZES, OPERATIONS
+
+    parser = argparse.ArgumentParser(prog="benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    default_corpus = os.path.join(tempfile.gettempdir(), "excode-bench-corpus")
+
+    p = sub.add_parser("run", help="Run the benchmarks")
+    p.add_argument("-o", "--output", help="Write results JSON here")
+    p.add_argument("--ops", help=f"Comma-separated operations (default: all of {', '.join(OPERATIONS)})")
+    p.add_argument("--sizes", type=_sizes, default=list(DEFAULT_SIZES), help="Comma-separated page counts")
+    p.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per case")
+    p.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    p.add_argument("--corpus", default=default_corpus, help="Corpus folder (generated once, then reused)")
+    p.add_argument("--baseline", help="Compare with this results file when done")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold (0.1 = 10%%)")
+
+    p = sub.add_parser("corpus", help="Generate the synthetic corpus")
+    p.add_argument("folder", nargs="?", default=default_corpus)
+    p.add_argument("--sizes", type=_sizes, default=list(DEFAULT_SIZES))
+    p.add_argument("--seed", type=int, default=0)
+
+    p = sub.add_parser("compare", help="Compare two results files")
+    p.add_argument("baseline")
+    p.add_argument("current")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold (0.1 = 10%%)")
+
+    p = sub.add_parser("memory", help="Profile peak memory against the budgets")
+    p.add_argument("-o", "--output", help="Write results JSON here")
+    p.add_argument("--ops", help="Comma-separated operations (default: all)")
+    p.add_argument("--sizes", type=_sizes, default=None, help="Comma-separated page counts (default: 200)")
+    p.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    p.add_argument("--corpus", default=default_corpus, help="Corpus folder (generated once, then reused)")
+    p.add_argument("--budgets", help='JSON file overriding budgets: {"operation": [base_mb, per_page_mb]}')
+
+    args = parser.parse_args(argv)
+    operations = [op.strip() for op in args.ops.split(",")] if getattr(args, "ops", None) else None
+    unknown = set(operations or ()) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operation(s): {', '.join(sorted(unknown))}")
+
+    if args.command == "corpus":
+        from benchmarks.corpus import KINDS, build_corpus
+        corpus = build_corpus(args.folder, list(KINDS), args.sizes, args.seed)
+        print(f"{len(corpus)} corpus entries in {args.folder}")
+        return 0
+
+    if args.command == "memory":
+        from benchmarks import memory
+
+        def report_memory(result):
+            line = f"{result['operation']:<19} {result['kind']:<8} x{result['size']:<5} "
+            if "rss_growth_bytes" not in result:
+                print(line + f"FAILED: {result['message']}{'  OVER BUDGET' if result.get('over_budget') else ''}")
+                return
+            budget = result["budget_mb"]
+            print(line + f"+{result['rss_growth_bytes'] / memory.MB:7.1f} MiB RSS "
+                  f"({result['growth_mb_per_page'] or 0:6.3f}/page, {result['growth_mb_per_input_mb'] or 0:6.2f}/input MB)  "
+                  f"python {result['traced_peak_bytes'] / memory.MB:6.1f} MiB  "
+                  f"budget {budget if budget is not None else '-':>7} MiB"
+                  f"{'  OVER BUDGET' if result['over_budget'] else ''}"
+                  f"{'' if result['ok'] else '  FAILED: ' + result['message']}")
+
+        results = memory.run(args.corpus, operations, args.sizes or list(memory.DEFAULT_SIZES), args.seed,
+                             memory.load_budgets(args.budgets), on_result=report_memory)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {args.output}")
+        over = [r for r in results["results"] if r.get("over_budget") or not r["ok"]]
+        print(f"{len(over)} case(s) failed or over budget")
+        return 1 if over else 0
+
+    from benchmarks.compare import compare, print_comparison
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        print_comparison(rows)
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    from benchmarks.runner import run
+
+    def report(result):
+        if result["ok"]:
+            latency = result["latency_ms"]
+            print(f"{result['operation']:<19} {result['kind']:<8} x{result['size']:<5} "
+                  f"p50 {latency['p50']:9.1f} ms  p90 {latency['p90']:9.1f} ms  "
+                  f"{result['pages_per_s'] or 0:8.1f} pages/s  peak {(result['peak_rss_bytes'] or 0) / 2**20:6.0f} MiB")
+        else:
+            print(f"{result['operation']:<19} {result['kind']:<8} x{result['size']:<5} FAILED: {result['message']}")
+
+    results = run(args.corpus, operations, args.sizes, args.repeats, args.seed, on_result=report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(json.load(f), results, args.threshold)
+        print_comparison(rows)
+        return 1 if any(row["regression"] for row in rows) else 0
+    return 0 if all(result["ok"] for result in results["results"]) else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
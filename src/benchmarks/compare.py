@@ -0,0 +1,69 @@
+"""
+Compare two benchmark result files.
+
+Cases are matched by (operation, kind, size). A case regresses when its
+median latency or peak memory grew by more than the threshold (and, for
+latency, by more than MIN_DELTA_MS, so sub-millisecond jitter on tiny
+inputs isn't reported).
+"""
+from typing import Dict, List, Tuple
+
+DEFAULT_THRESHOLD = 0.10  # 10 %
+MIN_DELTA_MS = 2.0
+
+
+def _key(result: Dict) -> Tuple[str, str, int]:
+    return result["operation"], result["kind"], result["size"]
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare matching cases.
+
+    Returns:
+        One row per case in `current`: {"case", "p50_ms": (old, new, change),
+        "peak_rss_bytes": (old, new, change), "regression": bool, "note"}
+        where change is the relative difference (0.1 = 10 % more).
+    """
+    old_results = {_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        case = "{} {} x{}".format(*_key(result))
+        old = old_results.get(_key(result))
+        if old is None:
+            rows.append({"case": case, "regression": False, "note": "new case"})
+            continue
+        if not result["ok"]:
+            rows.append({"case": case, "regression": old["ok"], "note": f"failed: {result['message']}"})
+            continue
+        if not old["ok"]:
+            rows.append({"case": case, "regression": False, "note": "failed in baseline"})
+            continue
+
+        row = {"case": case, "regression": False, "note": ""}
+        for field, old_value, new_value in (
+                ("p50_ms", old["latency_ms"]["p50"], result["latency_ms"]["p50"]),
+                ("peak_rss_bytes", old.get("peak_rss_bytes"), result.get("peak_rss_bytes"))):
+            if not old_value or new_value is None:
+                continue
+            change = (new_value - old_value) / old_value
+            row[field] = (old_value, new_value, round(change, 4))
+            if change > threshold and (field != "p50_ms" or new_value - old_value > MIN_DELTA_MS):
+                row["regression"] = True
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict]):
+    for row in rows:
+        parts = []
+        if "p50_ms" in row:
+            old, new, change = row["p50_ms"]
+            parts.append(f"p50 {old:.1f} -> {new:.1f} ms ({change:+.0%})")
+        if "peak_rss_bytes" in row:
+            old, new, change = row["peak_rss_bytes"]
+            parts.append(f"peak {old / 2**20:.0f} -> {new / 2**20:.0f} MiB ({change:+.0%})")
+        if row["note"]:
+            parts.append(row["note"])
+        print(f"{'REGRESSION' if row['regression'] else 'ok        '} {row['case']:<32} {'  '.join(parts)}")
+    print(f"{sum(row['regression'] for row in rows)} regression(s) in {len(rows)} case(s)")
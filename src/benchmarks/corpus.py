@@ -0,0 +1,148 @@
+"""
+Deterministic synthetic test documents.
+
+Every generator takes a page count and a seed and produces the same bytes
+each time (fixed metadata, no random document ID), so runs on different
+machines or days benchmark identical input.
+
+Kinds:
+    text    - pages of flowing text in a built-in font
+    scanned - each page is a single grayscale image of text (no text layer)
+    mixed   - alternating text and scanned pages
+    huge    - many short pages, for per-page overhead (page count x HUGE_FACTOR)
+    shared  - every page reuses the same image and font objects
+    images  - a folder of PNG files (for create_from_images)
+"""
+import os
+import random
+from typing import Dict, List
+
+import fitz  # PyMuPDF
+
+KINDS = ("text", "scanned", "mixed", "huge", "shared", "images")
+
+# "huge" documents have this many times the requested page count
+HUGE_FACTOR = 10
+
+PAGE_RECT = fitz.paper_rect("a4")
+SCAN_DPI = 100
+
+_WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+          "et dolore magna aliqua invoice total amount payment due date account number reference customer "
+          "address order quantity price description report summary page section figure table").split()
+
+_METADATA = {"producer": "excode-benchmarks", "creator": "excode-benchmarks", "title": "",
+             "author": "", "subject": "", "keywords": "",
+             "creationDate": "D:20240101000000Z", "modDate": "D:20240101000000Z"}
+
+
+def _paragraphs(rng: random.Random, words: int) -> str:
+    lines, line = [], []
+    for _ in range(words):
+        line.append(rng.choice(_WORDS))
+        if len(line) >= 12:
+            lines.append(" ".join(line))
+            line = []
+    lines.append(" ".join(line))
+    return "\n".join(lines)
+
+
+def _add_text_page(doc, rng: random.Random, words: int = 350):
+    page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    page.insert_textbox(PAGE_RECT + (50, 50, -50, -50), _paragraphs(rng, words), fontsize=10, fontname="helv")
+    return page
+
+
+def _scan_image(rng: random.Random) -> bytes:
+    """PNG of a rendered text page, as a scanner would produce it."""
+    src = fitz.open()
+    _add_text_page(src, rng)
+    pix = src[0].get_pixmap(dpi=SCAN_DPI, colorspace=fitz.csGRAY)
+    src.close()
+    return pix.tobytes("png")
+
+
+def _add_scanned_page(doc, rng: random.Random):
+    page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    page.insert_image(page.rect, stream=_scan_image(rng))
+
+
+def _save(doc, path: str):
+    doc.set_metadata(_METADATA)
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def make_pdf(kind: str, pages: int, path: str, seed: int = 0):
+    """Write a synthetic PDF of the given kind."""
+    rng = random.Random(f"{kind}:{pages}:{seed}")
+    doc = fitz.open()
+    if kind == "text":
+        for _ in range(pages):
+            _add_text_page(doc, rng)
+    elif kind == "scanned":
+        for _ in range(pages):
+            _add_scanned_page(doc, rng)
+    elif kind == "mixed":
+        for i in range(pages):
+            if i % 2:
+                _add_scanned_page(doc, rng)
+            else:
+                _add_text_page(doc, rng)
+    elif kind == "huge":
+        for _ in range(pages * HUGE_FACTOR):
+            _add_text_page(doc, rng, words=40)
+    elif kind == "shared":
+        logo = _scan_image(rng)
+        xref = 0
+        for _ in range(pages):
+            page = _add_text_page(doc, rng, words=200)
+            rect = fitz.Rect(PAGE_RECT.width - 200, 20, PAGE_RECT.width - 20, 200)
+            if xref:
+                page.insert_image(rect, xref=xref)  # Same image object on every page
+            else:
+                xref = page.insert_image(rect, stream=logo)
+    else:
+        raise ValueError(f"Unknown PDF kind: {kind}")
+    _save(doc, path)
+
+
+def make_images(count: int, folder: str, seed: int = 0) -> List[str]:
+    """Write `count` scanned-page PNGs and return their paths."""
+    rng = random.Random(f"images:{count}:{seed}")
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"scan_{i:04d}.png")
+        with open(path, "wb") as f:
+            f.write(_scan_image(rng))
+        paths.append(path)
+    return paths
+
+
+def build_corpus(folder: str, kinds: List[str], sizes: List[int], seed: int = 0) -> Dict[tuple, str]:
+    """
+    Generate (or reuse) every kind x size combination.
+
+    Files are named after kind, size and seed, so an existing corpus folder
+    is reused instead of regenerated.
+
+    Returns:
+        {(kind, size): path} - a folder for "images", a PDF otherwise
+    """
+    os.makedirs(folder, exist_ok=True)
+    corpus = {}
+    for kind in kinds:
+        for size in sizes:
+            name = f"{kind}_{size}_s{seed}"
+            path = os.path.join(folder, name if kind == "images" else name + ".pdf")
+            if not os.path.exists(path):
+                print(f"Generating {os.path.basename(path)}...")
+                partial = path + ".partial"
+                if kind == "images":
+                    make_images(size, partial, seed)
+                else:
+                    make_pdf(kind, size, partial, seed)
+                os.replace(partial, path)
+            corpus[(kind, size)] = path
+    return corpus
@@ -0,0 +1,236 @@
+"""
+Memory profiling of PDFProcessor operations.
+
+Each (operation, kind, size) case runs once in a freshly spawned process
+(nothing inherited from this one) with the PDF libraries already imported.
+Two measurements are taken, because most of the memory is allocated by
+MuPDF and pypdf's C code, which tracemalloc cannot see:
+
+    - tracemalloc peak: Python-level allocations
+    - RSS: sampled every SAMPLE_INTERVAL seconds, minus the RSS before the
+      operation started. On Linux the kernel's peak (VmHWM) is reset first
+      and used as well, so short spikes between samples aren't missed.
+      ru_maxrss can't be used: it can't be reset, and a spawned process
+      starts with its parent's
+
+The RSS growth is compared against MEMORY_BUDGETS, which allow a fixed
+amount plus an amount per page: budget = base_mb + per_page_mb * pages.
+A worker killed with SIGKILL (the kernel's OOM killer) counts as failed and
+over budget.
+"""
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.runner import (CASE_TIMEOUT, OPERATIONS, _input_stats, _prepare_source, _run_operation,
+                               skip_unavailable, wait_result)
+
+MB = 1024 * 1024
+
+DEFAULT_SIZES = (200,)
+SAMPLE_INTERVAL = 0.01
+
+# Operation -> (base MB, MB per page) of RSS growth allowed, about 3x what
+# the synthetic corpus needs (OCR: EasyOCR's models alone take ~1 GB)
+MEMORY_BUDGETS = {
+    "merge": (32, 0.5),
+    "split": (32, 0.25),
+    "compress": (64, 0.5),
+    "extract_text": (32, 0.5),
+    "rotate": (32, 0.25),
+    "add_password": (32, 0.25),
+    "search": (32, 0.25),
+    "ocr": (1536, 8.0),
+    "create_from_images": (64, 0.5),
+    "remove_password": (32, 0.25),
+    "split_by_interval": (32, 0.25),
+    "export_pdf_text": (32, 0.25),
+    "export_to_docx": (64, 0.5),
+    "extract_text_with_ocr": (1536, 8.0),
+    "modify_pdf": (32, 0.5),
+    "get_pdf_info": (32, 0.1),
+}
+
+
+def current_rss() -> Optional[int]:
+    """Resident memory of this process in bytes, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil  # macOS / Windows: optional
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter (Linux 4.0+); False if not supported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def kernel_peak_rss() -> Optional[int]:
+    """Peak RSS since the last reset_peak_rss() (VmHWM) in bytes, or None if unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024  # kB
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class RSSSampler(threading.Thread):
+    """Polls the process RSS in the background and keeps the highest value."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss() or 0
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            rss = current_rss()
+            if rss is None:
+                return
+            self.peak = max(self.peak, rss)
+            self.samples += 1
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+
+def _profile(operation: str, source: str, results):
+    """Worker process: run the operation once under tracemalloc and RSS sampling."""
+    import shutil
+    import tempfile
+    import tracemalloc
+
+    import fitz  # noqa: F401 - imported up front so library code isn't counted
+    import pypdf  # noqa: F401
+    from core.pdf_processor import PDFProcessor  # noqa: F401
+
+    work_dir = tempfile.mkdtemp(prefix="excode-mem-")
+    try:
+        source = _prepare_source(operation, source, work_dir)
+        kernel_peak = reset_peak_rss()
+        baseline = current_rss() or 0
+        sampler = RSSSampler()
+        sampler.start()
+        tracemalloc.start()
+        start = time.perf_counter()
+        success, message = _run_operation(operation, source, work_dir)
+        elapsed = time.perf_counter() - start
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sampled_peak = sampler.stop()
+        peak = max(sampled_peak, (kernel_peak_rss() or 0) if kernel_peak else 0)
+        results.put((success, message, elapsed, baseline, peak, traced_peak, sampler.samples))
+    except Exception as e:
+        results.put((False, str(e), 0.0, None, None, None, 0))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def budget_mb(operation: str, pages: int, budgets: Dict[str, Tuple[float, float]] = MEMORY_BUDGETS) -> Optional[float]:
+    if operation not in budgets:
+        return None
+    base, per_page = budgets[operation]
+    return base + per_page * pages
+
+
+def profile_case(operation: str, kind: str, size: int, source: str,
+                 budgets: Dict[str, Tuple[float, float]] = MEMORY_BUDGETS, timeout: float = CASE_TIMEOUT) -> Dict:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_profile, args=(operation, source, results), daemon=True)
+    proc.start()
+    outcome, failure = wait_result(proc, results, timeout)
+    success, message, elapsed, baseline, peak, traced_peak, samples = \
+        outcome or (False, failure, 0.0, None, None, None, 0)
+    if proc.exitcode and success:
+        success, message = False, f"worker exited with code {proc.exitcode}"
+
+    pages, input_bytes = _input_stats(kind, source)
+    result = {"operation": operation, "kind": kind, "size": size, "pages": pages, "input_bytes": input_bytes,
+              "ok": bool(success), "message": message, "exit_code": proc.exitcode,
+              "seconds": round(elapsed, 3), "rss_samples": samples}
+    if outcome is None and proc.exitcode == -signal.SIGKILL:
+        result["over_budget"] = True  # Most likely killed for running out of memory
+    if peak:
+        growth = max(0, peak - baseline)
+        limit = budget_mb(operation, pages, budgets)
+        result.update({
+            "baseline_rss_bytes": baseline, "peak_rss_bytes": peak, "rss_growth_bytes": growth,
+            "traced_peak_bytes": traced_peak,
+            "growth_mb_per_page": round(growth / MB / pages, 3) if pages else None,
+            "growth_mb_per_input_mb": round(growth / input_bytes, 3) if input_bytes else None,
+            "budget_mb": limit,
+            "over_budget": limit is not None and growth / MB > limit,
+        })
+    return result
+
+
+def load_budgets(path: Optional[str]) -> Dict[str, Tuple[float, float]]:
+    """MEMORY_BUDGETS, overridden by a JSON file of {"operation": [base_mb, per_page_mb]}."""
+    budgets = dict(MEMORY_BUDGETS)
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            budgets.update({op: tuple(value) for op, value in json.load(f).items()})
+    return budgets
+
+
+def run(corpus_dir: str, operations: Optional[List[str]] = None, sizes: List[int] = DEFAULT_SIZES,
+        seed: int = 0, budgets: Dict[str, Tuple[float, float]] = MEMORY_BUDGETS,
+        on_result: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Profile the memory of every operation over the corpus.
+
+    Args:
+        corpus_dir: Where the synthetic corpus is generated (and reused)
+        operations: Subset of OPERATIONS to run (default: all)
+        sizes: Page counts (image counts for create_from_images)
+        seed: Corpus seed
+        budgets: Operation -> (base MB, MB per page)
+        on_result: Optional callable(result) after each case
+    """
+    from benchmarks.corpus import build_corpus
+
+    operations = skip_unavailable(list(operations or OPERATIONS))
+
+    kinds = sorted({kind for op in operations for kind in OPERATIONS[op]})
+    corpus = build_corpus(corpus_dir, kinds, sizes, seed)
+
+    results = []
+    for operation in operations:
+        for kind in OPERATIONS[operation]:
+            for size in sizes:
+                result = profile_case(operation, kind, size, corpus[(kind, size)], budgets)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": sys.platform,
+        "config": {"operations": operations, "sizes": list(sizes), "seed": seed,
+                   "budgets": {op: list(value) for op, value in budgets.items()}},
+        "results": results,
+    }
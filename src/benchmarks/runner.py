@@ -0,0 +1,283 @@
+"""
+Benchmark runner.
+
+Runs PDFProcessor operations over a synthetic corpus. Each (operation,
+kind, size) case runs in a fresh worker process, so its peak memory is its
+own: one warm-up call, then `repeats` timed calls. Throughput is based on
+the median latency; rss_growth_bytes is the peak minus the worker's memory
+before the first call. A worker that crashes (e.g. killed for running out of
+memory) or runs longer than CASE_TIMEOUT fails its case with the exit code.
+Results are JSON:
+
+    {"version": 1, "created": ..., "machine": {...}, "config": {...},
+     "results": [{"operation": "compress", "kind": "scanned", "size": 10, "pages": 10,
+                  "input_bytes": ..., "latency_ms": {"min", "p50", "p90", "p99", "max", "mean"},
+                  "pages_per_s": ..., "mb_per_s": ..., "peak_rss_bytes": ..., "rss_growth_bytes": ...,
+                  "ok": true, "message": "..."}]}
+
+Every PDFProcessor operation has a case except the folder and image
+variants of ones that are covered (make_searchable_folder,
+extract_text_from_image) and the helpers that only write given text
+(export_to_txt; export_to_docx is run on a PDF's text).
+"""
+import glob
+import queue
+import math
+import multiprocessing
+import os
+import platform
+import shutil
+import tempfile
+import time
+from importlib.util import find_spec
+from typing import Callable, Dict, List, Optional, Tuple
+
+RESULT_VERSION = 1
+
+# Operation -> corpus kinds it is run on
+OPERATIONS = {
+    "merge": ("text", "mixed", "shared"),
+    "split": ("text", "huge"),
+    "compress": ("scanned", "mixed", "shared"),
+    "extract_text": ("text", "mixed", "huge"),
+    "rotate": ("text", "huge"),
+    "add_password": ("text", "shared"),
+    "search": ("text", "huge"),
+    "ocr": ("scanned",),
+    "create_from_images": ("images",),
+    "remove_password": ("text", "shared"),
+    "split_by_interval": ("text", "huge"),
+    "export_pdf_text": ("text", "huge"),
+    "export_to_docx": ("text",),
+    "extract_text_with_ocr": ("scanned",),
+    "modify_pdf": ("text", "huge"),
+    "get_pdf_info": ("text", "huge"),
+}
+
+# Skipped when no OCR engine is installed
+OCR_OPERATIONS = ("ocr", "extract_text_with_ocr")
+
+DEFAULT_SIZES = (10, 50)
+DEFAULT_REPEATS = 5
+CASE_TIMEOUT = 1800.0  # Seconds a case's worker may run before it is killed
+
+
+def ocr_available() -> bool:
+    return find_spec("easyocr") is not None or find_spec("pytesseract") is not None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def skip_unavailable(operations: List[str]) -> List[str]:
+    """Drop the OCR operations if no OCR engine is installed."""
+    if ocr_available():
+        return operations
+    skipped = [op for op in operations if op in OCR_OPERATIONS]
+    if skipped:
+        print(f"Skipping {', '.join(skipped)}: neither easyocr nor pytesseract is installed")
+    return [op for op in operations if op not in OCR_OPERATIONS]
+
+
+def _prepare_source(operation: str, source: str, work_dir: str) -> str:
+    """Input an operation is measured on; set up before any measurement starts."""
+    if operation == "remove_password":
+        from core.pdf_processor import PDFProcessor
+        locked = os.path.join(work_dir, "locked.pdf")
+        success, message = PDFProcessor.add_password(source, locked, "benchmark")
+        if not success:
+            raise RuntimeError(f"Could not encrypt the input: {message}")
+        return locked
+    return source
+
+
+def _run_operation(operation: str, source: str, work_dir: str) -> Tuple[bool, str]:
+    """Run one operation on a corpus file (or image folder), writing into work_dir."""
+    from core.pdf_processor import PDFProcessor
+
+    out = os.path.join(work_dir, "out.pdf")
+    if operation == "merge":
+        return PDFProcessor.merge_pdfs([source, source], out)
+    if operation == "split":
+        split_dir = os.path.join(work_dir, "split")
+        shutil.rmtree(split_dir, ignore_errors=True)
+        os.makedirs(split_dir)
+        return PDFProcessor.split_pdf(source, split_dir)
+    if operation == "compress":
+        return PDFProcessor.compress_pdf(source, out, "medium")
+    if operation == "extract_text":
+        success, text = PDFProcessor.extract_text(source)
+        return success, f"{len(text)} characters" if success else text
+    if operation == "rotate":
+        import fitz
+        with fitz.open(source) as doc:
+            pages = list(range(1, doc.page_count + 1))
+        return PDFProcessor.rotate_pages(source, out, pages, 90)
+    if operation == "add_password":
+        return PDFProcessor.add_password(source, out, "benchmark")
+    if operation == "search":
+        success, hits = PDFProcessor.search_in_pdf(source, "invoice")
+        return success, f"{len(hits)} pages matched" if success else str(hits)
+    if operation == "ocr":
+        return PDFProcessor.make_searchable_pdf(source, out, dpi=150)
+    if operation == "create_from_images":
+        images = sorted(glob.glob(os.path.join(source, "*.png")))
+        return PDFProcessor.create_from_images(images, out)
+    if operation == "remove_password":
+        return PDFProcessor.remove_password(source, out, "benchmark")
+    if operation == "split_by_interval":
+        split_dir = os.path.join(work_dir, "split")
+        shutil.rmtree(split_dir, ignore_errors=True)
+        os.makedirs(split_dir)
+        return PDFProcessor.split_by_interval(source, split_dir, 5)
+    if operation == "export_pdf_text":
+        return PDFProcessor.export_pdf_text(source, os.path.join(work_dir, "out.txt"))
+    if operation == "export_to_docx":
+        return PDFProcessor.export_to_docx(PDFProcessor.iter_page_text(source), os.path.join(work_dir, "out.docx"))
+    if operation == "extract_text_with_ocr":
+        success, text = PDFProcessor.extract_text_with_ocr(source)
+        return success, f"{len(text)} characters" if success else text
+    if operation == "modify_pdf":
+        import fitz
+        with fitz.open(source) as doc:
+            pages = doc.page_count
+        actions = [{"type": "add_text", "page": n, "x": 72, "y": 40, "text": "Reviewed"} for n in range(pages)]
+        actions += [{"type": "rotate", "page": 0, "angle": 90}, {"type": "delete", "page": pages - 1}]
+        return PDFProcessor.modify_pdf(source, out, actions)
+    if operation == "get_pdf_info":
+        info = PDFProcessor.get_pdf_info(source)
+        return "error" not in info, info.get("error", f"{info['pages']} pages")
+    return False, f"Unknown operation: {operation}"
+
+
+def _case(operation: str, source: str, repeats: int, results):
+    """Worker process: warm up, time `repeats` runs, report latencies and memory."""
+    from core.batch_engine import _peak_rss
+
+    work_dir = tempfile.mkdtemp(prefix="excode-bench-")
+    try:
+        source = _prepare_source(operation, source, work_dir)
+        baseline_rss = _peak_rss()
+        success, message = _run_operation(operation, source, work_dir)  # Warm-up (imports, caches)
+        latencies = []
+        for _ in range(repeats if success else 0):
+            start = time.perf_counter()
+            success, message = _run_operation(operation, source, work_dir)
+            latencies.append(time.perf_counter() - start)
+            if not success:
+                break
+        peak_rss = _peak_rss()
+        results.put((success, message, latencies, peak_rss, baseline_rss))
+    except Exception as e:
+        results.put((False, str(e), [], None, None))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _input_stats(kind: str, source: str) -> Tuple[int, int]:
+    """(pages, bytes) of a case's input."""
+    if kind == "images":
+        files = glob.glob(os.path.join(source, "*.png"))
+        return len(files), sum(os.path.getsize(f) for f in files)
+    import fitz
+    with fitz.open(source) as doc:
+        return doc.page_count, os.path.getsize(source)
+
+
+def wait_result(proc, results, timeout: float = CASE_TIMEOUT) -> Tuple[Optional[tuple], str]:
+    """
+    Wait for a case worker's result without hanging if the worker dies.
+
+    Returns:
+        (result, "") or (None, why there is none); the worker has exited
+        either way (one running past the timeout is killed)
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = results.get(timeout=0.5)
+            break
+        except queue.Empty:
+            if not proc.is_alive():
+                try:  # It may have reported just before exiting
+                    result = results.get(timeout=0.5)
+                    break
+                except queue.Empty:
+                    proc.join()
+                    # -9 usually means the kernel's OOM killer
+                    return None, f"worker exited with code {proc.exitcode}"
+            if time.monotonic() > deadline:
+                proc.terminate()  # Not SIGKILL, which callers take as the OOM killer
+                proc.join()
+                return None, f"timed out after {timeout:.0f} s"
+    proc.join()
+    return result, ""
+
+
+def run_case(operation: str, kind: str, size: int, source: str, repeats: int,
+             timeout: float = CASE_TIMEOUT) -> Dict:
+    ctx = multiprocessing.get_context()
+    results = ctx.Queue()
+    proc = ctx.Process(target=_case, args=(operation, source, repeats, results), daemon=True)
+    proc.start()
+    outcome, failure = wait_result(proc, results, timeout)
+    success, message, latencies, peak_rss, baseline_rss = outcome or (False, failure, [], None, None)
+
+    pages, input_bytes = _input_stats(kind, source)
+    result = {"operation": operation, "kind": kind, "size": size, "pages": pages,
+              "input_bytes": input_bytes, "repeats": len(latencies), "ok": bool(success and latencies),
+              "message": message, "exit_code": proc.exitcode, "peak_rss_bytes": peak_rss,
+              "rss_growth_bytes": peak_rss - baseline_rss if peak_rss and baseline_rss else None}
+    if latencies:
+        ms = [t * 1000 for t in latencies]
+        p50 = percentile(latencies, 50)
+        result["latency_ms"] = {"min": round(min(ms), 3), "p50": round(percentile(ms, 50), 3),
+                                "p90": round(percentile(ms, 90), 3), "p99": round(percentile(ms, 99), 3),
+                                "max": round(max(ms), 3), "mean": round(sum(ms) / len(ms), 3)}
+        result["pages_per_s"] = round(pages / p50, 2) if p50 else None
+        result["mb_per_s"] = round(input_bytes / 1e6 / p50, 3) if p50 else None
+    return result
+
+
+def run(corpus_dir: str, operations: Optional[List[str]] = None, sizes: List[int] = DEFAULT_SIZES,
+        repeats: int = DEFAULT_REPEATS, seed: int = 0,
+        on_result: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Run the benchmark matrix and return the results document.
+
+    Args:
+        corpus_dir: Where the synthetic corpus is generated (and reused)
+        operations: Subset of OPERATIONS to run (default: all)
+        sizes: Page counts (image counts for create_from_images)
+        repeats: Timed runs per case, after one warm-up run
+        seed: Corpus seed
+        on_result: Optional callable(result) after each case
+    """
+    from benchmarks.corpus import build_corpus
+
+    operations = skip_unavailable(list(operations or OPERATIONS))
+
+    kinds = sorted({kind for op in operations for kind in OPERATIONS[op]})
+    corpus = build_corpus(corpus_dir, kinds, sizes, seed)
+
+    results = []
+    for operation in operations:
+        for kind in OPERATIONS[operation]:
+            for size in sizes:
+                result = run_case(operation, kind, size, corpus[(kind, size)], repeats)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+    return {
+        "version": RESULT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor(), "cpu_count": os.cpu_count()},
+        "config": {"operations": operations, "sizes": list(sizes), "repeats": repeats, "seed": seed},
+        "results": results,
+    }
@@ -1,7 +1,9 @@
 import os
 import re
 from typing import List, Tuple, Dict, Optional
-import requests
+from core.lazy_import import lazy_import
+
+requests = lazy_import("requests")  # Only needed once a lookup runs
 from enum import Enum
 
 
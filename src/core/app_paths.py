@@ -0,0 +1,13 @@
+import os
+import sys
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory for the app (thumbnails, job and result databases, ...)."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "ExcodePDF")
@@ -0,0 +1,662 @@
+import csv
+import heapq
+import io
+import json
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class BatchOperationType(Enum):
+    """Types of batch operations."""
+    MERGE = "merge"
+    SPLIT = "split"
+    COMPRESS = "compress"
+    EXTRACT_TEXT = "extract_text"
+    ROTATE = "rotate"
+    PASSWORD_ADD = "add_password"
+    PASSWORD_REMOVE = "remove_password"
+    OCR = "ocr"
+    PIPELINE = "pipeline"
+
+
+class BatchJob:
+    """Represents a single batch job."""
+
+    def __init__(self, operation_type: BatchOperationType, input_files: List[str],
+                 output_path: str, params: Dict[str, Any] = None, priority: int = 0):
+        """
+        Initialize batch job.
+
+        Args:
+            operation_type: Type of operation
+            input_files: List of input file paths
+            output_path: Output file/directory path
+            params: Additional parameters for the operation
+            priority: Jobs with a higher priority are started first
+        """
+        self.operation_type = operation_type
+        self.input_files = input_files
+        self.output_path = output_path
+        self.params = params or {}
+        self.priority = priority
+        self.status = "pending"
+        self.result = None
+        self.error = None
+        self.job_id = None  # Set when the job is persisted in a JobStore
+        self.attempts = 0  # Retries used so far
+        self.not_before = 0.0  # Earliest time.time() for the next attempt
+        self.metrics: Optional[JobMetrics] = None  # Resource usage of the last run
+
+
+class JobMetrics:
+    """Resource usage of one job run, measured in its worker process."""
+
+    FIELDS = ("wall_time", "cpu_time", "peak_rss", "pages", "bytes_read", "bytes_written")
+
+    def __init__(self, wall_time: float = 0.0, cpu_time: Optional[float] = None,
+                 peak_rss: Optional[int] = None, pages: int = 0,
+                 bytes_read: int = 0, bytes_written: int = 0):
+        """
+        Initialize job metrics.
+
+        Args:
+            wall_time: Elapsed seconds
+            cpu_time: CPU seconds (user + system) used by the worker
+            peak_rss: Peak resident memory of the worker in bytes, if known
+            pages: Pages in the job's input PDFs
+            bytes_read: Total size of the input files
+            bytes_written: Total size of the files written to the job's outputs
+        """
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.peak_rss = peak_rss
+        self.pages = pages
+        self.bytes_read = bytes_read
+        self.bytes_written = bytes_written
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+def pipeline_job(input_file: str, stages: List[Dict[str, Any]], output_path: str,
+                 priority: int = 0) -> BatchJob:
+    """
+    Build a job that runs several operations on one file, in memory between stages.
+
+    Each stage is a dict: {"op": BatchOperationType or its value, "params": {...},
+    "id": optional name, "after": optional list of stage ids, "output": optional path}.
+    Without "after" a stage takes the previous stage's result (the first
+    takes input_file), so a plain list is a chain like OCR -> compress ->
+    encrypt. "after" naming several stages feeds them all in (e.g. merge),
+    and several stages may branch off the same one. Stages nothing depends
+    on are written to disk: to their "output", or output_path when there is
+    exactly one such stage.
+    """
+    normalized = []
+    for i, stage in enumerate(stages):
+        op = stage["op"]
+        normalized.append({
+            "id": stage.get("id", str(i)),
+            "op": op.value if isinstance(op, BatchOperationType) else op,
+            "params": stage.get("params", {}),
+            "after": stage.get("after", [normalized[-1]["id"]] if normalized else []),
+            "output": stage.get("output"),
+        })
+    return BatchJob(BatchOperationType.PIPELINE, [input_file], output_path,
+                    {"stages": normalized}, priority)
+
+
+# How many jobs of each kind may run at once. OCR and compression are CPU and
+# memory heavy; password changes and rotation are quick I/O-bound rewrites.
+DEFAULT_OPERATION_LIMITS = {
+    BatchOperationType.OCR: 1,
+    BatchOperationType.COMPRESS: 2,
+}
+
+# Per-operation semaphores shared by the engine's worker processes. The
+# scheduler caps whole jobs; these also cap pipeline stages, which is what
+# lets one file's pipeline compress while another's waits for the OCR slot.
+_operation_slots = {}
+
+# Shared with the engine: index of the operation whose slot this worker holds
+# (-1 for none), so the slot can be released if the worker is terminated
+_held_slot = None
+
+_OPERATIONS = list(BatchOperationType)
+
+
+@contextmanager
+def _operation_slot(op: BatchOperationType):
+    slot = _operation_slots.get(op)
+    if slot is None:
+        yield
+        return
+    with slot:
+        if _held_slot is not None:
+            _held_slot.value = _OPERATIONS.index(op)
+        try:
+            yield
+        finally:
+            if _held_slot is not None:
+                _held_slot.value = -1
+
+
+def job_output_targets(job: BatchJob) -> List[str]:
+    """Paths (files or directories) a job writes its results to."""
+    if job.operation_type == BatchOperationType.PIPELINE:
+        stages = job.params["stages"]
+        parents = {parent for stage in stages for parent in stage["after"]}
+        finals = [stage for stage in stages if stage["id"] not in parents]
+        return [stage["output"] or job.output_path for stage in finals]
+    return [job.output_path]
+
+
+def job_output_files(job: BatchJob, since: float) -> List[str]:
+    """
+    Files a finished job wrote.
+
+    For directory targets (split) only files split_pdf names after the job's
+    input ("<name>_page_<n>.pdf", "<name>_split.pdf") and modified since
+    `since` count, so files that other jobs write to the same folder at the
+    same time are not claimed.
+    """
+    base_name = re.escape(os.path.basename(job.input_files[0]).replace(".pdf", ""))
+    split_name = re.compile(rf"{base_name}_(page_\d+|split)\.pdf")
+    files = []
+    for target in job_output_targets(job):
+        if os.path.isdir(target):
+            for entry in os.scandir(target):
+                if entry.is_file() and split_name.fullmatch(entry.name) and entry.stat().st_mtime >= since - 1:
+                    files.append(entry.path)
+        elif os.path.exists(target):
+            files.append(target)
+    return files
+
+
+def run_operation(op: BatchOperationType, inputs: List, output, params: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Run one PDFProcessor operation.
+
+    Inputs and output are paths or in-memory files (pipeline stages).
+    """
+    if not inputs:
+        return False, "No input files"
+    with _operation_slot(op):
+        return _dispatch(op, inputs, output, params)
+
+
+def _dispatch(op: BatchOperationType, inputs: List, output, params: Dict[str, Any]) -> Tuple[bool, str]:
+    from core.pdf_processor import PDFProcessor
+
+    source = inputs[0]
+    if op == BatchOperationType.MERGE:
+        return PDFProcessor.merge_pdfs(inputs, output)
+    if op == BatchOperationType.SPLIT:
+        return PDFProcessor.split_pdf(source, output, mode=params.get("mode", "all"),
+                                      page_range=params.get("page_range"))
+    if op == BatchOperationType.COMPRESS:
+        return PDFProcessor.compress_pdf(source, output, params.get("quality", "medium"))
+    if op == BatchOperationType.EXTRACT_TEXT:
+        return PDFProcessor.export_pdf_text(source, output, params.get("page_range"))
+    if op == BatchOperationType.ROTATE:
+        return PDFProcessor.rotate_pages(source, output, params.get("pages", []), params.get("angle", 90))
+    if op == BatchOperationType.PASSWORD_ADD:
+        return PDFProcessor.add_password(source, output, params["password"])
+    if op == BatchOperationType.PASSWORD_REMOVE:
+        return PDFProcessor.remove_password(source, output, params["password"])
+    if op == BatchOperationType.OCR:
+        return PDFProcessor.make_searchable_pdf(source, output, dpi=params.get("dpi", 200))
+    return False, f"Unsupported operation: {op}"
+
+
+# Stages whose result is not a single PDF, so nothing can be chained after them
+_TERMINAL_OPERATIONS = {BatchOperationType.SPLIT, BatchOperationType.EXTRACT_TEXT}
+
+
+def run_pipeline(job: BatchJob) -> Tuple[bool, str]:
+    """
+    Run a pipeline job's stages in order, handing documents over in memory.
+
+    Intermediate results live in BytesIO buffers that are freed as soon as
+    the last stage reading them has run; only final stages write files.
+    """
+    stages = job.params["stages"]
+    ids = [stage["id"] for stage in stages]
+    readers = {stage_id: 0 for stage_id in ids}
+    for index, stage in enumerate(stages):
+        for parent in stage["after"]:
+            if parent not in ids[:index]:
+                return False, f"Stage '{stage['id']}' depends on unknown or later stage '{parent}'"
+            if BatchOperationType(stages[ids.index(parent)]["op"]) in _TERMINAL_OPERATIONS:
+                return False, f"Stage '{stage['id']}' cannot follow a {stages[ids.index(parent)]['op']} stage"
+            readers[parent] += 1
+    final = [stage for stage in stages if not readers[stage["id"]]]
+
+    buffers = {}
+    messages = []
+    source_name = os.path.basename(job.input_files[0])
+    for stage in stages:
+        op = BatchOperationType(stage["op"])
+        if stage["after"]:
+            inputs = []
+            for parent in stage["after"]:
+                buffers[parent].seek(0)
+                inputs.append(buffers[parent])
+        else:
+            inputs = list(job.input_files)
+
+        if readers[stage["id"]]:
+            output = io.BytesIO()
+            output.name = source_name  # Lets split/extract name their outputs
+        else:
+            output = stage["output"] or (job.output_path if len(final) == 1 else None)
+            if not output:
+                return False, f"Final stage '{stage['id']}' needs an output path"
+
+        success, message = run_operation(op, inputs, output, stage["params"])
+        if not success:
+            return False, f"{op.value} failed: {message}"
+        messages.append(message)
+        if readers[stage["id"]]:
+            buffers[stage["id"]] = output
+
+        # Release inputs nobody else is waiting for
+        for parent in stage["after"]:
+            readers[parent] -= 1
+            if not readers[parent]:
+                buffers.pop(parent).close()
+
+    return True, " | ".join(messages)
+
+
+def execute_job(job: BatchJob) -> Tuple[bool, str]:
+    """
+    Run a batch job with the matching PDFProcessor operation.
+
+    This is the default processor function used by BatchEngine; it runs
+    inside a worker process.
+
+    Returns:
+        Tuple of (success, message)
+    """
+    if job.operation_type == BatchOperationType.PIPELINE:
+        return run_pipeline(job)
+    return run_operation(job.operation_type, job.input_files, job.output_path, job.params)
+
+
+def _peak_rss() -> Optional[int]:
+    """
+    Peak resident memory of this process in bytes, or None if unavailable.
+
+    On Linux this is the peak since the last _reset_peak_rss(), so a reused
+    worker reports each job's own peak; elsewhere it covers the whole process.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024  # kB
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+    except ImportError:
+        pass
+    try:
+        import psutil  # Windows: optional
+        return psutil.Process().memory_info().peak_wset
+    except (ImportError, AttributeError):
+        return None
+
+
+def _reset_peak_rss():
+    """Reset the kernel's peak RSS counter (Linux 4.0+; a no-op elsewhere)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _path_bytes(path: str, since: float = 0.0) -> int:
+    """Size of a file, or of the files in a directory modified after `since`."""
+    try:
+        if os.path.isdir(path):
+            return sum(entry.stat().st_size for entry in os.scandir(path)
+                       if entry.is_file() and entry.stat().st_mtime >= since)
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _measure_inputs(job: BatchJob) -> Tuple[int, int]:
+    """(pages, bytes) of a job's input files."""
+    import fitz
+
+    pages = size = 0
+    for path in job.input_files:
+        size += _path_bytes(path)
+        if path.lower().endswith(".pdf"):
+            try:
+                with fitz.open(path) as doc:
+                    pages += doc.page_count
+            except Exception:
+                pass
+    return pages, size
+
+
+def init_worker(slots: Dict[BatchOperationType, Any], held=None):
+    """
+    Share the per-operation semaphores with a worker process.
+
+    Args:
+        slots: Semaphore per capped operation type, created by the parent
+        held: Optional shared int the worker sets to the operation whose slot
+              it holds, so the parent can release it if the worker is killed
+    """
+    global _held_slot
+    _operation_slots.update(slots)
+    _held_slot = held
+
+
+def measure_job(processor_func: Callable, job: BatchJob, label: Any = None) -> Tuple[bool, str, Dict[str, Any]]:
+    """
+    Run a job in the current (worker) process and measure its resource usage.
+
+    Args:
+        processor_func: Function taking the BatchJob and returning (success, message)
+        job: The job
+        label: Names the job in diagnostics
+
+    Returns:
+        Tuple of (success, message, metrics as a dict)
+    """
+    started = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        success, message = processor_func(job)
+    except Exception as e:
+        success, message = False, str(e)
+
+    metrics = JobMetrics(wall_time=time.perf_counter() - wall_start, cpu_time=time.process_time() - cpu_start,
+                         peak_rss=_peak_rss())
+    try:
+        metrics.pages, metrics.bytes_read = _measure_inputs(job)
+        metrics.bytes_written = sum(_path_bytes(path, started) for path in job_output_targets(job))
+    except Exception as e:
+        print(f"Batch job {label}: could not measure inputs/outputs: {e}")
+    return bool(success), str(message), metrics.to_dict()
+
+
+def worker_context():
+    """
+    Multiprocessing context for worker processes.
+
+    The GUI runs batches while other threads (thumbnails, prefetching,
+    warm-up) may hold locks; a forked child would inherit those locks held
+    and could deadlock, so workers are started from a clean process instead.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _engine_worker(processor_func: Callable, tasks, results, slots, held):
+    """
+    Worker process entry point: run (index, job) tasks until None arrives,
+    reporting (index, success, message, metrics) for each.
+    """
+    init_worker(slots, held)
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        index, job = task
+        _reset_peak_rss()
+        results.put((index, *measure_job(processor_func, job, index)))
+
+
+def export_metrics(jobs: List[BatchJob], output_path: str) -> Tuple[bool, str]:
+    """
+    Write per-job metrics of a batch as CSV, or JSON when output_path ends in .json.
+
+    Jobs that never ran (skipped, cancelled before starting) have empty metrics.
+    """
+    rows = []
+    for index, job in enumerate(jobs):
+        row = {"index": index, "job_id": job.job_id, "operation": job.operation_type.value,
+               "input_files": ";".join(job.input_files), "status": job.status, "attempts": job.attempts}
+        row.update(job.metrics.to_dict() if job.metrics else dict.fromkeys(JobMetrics.FIELDS))
+        rows.append(row)
+
+    try:
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            if output_path.lower().endswith(".json"):
+                json.dump(rows, f, indent=2)
+            else:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["index"])
+                writer.writeheader()
+                writer.writerows(rows)
+        return True, f"Metrics for {len(rows)} jobs saved to {output_path}"
+    except Exception as e:
+        return False, str(e)
+
+
+class BatchEngine:
+    """
+    Runs batch jobs in worker processes.
+
+    Up to `max_workers` jobs run at once, higher-priority jobs start first,
+    and each operation type can be capped separately. Jobs run in worker
+    processes (see worker_context) that are started on demand and reused
+    for the following jobs; cancelling a running job terminates its worker
+    instead of waiting for it to finish, and the worker is replaced when
+    the next job needs one. Per-operation caps also apply to each stage of
+    a pipeline job, so separate files' pipelines run side by side, each at
+    its own stage. Failed jobs are retried up to `max_retries`
+    times, waiting retry_backoff, 2x, 4x, ... seconds between attempts.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 operation_limits: Optional[Dict[BatchOperationType, int]] = None,
+                 max_retries: int = 0, retry_backoff: float = 2.0):
+        """
+        Initialize the engine.
+
+        Args:
+            max_workers: Maximum number of concurrent jobs (default: CPU count, max 4)
+            operation_limits: Per-operation concurrency caps (default: DEFAULT_OPERATION_LIMITS)
+            max_retries: How many times a failed job is run again
+            retry_backoff: Delay in seconds before the first retry; doubles each time
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.operation_limits = dict(DEFAULT_OPERATION_LIMITS if operation_limits is None else operation_limits)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._cancelled = set()
+        self._incoming = []  # Jobs added while run() is going
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def add(self, job: BatchJob):
+        """Queue another job on a running run(); it is appended to that run's job list."""
+        with self._lock:
+            self._incoming.append(job)
+
+    def cancel(self, index: int):
+        """Cancel one job: skip it if pending, terminate it if running."""
+        with self._lock:
+            self._cancelled.add(index)
+
+    def stop(self):
+        """Cancel every pending and running job."""
+        self._stop_event.set()
+
+    def _take_cancelled(self):
+        with self._lock:
+            cancelled, self._cancelled = self._cancelled, set()
+        return cancelled
+
+    def _take_incoming(self):
+        with self._lock:
+            incoming, self._incoming = self._incoming, []
+        return incoming
+
+    def run(self, jobs: List[BatchJob], processor_func: Callable = execute_job,
+            on_started: Optional[Callable[[int], None]] = None,
+            on_completed: Optional[Callable[[int, bool, str], None]] = None,
+            on_retry: Optional[Callable[[int, str, float], None]] = None,
+            follow: bool = False):
+        """
+        Run jobs to completion, blocking the calling thread.
+
+        Jobs passed to add() during the run are appended to `jobs` and
+        scheduled like the others. With follow, the run keeps waiting for
+        added jobs after the queue drains, until stop() is called.
+
+        Args:
+            jobs: Jobs to run; callbacks refer to them by their index in this list
+            processor_func: Module-level function taking a BatchJob and returning
+                            (success, message); it is run in a worker process
+            on_started: Optional callable(index) when a job starts
+            on_completed: Optional callable(index, success, message) when a job
+                          finishes, fails for good or is cancelled; job.metrics
+                          is already set when it is called
+            on_retry: Optional callable(index, error, delay) when a failed job is
+                      queued to run again after `delay` seconds
+            follow: Keep running (idle) until stop() instead of returning when done
+        """
+        self._stop_event.clear()
+        ctx = worker_context()
+        results = ctx.Queue()
+        slots = {op: ctx.BoundedSemaphore(limit) for op, limit in self.operation_limits.items()}
+
+        # Heap of (-priority, index): highest priority first, then submission order
+        pending = [(-job.priority, i) for i, job in enumerate(jobs) if job.status == "pending"]
+        heapq.heapify(pending)
+        # Workers are (process, task queue, shared slot marker (see _held_slot))
+        idle = []
+        running = {}  # index -> worker
+        start_times = {}  # index -> perf_counter() at start
+        active = {}   # operation type -> running count
+
+        def start(index, job):
+            if idle:
+                worker = idle.pop()
+            else:
+                tasks, held = ctx.SimpleQueue(), ctx.Value("i", -1)
+                proc = ctx.Process(target=_engine_worker, args=(processor_func, tasks, results, slots, held),
+                                   daemon=True)
+                proc.start()
+                worker = (proc, tasks, held)
+            worker[1].put((index, job))
+            running[index] = worker
+
+        def finish(index, success, message, status=None, metrics=None):
+            job = jobs[index]
+            start = start_times.pop(index, None)
+            if metrics:
+                job.metrics = JobMetrics(**metrics)
+            elif start is not None:
+                # Cancelled or crashed: only the elapsed time is known
+                job.metrics = JobMetrics(wall_time=time.perf_counter() - start)
+            worker = running.pop(index, None)
+            if worker is not None:
+                proc, _, marker = worker
+                active[job.operation_type] -= 1
+                if status is None and proc.is_alive():
+                    idle.append(worker)  # Done with the job; reuse it
+                else:
+                    proc.join()
+                    # A terminated worker can't release its operation slot itself
+                    if marker.value >= 0:
+                        slots[_OPERATIONS[marker.value]].release()
+            
+            if not success and status is None and job.attempts < self.max_retries:
+                delay = self.retry_backoff * 2 ** job.attempts
+                job.attempts += 1
+                job.status = "pending"
+                job.error = message
+                job.not_before = time.time() + delay
+                heapq.heappush(pending, (-job.priority, index))
+                if on_retry:
+                    on_retry(index, message, delay)
+                return
+            
+            job.status = status or ("completed" if success else "failed")
+            if success:
+                job.result = message
+            else:
+                job.error = message
+            if on_completed:
+                on_completed(index, success, message)
+
+        try:
+            while pending or running or (follow and not self._stop_event.is_set()):
+                for job in self._take_incoming():
+                    jobs.append(job)
+                    if job.status == "pending":
+                        heapq.heappush(pending, (-job.priority, len(jobs) - 1))
+
+                cancelled = self._take_cancelled()
+                if self._stop_event.is_set():
+                    cancelled |= set(running) | {i for _, i in pending}
+
+                for index in cancelled:
+                    if index in running:
+                        running[index][0].terminate()
+                        finish(index, False, "Cancelled", "cancelled")
+                    elif jobs[index].status == "pending":
+                        finish(index, False, "Cancelled", "cancelled")
+                pending = [entry for entry in pending if jobs[entry[1]].status == "pending"]
+                heapq.heapify(pending)
+
+                # Start the highest-priority jobs whose operation still has a free slot
+                # and that are not waiting out a retry delay
+                deferred = []
+                now = time.time()
+                while pending and len(running) < self.max_workers:
+                    entry = heapq.heappop(pending)
+                    job = jobs[entry[1]]
+                    limit = self.operation_limits.get(job.operation_type)
+                    if job.not_before > now or (limit is not None and active.get(job.operation_type, 0) >= limit):
+                        deferred.append(entry)
+                        continue
+
+                    index = entry[1]
+                    job.status = "running"
+                    start(index, job)
+                    start_times[index] = time.perf_counter()
+                    active[job.operation_type] = active.get(job.operation_type, 0) + 1
+                    if on_started:
+                        on_started(index)
+                for entry in deferred:
+                    heapq.heappush(pending, entry)
+
+                try:
+                    index, success, message, metrics = results.get(timeout=0.1)
+                    if index in running:
+                        finish(index, success, message, metrics=metrics)
+                except queue.Empty:
+                    # A worker that died without reporting (crash, out of memory)
+                    for index, (proc, _, _) in list(running.items()):
+                        if not proc.is_alive() and results.empty():
+                            finish(index, False, f"Worker exited with code {proc.exitcode}")
+        finally:
+            for proc, _, _ in running.values():
+                proc.terminate()
+            for proc, tasks, _ in idle:
+                tasks.put(None)
+            for proc, _, _ in list(running.values()) + idle:
+                proc.join()
+            results.close()
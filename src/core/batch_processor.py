@@ -1,41 +1,78 @@
 import os
-from typing import List, Dict, Callable, Any, Tuple
-from enum import Enum
+import time
+from typing import List, Callable, Optional, Dict, Any, Tuple
 from PySide6.QtCore import QObject, Signal, QThread
+from core.batch_engine import (BatchEngine, BatchJob, BatchOperationType, JobMetrics, execute_job,
+                               export_metrics, pipeline_job)
+from core.job_store import JobStore, missing_secrets, restore_secrets
+from core.result_cache import ResultCache
 
 
-class BatchOperationType(Enum):
-    """Types of batch operations."""
-    MERGE = "merge"
-    SPLIT = "split"
-    COMPRESS = "compress"
-    EXTRACT_TEXT = "extract_text"
-    ROTATE = "rotate"
-    PASSWORD_ADD = "add_password"
-    PASSWORD_REMOVE = "remove_password"
-
-
-class BatchJob:
-    """Represents a single batch job."""
+class BatchThread(QThread):
+    """Drives a BatchEngine off the GUI thread."""
     
-    def __init__(self, operation_type: BatchOperationType, input_files: List[str], 
-                 output_path: str, params: Dict[str, Any] = None):
-        """
-        Initialize batch job.
+    def __init__(self, processor: "BatchProcessor", processor_func: Callable):
+        super().__init__()
+        self.processor = processor
+        self.processor_func = processor_func
+    
+    def run(self):
+        processor = self.processor
         
-        Args:
-            operation_type: Type of operation
-            input_files: List of input file paths
-            output_path: Output file/directory path
-            params: Additional parameters for the operation
-        """
-        self.operation_type = operation_type
-        self.input_files = input_files
-        self.output_path = output_path
-        self.params = params or {}
-        self.status = "pending"
-        self.result = None
-        self.error = None
+        jobs = processor.jobs
+        store = processor.store
+        cache = processor.result_cache
+        fingerprints = {}
+        started_at = {}
+        
+        if cache:
+            # Like a build system: jobs whose inputs, settings and outputs are
+            # unchanged since their last successful run are not run again
+            func = self.processor_func
+            processor_name = f"{func.__module__}.{func.__qualname__}"
+            for index, job in enumerate(jobs):
+                if job.status != "pending":
+                    continue
+                try:
+                    fingerprints[index] = cache.fingerprint(job, processor_name)
+                except OSError:
+                    continue  # Missing input; the job itself will report it
+                message = cache.lookup(fingerprints[index])
+                if message is not None:
+                    job.status = "completed"
+                    job.result = f"Up to date: {message}"
+                    if store:
+                        store.update(job)
+                    processor.job_completed.emit(index, True, job.result)
+        
+        def on_started(index):
+            processor.current_job_index = index
+            started_at[index] = time.time()
+            if store:
+                store.update(jobs[index])
+            processor.job_started.emit(index)
+        
+        def on_completed(index, success, message):
+            if store:
+                store.update(jobs[index])
+            if cache and success and index in fingerprints:
+                cache.record(fingerprints[index], jobs[index], message, started_at[index])
+            if jobs[index].metrics:
+                processor.job_metrics.emit(index, jobs[index].metrics.to_dict())
+            processor.job_completed.emit(index, success, message)
+        
+        def on_retry(index, error, delay):
+            if store:
+                store.update(jobs[index])
+            print(f"Batch job {index} failed ({error}), retrying in {delay:.1f}s")
+        
+        # Signals emitted here are queued to receivers on the GUI thread
+        processor.engine.run(jobs, self.processor_func,
+                             on_started=on_started,
+                             on_completed=on_completed,
+                             on_retry=on_retry)
+        processor.is_running = False
+        processor.batch_completed.emit()
 
 
 class BatchProcessor(QObject):
@@ -44,76 +81,184 @@ class BatchProcessor(QObject):
     # Signals for progress updates
     job_started = Signal(int)  # job_index
     job_completed = Signal(int, bool, str)  # job_index, success, message
+    job_metrics = Signal(int, dict)  # job_index, JobMetrics.to_dict()
     batch_completed = Signal()
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, operation_limits=None,
+                 store: Optional[JobStore] = None, max_retries: int = 0, retry_backoff: float = 2.0,
+                 result_cache: Optional[ResultCache] = None):
+        """
+        Initialize batch processor.
+        
+        Args:
+            max_workers: Maximum number of jobs run in parallel (default: CPU count, max 4)
+            operation_limits: Optional dict of BatchOperationType -> max concurrent jobs
+            store: Optional JobStore; jobs and their outcomes are persisted as they
+                   change, so an interrupted batch can be resumed
+            max_retries: How many times a failed job is run again
+            retry_backoff: Seconds before the first retry; doubles with each retry
+            result_cache: Optional ResultCache; jobs already done with the same
+                          input content, operation, params and untouched outputs
+                          are skipped
+        """
         super().__init__()
         self.jobs: List[BatchJob] = []
         self.current_job_index = 0
         self.is_running = False
+        self.store = store
+        self.result_cache = result_cache
+        self.engine = BatchEngine(max_workers, operation_limits, max_retries, retry_backoff)
+        self.thread = None
     
     def add_job(self, job: BatchJob):
         """Add a job to the batch queue."""
+        if self.store:
+            self.store.add_job(job)
         self.jobs.append(job)
     
+    def add_jobs(self, jobs: List[BatchJob]):
+        """Add many jobs at once (a single transaction when a store is used)."""
+        jobs = list(jobs)
+        if self.store:
+            self.store.add_jobs(jobs)
+        self.jobs.extend(jobs)
+    
+    def add_pipeline(self, input_files: List[str], stages: List[Dict[str, Any]], output_dir: str,
+                     priority: int = 0):
+        """
+        Queue a multi-stage pipeline (e.g. OCR -> compress -> encrypt) for each file.
+        
+        Each file becomes one job whose intermediate documents stay in memory;
+        with several workers, different files are at different stages at once.
+        See batch_engine.pipeline_job for the stage format.
+        
+        Args:
+            input_files: PDF files to run the pipeline on
+            stages: Stage dicts, in order
+            output_dir: Directory for each file's final output (same file name)
+            priority: Priority of the created jobs
+        """
+        self.add_jobs([pipeline_job(path, stages, os.path.join(output_dir, os.path.basename(path)), priority)
+                       for path in input_files])
+    
     def clear_jobs(self):
         """Clear all jobs from the queue."""
+        if self.store:
+            self.store.clear()
         self.jobs.clear()
         self.current_job_index = 0
     
     def remove_job(self, index: int):
         """Remove a job from the queue by index."""
         if 0 <= index < len(self.jobs):
-            self.jobs.pop(index)
+            job = self.jobs.pop(index)
+            if self.store and job.job_id is not None:
+                self.store.remove_job(job.job_id)
             if self.current_job_index >= index and self.current_job_index > 0:
                 self.current_job_index -= 1
     
-    def process_batch(self, processor_func: Callable):
+    def resume(self, retry_failed: bool = True, secrets: Optional[Dict[str, str]] = None) -> int:
         """
-        Process all jobs in the batch.
+        Reload the unfinished jobs of an interrupted batch from the store.
+        
+        Completed jobs are skipped, jobs that were running when the app stopped
+        are queued again, and (with retry_failed) failed jobs get another round
+        of retries. Call process_batch() afterwards to run them.
+        
+        Passwords are never stored, so password jobs need them again: jobs
+        whose secrets are not in `secrets` are marked failed (and picked up
+        by the next resume with retry_failed).
         
         Args:
-            processor_func: Function to call for processing each job
+            retry_failed: Also queue failed jobs again
+            secrets: Secret params by name, e.g. {"password": "..."}
+        
+        Returns:
+            Number of jobs queued
         """
-        self.is_running = True
+        if not self.store or self.is_running:
+            return 0
+        self.store.recover(retry_failed)
+        self.jobs = []
+        for job in self.store.load_jobs(["pending"]):
+            needed = missing_secrets(job.params)
+            if needed:
+                params = restore_secrets(job.params, secrets or {})
+                if params is None:
+                    job.status = "failed"
+                    job.error = f"Needs {', '.join(needed)} again (not stored); pass it to resume()"
+                    self.store.update(job)
+                    continue
+                job.params = params
+            self.jobs.append(job)
+        self.current_job_index = 0
+        return len(self.jobs)
+    
+    def process_batch(self, processor_func: Callable = execute_job):
+        """
+        Process all pending jobs in worker processes, without blocking the caller.
         
-        for i, job in enumerate(self.jobs):
-            if not self.is_running:
-                break
-            
-            self.current_job_index = i
-            self.job_started.emit(i)
-            
-            try:
-                # Call processor function with job details
-                success, message = processor_func(job)
-                job.status = "completed" if success else "failed"
-                job.result = message
-                self.job_completed.emit(i, success, message)
-            except Exception as e:
-                job.status = "failed"
-                job.error = str(e)
-                self.job_completed.emit(i, False, str(e))
+        job_started / job_completed fire per job as they happen (jobs run
+        concurrently and by priority, so not necessarily in list order);
+        batch_completed fires once every job has finished or been cancelled.
         
-        self.is_running = False
-        self.batch_completed.emit()
+        Args:
+            processor_func: Module-level function taking a BatchJob and returning
+                            (success, message); defaults to the built-in operations
+        """
+        if self.is_running:
+            return
+        self.is_running = True
+        self.thread = BatchThread(self, processor_func)
+        self.thread.start()
+    
+    def wait(self):
+        """Block until the running batch has finished."""
+        if self.thread:
+            self.thread.wait()
+    
+    def cancel_job(self, index: int):
+        """Cancel a single job, terminating it if it is already running."""
+        self.engine.cancel(index)
     
     def stop(self):
-        """Stop batch processing."""
-        self.is_running = False
+        """Stop batch processing, cancelling pending and running jobs."""
+        self.engine.stop()
+    
+    def export_metrics(self, output_path: str) -> Tuple[bool, str]:
+        """
+        Save per-job metrics (wall/CPU time, peak RSS, pages, bytes) as CSV or JSON.
+        
+        With a store this covers the whole batch, including jobs run before a resume.
+        
+        Args:
+            output_path: Path of the .csv or .json file
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        jobs = self.store.load_jobs() if self.store else self.jobs
+        return export_metrics(jobs, output_path)
+    
+    def _count(self, status: Optional[str] = None) -> int:
+        # With a store the counts cover the whole batch, including jobs
+        # finished before a resume, and come from the indexed status column
+        if self.store:
+            return self.store.count(status)
+        return len([j for j in self.jobs if status is None or j.status == status])
     
     def get_job_count(self) -> int:
         """Get total number of jobs."""
-        return len(self.jobs)
+        return self._count()
     
     def get_pending_count(self) -> int:
         """Get number of pending jobs."""
-        return len([j for j in self.jobs if j.status == "pending"])
+        return self._count("pending")
     
     def get_completed_count(self) -> int:
         """Get number of completed jobs."""
-        return len([j for j in self.jobs if j.status == "completed"])
+        return self._count("completed")
     
     def get_failed_count(self) -> int:
         """Get number of failed jobs."""
-        return len([j for j in self.jobs if j.status == "failed"])
+        return self._count("failed")
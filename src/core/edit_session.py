@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional
+
+
+class EditSession:
+    """
+    Non-destructive edits to a PDF, recorded as an operation log with undo/redo.
+
+    Pages are always referred to by their index in the original file. Nothing
+    touches the document until compile_actions() turns the whole log into a
+    single modify_pdf() call.
+    """
+
+    def __init__(self, page_count: int):
+        """
+        Initialize an edit session.
+
+        Args:
+            page_count: Number of pages in the document being edited
+        """
+        self.page_count = page_count
+        self.operations: List[Dict] = []
+        self.redo_stack: List[Dict] = []
+        self._replay()
+
+    # --- Recording ---------------------------------------------------------
+
+    def rotate(self, pages: List[int], angle: int):
+        """Rotate pages (original indices) by a multiple of 90 degrees."""
+        pages = [p for p in pages if p in self.rotations]
+        if pages and angle % 360:
+            self._record({"type": "rotate", "pages": pages, "angle": angle})
+
+    def delete(self, pages: List[int]):
+        """Remove pages (original indices) from the output."""
+        pages = [p for p in pages if p in self._kept]
+        if pages:
+            self._record({"type": "delete", "pages": pages})
+
+    def set_order(self, order: List[int]):
+        """Reorder the remaining pages; `order` must hold exactly the pages not deleted."""
+        order = list(order)
+        if order != self.order and sorted(order) == sorted(self.order):
+            self._record({"type": "set_order", "order": order})
+
+    def add_text(self, page: int, text: str, x: float, y: float,
+                 fontsize: float = 12, color=(0, 0, 0)):
+        """Stamp text onto a page (original index) at (x, y) in points."""
+        self._record({"type": "add_text", "page": page, "text": text,
+                      "x": x, "y": y, "fontsize": fontsize, "color": color})
+
+    def _record(self, op: Dict):
+        self.operations.append(op)
+        self.redo_stack.clear()
+        self._apply(op)
+
+    # --- Undo / redo -------------------------------------------------------
+
+    def can_undo(self) -> bool:
+        return bool(self.operations)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def undo(self) -> Optional[Dict]:
+        """Revert the last operation; returns it, or None if there was nothing to undo."""
+        if not self.operations:
+            return None
+        op = self.operations.pop()
+        self.redo_stack.append(op)
+        self._replay()
+        return op
+
+    def redo(self) -> Optional[Dict]:
+        """Re-apply the last undone operation; returns it, or None."""
+        if not self.redo_stack:
+            return None
+        op = self.redo_stack.pop()
+        self.operations.append(op)
+        self._apply(op)
+        return op
+
+    @property
+    def modified(self) -> bool:
+        return bool(self.compile_actions())
+
+    # --- State -------------------------------------------------------------
+
+    def _replay(self):
+        # Undo rebuilds the state from the log; edits are cheap compared with a PDF write
+        self.order = list(range(self.page_count))
+        self.rotations = {p: 0 for p in range(self.page_count)}
+        self.texts: List[Dict] = []
+        self._kept = set(self.order)
+        for op in self.operations:
+            self._apply(op)
+
+    def _apply(self, op: Dict):
+        if op["type"] == "rotate":
+            for p in op["pages"]:
+                self.rotations[p] = (self.rotations[p] + op["angle"]) % 360
+        elif op["type"] == "delete":
+            removed = set(op["pages"])
+            self.order = [p for p in self.order if p not in removed]
+            self._kept -= removed
+        elif op["type"] == "set_order":
+            self.order = list(op["order"])
+        elif op["type"] == "add_text":
+            self.texts.append(op)
+
+    def text_count(self, page: int) -> int:
+        return sum(1 for t in self.texts if t["page"] == page)
+
+    # --- Output ------------------------------------------------------------
+
+    def compile_actions(self) -> List[Dict]:
+        """
+        Collapse the log into the minimal action list for PDFProcessor.modify_pdf.
+
+        Rotations on the same page are summed modulo 360 and dropped when they
+        cancel out, edits to deleted pages are dropped, and every move and
+        delete becomes one final set_order (omitted when nothing moved).
+        """
+        kept = self._kept
+        actions = [{"type": "rotate", "page": p, "angle": angle}
+                   for p, angle in sorted(self.rotations.items()) if angle and p in kept]
+        actions.extend(dict(t) for t in self.texts if t["page"] in kept)
+        if self.order != list(range(self.page_count)):
+            actions.append({"type": "set_order", "order": list(self.order)})
+        return actions
@@ -0,0 +1,362 @@
+import os
+import queue
+import struct
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from PIL import Image
+
+# Engineering drawings routinely exceed PIL's default decompression-bomb limit
+# (~89 MP). Only images opened inside large_image_limit() are allowed up to
+# this; PIL's own setting is never changed, so other PIL users (QR codes, OCR
+# preprocessing) keep the default even while a conversion runs.
+LARGE_IMAGE_PIXELS = 1_000_000_000
+
+_large = threading.local()
+_install_lock = threading.Lock()
+_pil_bomb_check = None
+
+
+def _bomb_check(size: Tuple[int, int]):
+    """PIL's size check, with LARGE_IMAGE_PIXELS as the limit for threads inside large_image_limit()."""
+    if not getattr(_large, "depth", 0):
+        return _pil_bomb_check(size)
+    pixels = size[0] * size[1]
+    if Image.MAX_IMAGE_PIXELS and pixels > max(Image.MAX_IMAGE_PIXELS, LARGE_IMAGE_PIXELS):
+        raise Image.DecompressionBombError(
+            f"Image size ({pixels} pixels) exceeds limit of {LARGE_IMAGE_PIXELS} pixels")
+
+
+@contextmanager
+def large_image_limit():
+    """
+    Allow images up to LARGE_IMAGE_PIXELS to be opened and decoded inside the block.
+
+    PIL checks every open (and TIFF/GIF frame decode) against one
+    process-wide limit, so rather than raising it, PIL's check is wrapped
+    once with one that only relaxes the limit for the calling thread.
+    """
+    global _pil_bomb_check
+    with _install_lock:
+        if _pil_bomb_check is None:
+            _pil_bomb_check = Image._decompression_bomb_check
+            Image._decompression_bomb_check = _bomb_check
+    _large.depth = getattr(_large, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _large.depth -= 1
+
+
+class ImageInfo:
+    """Header information for a single input image."""
+
+    def __init__(self, path: str, format: Optional[str], width: int, height: int,
+                 dpi: Optional[Tuple[float, float]] = None, frame: int = 0, frames: int = 1):
+        """
+        Initialize image info.
+
+        Args:
+            path: Path to the image file
+            format: Image format as reported by PIL (e.g. 'JPEG', 'PNG')
+            width: Width in pixels
+            height: Height in pixels
+            dpi: Optional (x, y) resolution stored in the file
+            frame: Frame index within a multi-frame file (e.g. TIFF page)
+            frames: Total number of frames in the file
+        """
+        self.path = path
+        self.format = format
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self.frame = frame
+        self.frames = frames
+
+    @property
+    def passthrough(self) -> bool:
+        """Whether the encoded file can be embedded in a PDF byte-for-byte."""
+        return self.format in ImageReader.PASSTHROUGH_FORMATS
+
+    @property
+    def native(self) -> bool:
+        """Whether MuPDF can read this frame without a PIL decode."""
+        # MuPDF's image loader only ever returns the first frame
+        return self.format in ImageReader.NATIVE_FORMATS and self.frame == 0
+
+    def page_size(self) -> Tuple[float, float]:
+        """Page size in points, using the same resolution fallback as MuPDF."""
+        xres, yres = self.dpi or (0, 0)
+        xres = xres if xres and xres > 1 else ImageReader.DEFAULT_DPI
+        yres = yres if yres and yres > 1 else ImageReader.DEFAULT_DPI
+        return self.width * 72.0 / xres, self.height * 72.0 / yres
+
+
+class RawImage:
+    """An already-encoded PDF image stream covering rows [y, y + rows) of a frame."""
+
+    def __init__(self, y: int, rows: int, pdf_dict: str, data: bytes,
+                 filter: Optional[str] = None, decode_parms: Optional[str] = None):
+        """
+        Initialize raw image.
+
+        Args:
+            y: First pixel row of the frame covered by this stream
+            rows: Number of pixel rows in this stream
+            pdf_dict: PDF image dictionary without /Filter and /DecodeParms
+            data: Encoded stream bytes, copied into the PDF unchanged
+            filter: PDF filter name (e.g. '/FlateDecode'), None for raw samples
+            decode_parms: Optional PDF /DecodeParms dictionary
+        """
+        self.y = y
+        self.rows = rows
+        self.pdf_dict = pdf_dict
+        self.data = data
+        self.filter = filter
+        self.decode_parms = decode_parms
+
+
+class ImageReader:
+    """Reads image headers for PDF creation without decoding pixel data."""
+
+    # Formats whose compressed stream is a valid PDF image filter (DCTDecode / JPXDecode)
+    PASSTHROUGH_FORMATS = {"JPEG", "JPEG2000"}
+
+    # Formats MuPDF can load itself (decoded once, straight into the PDF)
+    NATIVE_FORMATS = {"JPEG", "JPEG2000", "PNG", "BMP", "GIF", "TIFF", "PPM", "PSD"}
+
+    # Formats whose every frame becomes its own page
+    MULTIFRAME_FORMATS = {"TIFF"}
+
+    # MuPDF assumes 96 DPI when a file carries no resolution
+    DEFAULT_DPI = 96
+
+    # TIFF compression tag -> PDF filter for strips that can be copied as-is
+    TIFF_FILTERS = {1: None, 4: "/CCITTFaxDecode", 5: "/LZWDecode", 8: "/FlateDecode", 32946: "/FlateDecode"}
+
+    # Above this many strips a frame is decoded instead of split into XObjects
+    MAX_TIFF_STRIPS = 1024
+
+    @staticmethod
+    def probe(path: str) -> List[ImageInfo]:
+        """
+        Read format, size and resolution of every frame from an image header.
+
+        PIL opens files lazily and seeking between TIFF frames only walks the
+        IFD chain, so no pixel data is decoded.
+        """
+        with large_image_limit(), Image.open(path) as img:
+            frames = getattr(img, "n_frames", 1) if img.format in ImageReader.MULTIFRAME_FORMATS else 1
+            infos = []
+            for frame in range(frames):
+                if frame:
+                    img.seek(frame)
+                dpi = img.info.get("dpi")
+                if dpi:
+                    dpi = (float(dpi[0]), float(dpi[1]))
+                infos.append(ImageInfo(path, img.format, img.width, img.height, dpi, frame, frames))
+            return infos
+
+    @staticmethod
+    def png_stream(path: str) -> Optional[RawImage]:
+        """
+        Re-wrap PNG image data as a PDF Flate stream without decoding it.
+
+        PNG row filters are exactly PDF's /Predictor 15, so the concatenated
+        IDAT chunks can be copied into the PDF. Interlaced images and images
+        with alpha or tRNS transparency return None.
+        """
+        with open(path, "rb") as f:
+            if f.read(8) != b"\x89PNG\r\n\x1a\n":
+                return None
+            header = palette = None
+            data = bytearray()
+            while True:
+                chunk = f.read(8)
+                if len(chunk) < 8:
+                    return None
+                length, ctype = struct.unpack(">I4s", chunk)
+                if ctype == b"IDAT":
+                    data += f.read(length)
+                elif ctype == b"IHDR":
+                    header = f.read(length)
+                elif ctype == b"PLTE":
+                    palette = f.read(length)
+                elif ctype == b"tRNS":
+                    return None
+                elif ctype == b"IEND":
+                    break
+                else:
+                    f.seek(length, os.SEEK_CUR)
+                f.seek(4, os.SEEK_CUR)  # CRC
+
+        width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+        if interlace or color_type not in (0, 2, 3):
+            return None
+        if color_type == 3:
+            if not palette:
+                return None
+            colors = 1
+            colorspace = f"[/Indexed/DeviceRGB {len(palette) // 3 - 1}<{palette.hex()}>]"
+        else:
+            colors = 3 if color_type == 2 else 1
+            colorspace = "/DeviceRGB" if color_type == 2 else "/DeviceGray"
+
+        pdf_dict = (f"<</Type/XObject/Subtype/Image/Width {width}/Height {height}"
+                    f"/ColorSpace{colorspace}/BitsPerComponent {depth}>>")
+        parms = f"<</Predictor 15/Colors {colors}/BitsPerComponent {depth}/Columns {width}>>"
+        return RawImage(0, height, pdf_dict, bytes(data), "/FlateDecode", parms)
+
+    @staticmethod
+    def tiff_strips(path: str, frame: int = 0) -> Optional[Iterator[RawImage]]:
+        """
+        Stream the strips of a TIFF frame as PDF image streams, one at a time.
+
+        Uncompressed, LZW, Deflate and CCITT G4 strips map directly onto PDF
+        filters, so a huge scan is embedded strip by strip without ever
+        holding its decoded bitmap. Returns None when the frame's layout
+        (tiles, alpha, palettes, JPEG, ...) needs a real decode.
+        """
+        with large_image_limit(), Image.open(path) as img:
+            img.seek(frame)
+            tags = img.tag_v2
+            width, height = img.size
+            compression = tags.get(259, 1)
+            photometric = tags.get(262)
+            bits = tuple(tags.get(258, (1,)))
+            samples = tags.get(277, 1)
+            predictor = tags.get(317, 1)
+            offsets = tags.get(273)
+            counts = tags.get(279)
+            rows_per_strip = min(tags.get(278, height), height)
+
+            if (compression not in ImageReader.TIFF_FILTERS or 322 in tags
+                    or tags.get(284, 1) != 1 or tags.get(266, 1) != 1 or tags.get(338)
+                    or not offsets or not counts or len(offsets) > ImageReader.MAX_TIFF_STRIPS):
+                return None
+            if len(set(bits)) != 1 or bits[0] not in (1, 8) or len(bits) != samples:
+                return None
+            if not ((photometric in (0, 1) and samples == 1) or (photometric == 2 and samples == 3)):
+                return None
+            if compression == 4 and (bits[0] != 1 or tags.get(293, 0) & 2):
+                return None
+            if predictor not in (1, 2) or (predictor == 2 and compression not in (5, 8, 32946)):
+                return None
+
+        depth = bits[0]
+        colorspace = "/DeviceRGB" if samples == 3 else "/DeviceGray"
+        pdf_filter = ImageReader.TIFF_FILTERS[compression]
+        # WhiteIsZero samples need inverting; CCITT handles it through /BlackIs1
+        decode = "/Decode[1 0]" if photometric == 0 and compression != 4 else ""
+
+        def strips():
+            with open(path, "rb") as f:
+                for index, (offset, count) in enumerate(zip(offsets, counts)):
+                    y = index * rows_per_strip
+                    rows = min(rows_per_strip, height - y)
+                    if rows <= 0:
+                        break
+                    f.seek(offset)
+                    data = f.read(count)
+
+                    parms = None
+                    if compression == 4:
+                        black_is_1 = "true" if photometric == 1 else "false"
+                        parms = f"<</K -1/Columns {width}/Rows {rows}/BlackIs1 {black_is_1}>>"
+                    elif predictor == 2:
+                        parms = f"<</Predictor 2/Colors {samples}/BitsPerComponent {depth}/Columns {width}>>"
+
+                    pdf_dict = (f"<</Type/XObject/Subtype/Image/Width {width}/Height {rows}"
+                                f"/ColorSpace{colorspace}/BitsPerComponent {depth}{decode}>>")
+                    yield RawImage(y, rows, pdf_dict, data, pdf_filter, parms)
+
+        return strips()
+
+    @staticmethod
+    def iter_probed(paths: Iterable[str], max_workers: Optional[int] = None,
+                    window: Optional[int] = None) -> Iterator[ImageInfo]:
+        """
+        Probe image headers in parallel threads, yielding results in input order.
+
+        Only `window` probes are in flight at any time, so memory stays bounded
+        no matter how many paths are given.
+
+        Args:
+            paths: Image file paths
+            max_workers: Number of probe threads (default: CPU count, max 8)
+            window: Maximum number of outstanding probes (default: 4x workers)
+
+        Yields:
+            ImageInfo for every frame of each path; probe errors are raised in order
+        """
+        max_workers = max_workers or min(8, os.cpu_count() or 1)
+        window = window or max_workers * 4
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = deque()
+            for path in paths:
+                pending.append(pool.submit(ImageReader.probe, path))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    @staticmethod
+    def iter_prefetched(paths: Iterable[str], prefetch: int = 32) -> Iterator[Tuple[ImageInfo, Optional[bytes]]]:
+        """
+        Probe and read images on a background thread, ahead of the consumer.
+
+        A bounded queue of `prefetch` items sits between the reader and the
+        caller, so decoding/disk I/O overlaps page insertion without letting
+        the read-ahead grow without limit.
+
+        Args:
+            paths: Image file paths
+            prefetch: Maximum number of images buffered ahead of the consumer
+
+        Yields:
+            (ImageInfo, data) tuples in input order; data holds the raw file
+            bytes for pass-through formats and is None otherwise. Closing
+            the generator stops the read-ahead thread.
+        """
+        stop_event = threading.Event()
+        buffer = queue.Queue(maxsize=max(1, prefetch))
+        done = object()
+
+        def put(item):
+            while not stop_event.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for info in ImageReader.iter_probed(paths):
+                    data = None
+                    if info.passthrough:
+                        with open(info.path, "rb") as f:
+                            data = f.read()
+                    if not put((info, data)):
+                        return
+                put(done)
+            except Exception as e:
+                put(e)
+
+        reader = threading.Thread(target=produce, name="image-prefetch", daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop_event.set()
+            reader.join()
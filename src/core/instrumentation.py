@@ -0,0 +1,246 @@
+"""
+Operation-level instrumentation.
+
+PDFProcessor operations are decorated with @instrumented, which times each
+call and records whether it succeeded (from the (bool, ...) result, or an
+{"error": ...} dict for operations returning a dict). Inside
+an operation, `with stage("render"):` adds the block's time to that stage
+of the current operation, and count("thumbnail_cache.hit") bumps a counter
+(process-wide, and on the current operation if there is one). Finished
+operations are handed to every registered sink; `recent`, an in-memory ring
+buffer, is always registered and is what the Settings view shows.
+
+Only the calling process is instrumented: work done in worker processes
+(parallel text extraction, batch jobs) counts towards the operation waiting
+for it, but its stages are not reported.
+"""
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Stage names used by PDFProcessor
+STAGES = ("parse", "extract", "render", "preprocess", "ocr", "encode", "write")
+
+
+@dataclass
+class OperationRecord:
+    """Timing of one operation call."""
+    name: str
+    started: float  # time.time()
+    seconds: float = 0.0
+    ok: bool = True
+    error: str = ""
+    stages: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    parent: Optional[str] = None  # Operation this one was called from
+
+
+_enabled = True
+_local = threading.local()
+_sinks: List[Callable[[OperationRecord], None]] = []
+_counters: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def set_enabled(enabled: bool):
+    """Turn instrumentation on or off (off: operations run unwrapped, sinks get nothing)."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def add_sink(sink: Callable[[OperationRecord], None]):
+    """Register a callable(record) called after every operation (on the operation's thread)."""
+    with _lock:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+
+def remove_sink(sink: Callable[[OperationRecord], None]):
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def _stack() -> List[OperationRecord]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current() -> Optional[OperationRecord]:
+    """The innermost operation running on this thread, if any."""
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+def _emit(record: OperationRecord):
+    with _lock:
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink(record)
+        except Exception as e:
+            print(f"Instrumentation sink failed: {e}")
+
+
+def instrumented(func=None, *, name: Optional[str] = None):
+    """
+    Decorator timing every call of an operation.
+
+    A call fails when it raises, returns a tuple whose first item is False
+    (the second item is kept as the error if it is a string), or returns a
+    dict with an "error" key (get_pdf_info).
+
+    Args:
+        name: Operation name (default: the function name)
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name)
+    op_name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        stack = _stack()
+        record = OperationRecord(op_name, time.time(), parent=stack[-1].name if stack else None)
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            if isinstance(result, tuple) and result and result[0] is False:
+                record.ok = False
+                if len(result) > 1 and isinstance(result[1], str):
+                    record.error = result[1][:200]
+            elif isinstance(result, dict) and "error" in result:
+                record.ok = False
+                record.error = str(result["error"])[:200]
+            return result
+        except BaseException as e:
+            record.ok = False
+            record.error = str(e)[:200] or type(e).__name__
+            raise
+        finally:
+            record.seconds = time.perf_counter() - start
+            stack.pop()
+            _emit(record)
+
+    return wrapper
+
+
+@contextmanager
+def stage(name: str):
+    """Add the time spent in the block to a stage of the current operation."""
+    record = current() if _enabled else None
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record.stages[name] = record.stages.get(name, 0.0) + time.perf_counter() - start
+
+
+def count(name: str, n: int = 1):
+    """Increment a counter, e.g. count("result_cache.hit")."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+    record = current()
+    if record is not None:
+        record.counters[name] = record.counters.get(name, 0) + n
+
+
+def counters() -> Dict[str, int]:
+    """Snapshot of the process-wide counters."""
+    with _lock:
+        return dict(_counters)
+
+
+def reset_counters():
+    with _lock:
+        _counters.clear()
+
+
+def cache_hit_rates() -> Dict[str, Dict]:
+    """
+    Hit rates of every cache counted as "<cache>.hit" / "<cache>.miss".
+
+    Returns:
+        {cache: {"hits", "misses", "rate"}} where rate is None before the first lookup
+    """
+    snapshot = counters()
+    caches = {key.rsplit(".", 1)[0] for key in snapshot if key.endswith((".hit", ".miss"))}
+    rates = {}
+    for cache in sorted(caches):
+        hits, misses = snapshot.get(cache + ".hit", 0), snapshot.get(cache + ".miss", 0)
+        rates[cache] = {"hits": hits, "misses": misses,
+                        "rate": hits / (hits + misses) if hits + misses else None}
+    return rates
+
+
+class RecentOperations:
+    """Sink keeping the last `maxlen` operations in memory."""
+
+    def __init__(self, maxlen: int = 200):
+        self._records = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def __call__(self, record: OperationRecord):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> List[OperationRecord]:
+        """Most recent first."""
+        with self._lock:
+            return list(reversed(self._records))
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per operation: {"calls", "failures", "mean_s", "max_s", "stages": {stage: total s}}."""
+        summary = {}
+        for record in self.records():
+            entry = summary.setdefault(record.name, {"calls": 0, "failures": 0, "total_s": 0.0,
+                                                     "max_s": 0.0, "stages": {}})
+            entry["calls"] += 1
+            entry["failures"] += not record.ok
+            entry["total_s"] += record.seconds
+            entry["max_s"] = max(entry["max_s"], record.seconds)
+            for name, seconds in record.stages.items():
+                entry["stages"][name] = entry["stages"].get(name, 0.0) + seconds
+        for entry in summary.values():
+            entry["mean_s"] = entry.pop("total_s") / entry["calls"]
+        return summary
+
+
+class JsonLinesSink:
+    """Sink appending each operation as a JSON line, e.g. for a server's logs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record: OperationRecord):
+        line = json.dumps(asdict(record))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+# Always collected; shown in Settings > Performance
+recent = RecentOperations()
+add_sink(recent)
@@ -0,0 +1,234 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.batch_engine import BatchJob, BatchOperationType, JobMetrics
+from core.app_paths import default_cache_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL,
+    input_files TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    params TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    metrics TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+"""
+
+# Parameters never written to the database, which stays in the user cache
+# indefinitely. The names of removed secrets are kept under REDACTED_KEY so
+# a resumed job knows it needs them again.
+SECRET_PARAMS = ("password",)
+REDACTED_KEY = "_redacted"
+
+
+def _redact(params: Dict) -> Dict:
+    redacted = {key: value for key, value in params.items() if key not in SECRET_PARAMS}
+    removed = sorted(set(params.get(REDACTED_KEY, [])) | {key for key in params if key in SECRET_PARAMS})
+    if removed:
+        redacted[REDACTED_KEY] = removed
+    return redacted
+
+
+def redact_params(params: Dict) -> Dict:
+    """Copy of a job's params without secrets (pipeline stages included)."""
+    redacted = _redact(params)
+    if "stages" in redacted:
+        redacted["stages"] = [dict(stage, params=_redact(stage.get("params", {}))) for stage in redacted["stages"]]
+    return redacted
+
+
+def missing_secrets(params: Dict) -> List[str]:
+    """Names of the secrets removed from a stored job's params."""
+    names = set(params.get(REDACTED_KEY, []))
+    for stage in params.get("stages", []):
+        names.update(stage.get("params", {}).get(REDACTED_KEY, []))
+    return sorted(names)
+
+
+def restore_secrets(params: Dict, secrets: Dict[str, Any]) -> Optional[Dict]:
+    """
+    Put secrets back into stored params.
+
+    Returns:
+        The complete params, or None if a needed secret is not in `secrets`
+    """
+    def restore(p):
+        names = p.get(REDACTED_KEY, [])
+        if any(secrets.get(name) is None for name in names):
+            return None
+        restored = {key: value for key, value in p.items() if key != REDACTED_KEY}
+        restored.update({name: secrets[name] for name in names})
+        return restored
+
+    restored = restore(params)
+    if restored is None:
+        return None
+    if "stages" in restored:
+        stages = []
+        for stage in restored["stages"]:
+            stage_params = restore(stage.get("params", {}))
+            if stage_params is None:
+                return None
+            stages.append(dict(stage, params=stage_params))
+        restored["stages"] = stages
+    return restored
+
+
+class JobStore:
+    """
+    Durable batch queue in SQLite (WAL mode).
+
+    Every status change is committed as it happens, so after a crash or
+    reboot the batch can be resumed: completed jobs are skipped, jobs that
+    were running are queued again, and failed jobs can be retried.
+    Passwords are not stored (see SECRET_PARAMS); they have to be supplied
+    again when such jobs are resumed.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (or create) a job store.
+
+        Args:
+            db_path: SQLite database path (default: <user cache>/ExcodePDF/jobs.db)
+        """
+        self.db_path = db_path or os.path.join(default_cache_dir(), "jobs.db")
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # The batch thread records results while the GUI thread reads counts
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA secure_delete=ON")  # Scrubbed secrets are overwritten, not just unlinked
+            self.conn.executescript(SCHEMA)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            if "metrics" not in columns:  # Stores created before metrics were recorded
+                self.conn.execute("ALTER TABLE jobs ADD COLUMN metrics TEXT")
+            self._scrub_secrets()
+
+    def _scrub_secrets(self):
+        """Remove secrets written by versions that stored params as given."""
+        pattern = " OR ".join("params LIKE ?" for _ in SECRET_PARAMS)
+        rows = self.conn.execute(f"SELECT id, params FROM jobs WHERE {pattern}",
+                                 [f'%"{name}"%' for name in SECRET_PARAMS]).fetchall()
+        for job_id, params in rows:
+            redacted = json.dumps(redact_params(json.loads(params)))
+            if redacted != params:
+                self.conn.execute("UPDATE jobs SET params = ? WHERE id = ?", (redacted, job_id))
+
+    def close(self):
+        self.conn.close()
+
+    # --- Adding and removing jobs -----------------------------------------
+
+    def add_jobs(self, jobs: Iterable[BatchJob]) -> List[int]:
+        """Persist jobs in one transaction, setting each job's job_id."""
+        jobs = list(jobs)
+        now = time.time()
+        with self.lock, self.conn:
+            for job in jobs:
+                cur = self.conn.execute(
+                    "INSERT INTO jobs (operation, input_files, output_path, params, priority, status, attempts, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job.operation_type.value, json.dumps(job.input_files), job.output_path,
+                     json.dumps(redact_params(job.params)), job.priority, job.status, job.attempts, now))
+                job.job_id = cur.lastrowid
+        return [job.job_id for job in jobs]
+
+    def add_job(self, job: BatchJob) -> int:
+        return self.add_jobs([job])[0]
+
+    def remove_job(self, job_id: int):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM jobs")
+
+    # --- Status updates -------------------------------------------------------
+
+    def update(self, job: BatchJob):
+        """Write a job's status, result, error, retry state and metrics."""
+        metrics = json.dumps(job.metrics.to_dict()) if job.metrics else None
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, attempts = ?, not_before = ?, metrics = ?,"
+                " updated_at = ? WHERE id = ?",
+                (job.status, job.result, job.error, job.attempts, job.not_before, metrics, time.time(), job.job_id))
+
+    def recover(self, retry_failed: bool = True) -> int:
+        """
+        Prepare an interrupted batch for resuming.
+
+        Jobs left 'running' by a crash or cancelled by stopping the batch go
+        back to 'pending'; with retry_failed,
+        jobs that used up their retries get a fresh set.
+
+        Returns:
+            Number of jobs queued again
+        """
+        statuses = ("running", "cancelled", "failed") if retry_failed else ("running", "cancelled")
+        with self.lock, self.conn:
+            cur = self.conn.execute(
+                f"UPDATE jobs SET status = 'pending', not_before = 0, attempts = CASE status WHEN 'failed' THEN 0 ELSE attempts END"
+                f" WHERE status IN ({','.join('?' * len(statuses))})", statuses)
+            return cur.rowcount
+
+    # --- Queries ----------------------------------------------------------------
+
+    def load_jobs(self, statuses: Optional[Iterable[str]] = None) -> List[BatchJob]:
+        """
+        Load jobs (optionally only those with the given statuses) in insertion order.
+
+        Secrets are not stored: jobs that had them come back with the names
+        listed by missing_secrets(job.params) (see restore_secrets).
+        """
+        query = ("SELECT id, operation, input_files, output_path, params, priority, status, result, error,"
+                 " attempts, not_before, metrics FROM jobs")
+        args = ()
+        if statuses is not None:
+            statuses = tuple(statuses)
+            query += f" WHERE status IN ({','.join('?' * len(statuses))})"
+            args = statuses
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY id", args).fetchall()
+
+        jobs = []
+        for job_id, op, inputs, output, params, priority, status, result, error, attempts, not_before, metrics in rows:
+            job = BatchJob(BatchOperationType(op), json.loads(inputs), output, json.loads(params), priority)
+            job.job_id = job_id
+            job.status = status
+            job.result = result
+            job.error = error
+            job.attempts = attempts
+            job.not_before = not_before
+            job.metrics = JobMetrics(**json.loads(metrics)) if metrics else None
+            jobs.append(job)
+        return jobs
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Number of jobs, optionally with a given status (served by the status index)."""
+        with self.lock:
+            if status is None:
+                return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        """Job counts per status."""
+        with self.lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
@@ -0,0 +1,29 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module on first use.
+
+    Returns a module object right away (an ImportError is still raised now
+    if the module isn't installed), but the module's code only runs when
+    one of its attributes is first accessed. Heavy libraries imported this
+    way at the top of a module cost nothing until an operation needs them.
+
+    Example:
+        fitz = lazy_import("fitz")  # no PyMuPDF import yet
+        doc = fitz.open(path)       # imported here
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
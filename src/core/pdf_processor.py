@@ -1,40 +1,93 @@
 import os
 import io
 import re
-from typing import List, Tuple, Optional, Dict
-import fitz  # PyMuPDF
-from pypdf import PdfReader, PdfWriter
-import pikepdf
-from pdfminer.high_level import extract_text as pdfminer_extract_text
-from pdfminer.layout import LAParams
-from docx import Document
-from docx.shared import Pt
-from PIL import Image, ImageEnhance
-import numpy as np
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except ImportError:
-    EASYOCR_AVAILABLE = False
+import threading
+from typing import List, Tuple, Optional, Dict, Iterator
+from importlib.util import find_spec
+from core.instrumentation import instrumented, stage
+from core.lazy_import import lazy_import
+
+# Loaded on first use so importing this module (app start-up, CLI --help)
+# doesn't pay for every PDF library up front
+fitz = lazy_import("fitz")  # PyMuPDF
+pypdf = lazy_import("pypdf")
+pikepdf = lazy_import("pikepdf")
+Image = lazy_import("PIL.Image")
+np = lazy_import("numpy")
+
+# easyocr pulls in torch; it is only imported when OCR actually runs (get_reader)
+EASYOCR_AVAILABLE = find_spec("easyocr") is not None
+OCR_AVAILABLE = EASYOCR_AVAILABLE or find_spec("pytesseract") is not None
 
 class PDFProcessor:
     _reader = None # Lazy load reader
+    _reader_lock = threading.Lock()
+
+    # Separator placed between pages in extracted text
+    PAGE_BREAK = "\n\n--- Page Break ---\n\n"
+
+    # Documents with at least this many pages get multi-process text extraction
+    PARALLEL_MIN_PAGES = 200
+
+    # Content stream bytes counted as one extra page of work when chunking
+    TEXT_CHUNK_BYTES_PER_PAGE = 4096
+
+    # Pages extracted at a time by iter_page_text
+    TEXT_STREAM_PAGES = 200
 
     @staticmethod
     def get_reader():
-        if PDFProcessor._reader is None:
-            print("Loading EasyOCR Model... (This might take a moment)")
-            # Using English by default, can be expanded later
-            PDFProcessor._reader = easyocr.Reader(['en'], gpu=True) 
+        # Locked: the model may be preloaded on a background thread at start-up
+        with PDFProcessor._reader_lock:
+            if PDFProcessor._reader is None:
+                import easyocr
+                print("Loading EasyOCR Model... (This might take a moment)")
+                # Using English by default, can be expanded later
+                PDFProcessor._reader = easyocr.Reader(['en'], gpu=True) 
         return PDFProcessor._reader
 
+    # Operations used as pipeline stages also accept in-memory files
+    # (io.BytesIO) in place of input/output paths, so intermediate
+    # documents never touch the disk.
+
+    @staticmethod
+    def _open_fitz(source):
+        """Open a PDF given as a path or as an in-memory file."""
+        if hasattr(source, "read"):
+            return fitz.open(stream=source.getvalue(), filetype="pdf")
+        return fitz.open(source)
+
+    @staticmethod
+    def _write_pdf(writer, output):
+        """Write a pypdf writer to a path or an in-memory file."""
+        if hasattr(output, "write"):
+            writer.write(output)
+        else:
+            with open(output, 'wb') as f:
+                writer.write(f)
+
+    @staticmethod
+    def _pdf_size(source) -> int:
+        if hasattr(source, "getbuffer"):
+            return source.getbuffer().nbytes
+        return os.path.getsize(source)
+
+    @staticmethod
+    def _source_name(source) -> str:
+        """File name for naming outputs; in-memory files may carry one in .name."""
+        if isinstance(source, str):
+            return source
+        return getattr(source, "name", "document.pdf")
+
     @staticmethod
+    @instrumented
     def modify_pdf(input_path, output_path, actions):
         """
         Modifies a PDF using PyMuPDF (fitz) for powerful editing.
         """
         try:
-            doc = fitz.open(input_path)
+            with stage("parse"):
+                doc = fitz.open(input_path)
             
             # Apply content modifications (e.g., text) first.
             for a in actions:
@@ -66,13 +119,15 @@ class PDFProcessor:
                     if 0 <= p < len(doc):
                         doc.delete_page(p)
 
-            doc.save(output_path)
+            with stage("write"):
+                doc.save(output_path)
             doc.close()
             return True, "PDF modified successfully!"
         except Exception as e:
             return False, str(e)
 
     @staticmethod
+    @instrumented
     def extract_text_from_image(image_path):
         """
         Extracts text from an image using EasyOCR with enhancement.
@@ -82,30 +137,32 @@ class PDFProcessor:
                 return False, "Image file not found."
             
             # Pre-process image for better accuracy
-            from PIL import Image, ImageEnhance
-            img = Image.open(image_path)
+            with stage("preprocess"):
+                from PIL import Image, ImageEnhance
+                img = Image.open(image_path)
             
-            # Convert to grayscale
-            img = img.convert('L')
+                # Convert to grayscale
+                img = img.convert('L')
             
-            # Enhance contrast
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(2.0)
+                # Enhance contrast
+                enhancer = ImageEnhance.Contrast(img)
+                img = enhancer.enhance(2.0)
             
-            # Enhance sharpness
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(2.0)
+                # Enhance sharpness
+                enhancer = ImageEnhance.Sharpness(img)
+                img = enhancer.enhance(2.0)
             
-            # Save temp for OCR (EasyOCR reads files or arrays, giving file is safer for format)
-            # Actually EasyOCR accepts numpy array or bytes. Let's pass the numpy array via numpy
-            import numpy as np
-            img_np = np.array(img)
+                # Save temp for OCR (EasyOCR reads files or arrays, giving file is safer for format)
+                # Actually EasyOCR accepts numpy array or bytes. Let's pass the numpy array via numpy
+                import numpy as np
+                img_np = np.array(img)
             
             reader = PDFProcessor.get_reader()
             
             # paragraph=True combines lines into blocks. detail=0 would give just list of strings.
             # paragraph=True returns list of lists, so we need to flatten/join.
-            results = reader.readtext(img_np, detail=0, paragraph=True)
+            with stage("ocr"):
+                results = reader.readtext(img_np, detail=0, paragraph=True)
             
             text = "\n\n".join(results)
             
@@ -117,43 +174,170 @@ class PDFProcessor:
 
 
     @staticmethod
-    def create_from_images(image_paths, output_path):
+    @instrumented
+    def create_from_images(image_paths, output_path, progress_callback=None, cancel_event=None,
+                           prefetch: int = 32, flush_every: int = 256):
         """
         Creates a PDF from a list of images.
+
+        Every frame of a multi-page TIFF becomes its own page, sized from the
+        image DPI. JPEG and JPEG 2000 files are embedded byte-for-byte, and
+        PNG data and TIFF strips are re-wrapped as PDF streams, so even huge
+        rasters are never decoded; other formats are decoded once. Images are
+        probed and read on a background thread through a bounded prefetch
+        queue, and pages are flushed to disk every `flush_every` pages with an
+        incremental save, so memory stays bounded for very large batches.
+        The PDF is built in output_path + ".partial" and only replaces
+        output_path once complete; if conversion fails or is cancelled, the
+        partial file is removed and an existing output file is left alone.
+
+        Args:
+            image_paths: List of image file paths
+            output_path: Path to save the PDF
+            progress_callback: Optional callable(done, total) called after each input file
+            cancel_event: Optional threading.Event; when set, conversion stops
+            prefetch: Number of images read ahead of page insertion
+            flush_every: Number of pages kept in memory between incremental saves
+
+        Returns:
+            Tuple of (success, message)
         """
+        from contextlib import closing
+        from core.image_reader import ImageReader
+
+        partial_path = output_path + ".partial"
+        doc = None
         try:
+            total = len(image_paths)
             doc = fitz.open()
-            for img_path in image_paths:
-                img = fitz.open(img_path)
-                rect = img[0].rect
-                pdfbytes = img.convert_to_pdf()
-                img.close()
-                imgPDF = fitz.open("pdf", pdfbytes)
-                page = doc.new_page(width = rect.width, height = rect.height)
-                page.show_pdf_page(rect, imgPDF, 0)
-            
-            doc.save(output_path)
-            doc.close()
+            saved = False
+            pending = 0
+            done = 0
+
+            with closing(ImageReader.iter_prefetched(image_paths, prefetch)) as images:
+                for info, data in images:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return False, "Conversion cancelled"
+
+                    width, height = info.page_size()
+                    page = doc.new_page(width=width, height=height)
+                    with stage("encode"):
+                        PDFProcessor._insert_image(page, info, data)
+
+                    pending += 1
+                    if pending >= flush_every:
+                        with stage("write"):
+                            saved = PDFProcessor._flush_pages(doc, partial_path, saved)
+                        doc = fitz.open(partial_path)
+                        pending = 0
+
+                    if info.frame == info.frames - 1:
+                        done += 1
+                        if progress_callback:
+                            progress_callback(done, total)
+
+            if pending or not saved:
+                with stage("write"):
+                    PDFProcessor._flush_pages(doc, partial_path, saved)
+            else:
+                doc.close()
+            os.replace(partial_path, output_path)
             return True, "PDF created successfully!"
         except Exception as e:
             return False, str(e)
+        finally:
+            if doc is not None and not doc.is_closed:
+                doc.close()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    @staticmethod
+    def _insert_image(page, info, data=None):
+        """Draw an image frame over the full page using the cheapest embedding path."""
+        from core.image_reader import ImageReader, large_image_limit
+
+        if info.passthrough:
+            # DCT/JPX data goes into the PDF as-is
+            if data is None:
+                with open(info.path, "rb") as f:
+                    data = f.read()
+            page.insert_image(page.rect, stream=data)
+            return
+
+        # PNG data and TIFF strips are re-wrapped as PDF streams, never decoded
+        raw = None
+        if info.format == "PNG":
+            raw = ImageReader.png_stream(info.path)
+            raw = [raw] if raw else None
+        elif info.format == "TIFF":
+            raw = ImageReader.tiff_strips(info.path, info.frame)
+        if raw is not None:
+            scale = page.rect.height / info.height
+            for strip in raw:
+                rect = fitz.Rect(0, strip.y * scale, page.rect.width, (strip.y + strip.rows) * scale)
+                xref = PDFProcessor._embed_raw_image(page.parent, strip)
+                page.insert_image(rect, xref=xref, keep_proportion=False)
+            return
+
+        if info.native:
+            page.insert_image(page.rect, filename=info.path)
+            return
+
+        # Later TIFF frames and formats MuPDF cannot read (e.g. WebP) are decoded by PIL
+        with large_image_limit(), Image.open(info.path) as img:
+            img.seek(info.frame)
+            if img.mode in ("1", "L"):
+                img, cs, alpha = img.convert("L"), fitz.csGRAY, False
+            elif img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+                img, cs, alpha = img.convert("RGBA"), fitz.csRGB, True
+            else:
+                img, cs, alpha = img.convert("RGB"), fitz.csRGB, False
+            pix = fitz.Pixmap(cs, img.width, img.height, img.tobytes(), alpha)
+        page.insert_image(page.rect, pixmap=pix)
+
+    @staticmethod
+    def _embed_raw_image(doc, raw):
+        """Add a pre-encoded image stream to the document and return its xref."""
+        xref = doc.get_new_xref()
+        doc.update_object(xref, raw.pdf_dict)
+        # Uncompressed samples get deflated; encoded data is stored untouched
+        doc.update_stream(xref, raw.data, compress=raw.filter is None)
+        if raw.filter:
+            doc.xref_set_key(xref, "Filter", raw.filter)
+        if raw.decode_parms:
+            doc.xref_set_key(xref, "DecodeParms", raw.decode_parms)
+        return xref
 
     @staticmethod
+    def _flush_pages(doc, output_path, saved):
+        """Write pending pages to disk and close the document. Returns True."""
+        if saved:
+            doc.save(output_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        else:
+            doc.save(output_path)
+        doc.close()
+        return True
+
+    @staticmethod
+    @instrumented
     def merge_pdfs(pdf_paths, output_path):
         """
         Merges multiple PDFs into one.
         """
         try:
-            merger = PdfWriter()
-            for pdf in pdf_paths:
-                merger.append(pdf)
-            merger.write(output_path)
+            merger = pypdf.PdfWriter()
+            with stage("parse"):
+                for pdf in pdf_paths:
+                    merger.append(pdf)
+            with stage("write"):
+                merger.write(output_path)
             merger.close()
             return True, "PDFs merged successfully!"
         except Exception as e:
             return False, str(e)
 
     @staticmethod
+    @instrumented
     def split_pdf(input_path, output_dir, mode="all", page_range=None):
         """
         Splits PDF based on mode:
@@ -161,22 +345,24 @@ class PDFProcessor:
         - 'range': Extract a specific range (e.g., "1-5" or "1,3,5").
         """
         try:
-            reader = PdfReader(input_path)
-            base_name = os.path.basename(input_path).replace(".pdf", "")
+            with stage("parse"):
+                reader = pypdf.PdfReader(input_path)
+            base_name = os.path.basename(PDFProcessor._source_name(input_path)).replace(".pdf", "")
             
             if mode == "all":
                 for i, page in enumerate(reader.pages):
-                    writer = PdfWriter()
+                    writer = pypdf.PdfWriter()
                     writer.add_page(page)
-                    out_file = os.path.join(output_dir, f"{base_name}_page_{i+1}.pdf")
-                    with open(out_file, "wb") as f:
-                        writer.write(f)
+                    with stage("write"):
+                        out_file = os.path.join(output_dir, f"{base_name}_page_{i+1}.pdf")
+                        with open(out_file, "wb") as f:
+                            writer.write(f)
                 return True, f"Split {len(reader.pages)} pages to {output_dir}"
 
             elif mode == "range" and page_range:
                 # Simple parser for "1-3" or "2"
                 # For now, let's assuming strict "start-end" format string for simplicity
-                writer = PdfWriter()
+                writer = pypdf.PdfWriter()
                 
                 parts = page_range.split('-')
                 if len(parts) == 2:
@@ -189,9 +375,10 @@ class PDFProcessor:
                      if 0 <= idx < len(reader.pages):
                         writer.add_page(reader.pages[idx])
 
-                out_file = os.path.join(output_dir, f"{base_name}_split.pdf")
-                with open(out_file, "wb") as f:
-                    writer.write(f)
+                with stage("write"):
+                    out_file = os.path.join(output_dir, f"{base_name}_split.pdf")
+                    with open(out_file, "wb") as f:
+                        writer.write(f)
                 return True, f"Extracted pages to {out_file}"
                 
             return False, "Invalid mode or range"
@@ -199,6 +386,7 @@ class PDFProcessor:
             return False, str(e)
 
     @staticmethod
+    @instrumented
     def compress_pdf(input_path: str, output_path: str, quality: str = "medium") -> Tuple[bool, str]:
         """
         Compress PDF with configurable quality levels.
@@ -224,39 +412,41 @@ class PDFProcessor:
             # Open with pikepdf
             with pikepdf.open(input_path) as pdf:
                 # Compress images
-                for page in pdf.pages:
-                    for img_key in page.images.keys():
-                        try:
-                            img = page.images[img_key]
-                            raw_image = img.read_bytes()
+                with stage("encode"):
+                    for page in pdf.pages:
+                        for img_key in page.images.keys():
+                            try:
+                                img = page.images[img_key]
+                                raw_image = img.read_bytes()
                             
-                            # Convert to PIL Image
-                            pil_img = Image.open(io.BytesIO(raw_image))
+                                # Convert to PIL Image
+                                pil_img = Image.open(io.BytesIO(raw_image))
                             
-                            # Resize if needed
-                            if pil_img.width > settings['image_dpi'] * 8.5:  # 8.5 inches
-                                ratio = (settings['image_dpi'] * 8.5) / pil_img.width
-                                new_size = (int(pil_img.width * ratio), int(pil_img.height * ratio))
-                                pil_img = pil_img.resize(new_size, Image.Resampling.LANCZOS)
+                                # Resize if needed
+                                if pil_img.width > settings['image_dpi'] * 8.5:  # 8.5 inches
+                                    ratio = (settings['image_dpi'] * 8.5) / pil_img.width
+                                    new_size = (int(pil_img.width * ratio), int(pil_img.height * ratio))
+                                    pil_img = pil_img.resize(new_size, Image.Resampling.LANCZOS)
                             
-                            # Compress
-                            img_buffer = io.BytesIO()
-                            if pil_img.mode == 'RGBA':
-                                pil_img = pil_img.convert('RGB')
-                            pil_img.save(img_buffer, format='JPEG', quality=settings['jpeg_quality'], optimize=True)
-                            img_buffer.seek(0)
+                                # Compress
+                                img_buffer = io.BytesIO()
+                                if pil_img.mode == 'RGBA':
+                                    pil_img = pil_img.convert('RGB')
+                                pil_img.save(img_buffer, format='JPEG', quality=settings['jpeg_quality'], optimize=True)
+                                img_buffer.seek(0)
                             
-                            # Replace in PDF
-                            img.write(img_buffer.read(), filter=pikepdf.Name.DCTDecode)
-                        except Exception:
-                            continue  # Skip problematic images
+                                # Replace in PDF
+                                img.write(img_buffer.read(), filter=pikepdf.Name.DCTDecode)
+                            except Exception:
+                                continue  # Skip problematic images
                 
                 # Save with compression
-                pdf.save(output_path, compress_streams=True, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+                with stage("write"):
+                    pdf.save(output_path, compress_streams=True, object_stream_mode=pikepdf.ObjectStreamMode.generate)
             
             # Calculate size reduction
-            original_size = os.path.getsize(input_path)
-            compressed_size = os.path.getsize(output_path)
+            original_size = PDFProcessor._pdf_size(input_path)
+            compressed_size = PDFProcessor._pdf_size(output_path)
             reduction = ((original_size - compressed_size) / original_size) * 100
             
             return True, f"Compressed successfully! Size reduced by {reduction:.1f}%"
@@ -264,7 +454,9 @@ class PDFProcessor:
             return False, f"Compression failed: {str(e)}"
 
     @staticmethod
-    def extract_text(input_path: str, page_range: Optional[Tuple[int, int]] = None, progress_callback=None) -> Tuple[bool, str]:
+    @instrumented
+    def extract_text(input_path: str, page_range: Optional[Tuple[int, int]] = None, progress_callback=None,
+                     parallel: Optional[bool] = None) -> Tuple[bool, str]:
         """
         Extract text from PDF with improved formatting preservation.
         Automatically uses OCR for image-based PDFs.
@@ -273,40 +465,18 @@ class PDFProcessor:
             input_path: Path to PDF file
             page_range: Optional tuple of (start_page, end_page) (0-indexed)
             progress_callback: Optional callable(str) for progress updates
+            parallel: Extract the text layer with worker processes (None = automatic
+                      for large documents, see extract_page_texts)
         
         Returns:
             Tuple of (success, extracted_text or error_message)
         """
         try:
-            # First, try PyMuPDF (fitz) - usually better for modern PDFs
-            doc = fitz.open(input_path)
-            text_parts = []
-            
-            if page_range:
-                start, end = page_range
-                pages_to_extract = range(start, min(end, len(doc)))
-            else:
-                pages_to_extract = range(len(doc))
-            
-            for page_num in pages_to_extract:
-                page = doc[page_num]
-                page_text = page.get_text("text")
-                if page_text.strip():
-                    text_parts.append(page_text)
-            
-            doc.close()
-            
-            text = "\n\n--- Page Break ---\n\n".join(text_parts)
-            
-            # If we got very little text, try pdfminer as backup
-            if len(text.strip()) < 100 and not page_range:
-                try:
-                    laparams = LAParams(line_margin=0.5, word_margin=0.1, char_margin=2.0)
-                    pdfminer_text = pdfminer_extract_text(input_path, laparams=laparams)
-                    if len(pdfminer_text.strip()) > len(text.strip()):
-                        text = pdfminer_text
-                except Exception:
-                    pass  # Continue with PyMuPDF text
+            # PyMuPDF first, pdfminer only for pages where it came back empty/garbled
+            success, pages = PDFProcessor.extract_page_texts(input_path, page_range, parallel=parallel)
+            if not success:
+                return False, f"Text extraction failed: {pages}"
+            text = PDFProcessor.PAGE_BREAK.join(p['text'] for p in pages if p['text'].strip())
             
             # Check if this might be an image-based PDF - if so, USE OCR AUTOMATICALLY
             if len(text.strip()) < 100:
@@ -331,40 +501,351 @@ class PDFProcessor:
             return False, f"Text extraction failed: {str(e)}"
 
     @staticmethod
-    def export_to_txt(text: str, output_path: str) -> Tuple[bool, str]:
-        """Export text to .txt file."""
+    @instrumented
+    def extract_page_texts(input_path: str, page_range: Optional[Tuple[int, int]] = None,
+                           pdfminer_timeout: float = 10.0, max_workers: Optional[int] = None,
+                           parallel: Optional[bool] = None) -> Tuple[bool, List[Dict]]:
+        """
+        Extract text page by page, recording which engine produced each page.
+        
+        PyMuPDF handles every page. In parallel mode the page range is split
+        into chunks balanced by content-stream size, each worker process opens
+        the document once and extracts its chunks, and results are put back in
+        page order. pdfminer is only run on pages that have fonts but where
+        PyMuPDF's text came back empty or garbled, in a process pool with a
+        time budget per page; its text is kept when it recovers more than
+        PyMuPDF did.
+        
+        Args:
+            input_path: Path to PDF file
+            page_range: Optional tuple of (start_page, end_page) (0-indexed)
+            pdfminer_timeout: Seconds allowed for pdfminer on each page
+            max_workers: Number of worker processes (default: CPU count, max 4)
+            parallel: Use worker processes for PyMuPDF extraction. None picks
+                      automatically (PARALLEL_MIN_PAGES or more pages, multi-core)
+        
+        Returns:
+            Tuple of (success, list of {'page', 'text', 'engine'} dicts or error message).
+            'page' is 1-indexed; 'engine' is 'pymupdf', 'pdfminer' or 'none'.
+        """
+        try:
+            with stage("parse"):
+                doc = fitz.open(input_path)
+            if page_range:
+                start, end = page_range
+                page_nums = range(start, min(end, len(doc)))
+            else:
+                page_nums = range(len(doc))
+            
+            workers = max_workers or min(4, os.cpu_count() or 1)
+            if parallel is None:
+                parallel = workers > 1 and len(page_nums) >= PDFProcessor.PARALLEL_MIN_PAGES
+            
+            with stage("extract"):
+                if parallel:
+                    import multiprocessing
+                    chunks = PDFProcessor._plan_text_chunks(doc, page_nums, workers)
+                    doc.close()
+                    # Each worker opens the document once, in the initializer
+                    with multiprocessing.Pool(workers, initializer=_open_text_worker, initargs=(input_path,)) as pool:
+                        results = []
+                        for chunk_result in pool.imap(_extract_text_chunk, chunks):
+                            results.extend(chunk_result)
+                else:
+                    results = _extract_text_pages(doc, page_nums)
+                    doc.close()
+            
+            pages = []
+            retry = []
+            for page_num, (text, has_fonts) in zip(page_nums, results):
+                engine = "pymupdf" if text.strip() else "none"
+                pages.append({'page': page_num + 1, 'text': text, 'engine': engine})
+                # A page without fonts has no text layer for pdfminer to find
+                if has_fonts and PDFProcessor._is_suspicious_text(text):
+                    retry.append(len(pages) - 1)
+            
+            if retry:
+                with stage("extract"):
+                    PDFProcessor._pdfminer_fallback(input_path, pages, retry, pdfminer_timeout, max_workers)
+            
+            return True, pages
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def _plan_text_chunks(doc, page_nums, workers: int) -> List[List[int]]:
+        """
+        Split pages into chunks of roughly equal extraction cost.
+        
+        Cost is estimated from each page's content stream length (read from
+        the xref table, no parsing), plus a fixed per-page overhead. About
+        four chunks per worker keeps the pool balanced when a few pages are
+        far heavier than the rest.
+        """
+        weights = []
+        for page_num in page_nums:
+            length = 0
+            kind, value = doc.xref_get_key(doc.page_xref(page_num), "Contents")
+            for xref in re.findall(r"(\d+) 0 R", value) if kind in ("xref", "array") else []:
+                ltype, lval = doc.xref_get_key(int(xref), "Length")
+                if ltype == "xref":
+                    lval = doc.xref_object(int(lval.split()[0]))
+                try:
+                    length += int(lval)
+                except ValueError:
+                    pass
+            weights.append(1 + length / PDFProcessor.TEXT_CHUNK_BYTES_PER_PAGE)
+        
+        target = sum(weights) / (workers * 4)
+        chunks, current, current_weight = [], [], 0.0
+        for page_num, weight in zip(page_nums, weights):
+            current.append(page_num)
+            current_weight += weight
+            if current_weight >= target:
+                chunks.append(current)
+                current, current_weight = [], 0.0
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _is_suspicious_text(text: str) -> bool:
+        """
+        True when extracted page text is empty or mostly undecodable glyphs.
+        
+        Short clean text (covers, section breaks) is trusted; only the caller's
+        pages that have fonts are checked, so empty text there means the
+        fonts could not be decoded.
+        """
+        stripped = text.strip()
+        if not stripped:
+            return True
+        garbled = (stripped.count('\ufffd') + stripped.count('(cid:') * 6
+                   + sum(1 for c in stripped if c < ' ' and c not in '\n\r\t'))
+        return garbled > len(stripped) * 0.1
+
+    @staticmethod
+    def _pdfminer_fallback(input_path, pages, indices, timeout, max_workers=None):
+        """
+        Re-extract the given pages with pdfminer in parallel, in place.
+        
+        Every page runs in its own process (up to max_workers at a time) with
+        its own time budget, counted from when that process starts. A page
+        that overruns is killed, so it never eats into the budget of the
+        pages after it.
+        """
+        import multiprocessing
+        import time
+        from multiprocessing.connection import wait
+        
+        max_workers = max_workers or min(4, os.cpu_count() or 1, len(indices))
+        pending = list(indices)
+        running = {}  # Result pipe -> (page index, process, deadline)
+        try:
+            while pending or running:
+                while pending and len(running) < max_workers:
+                    i = pending.pop(0)
+                    receiver, sender = multiprocessing.Pipe(duplex=False)
+                    proc = multiprocessing.Process(target=_pdfminer_page_worker,
+                                                   args=(input_path, pages[i]['page'] - 1, sender), daemon=True)
+                    proc.start()
+                    sender.close()  # The child has its own copy; EOF then means it died
+                    running[receiver] = (i, proc, time.monotonic() + timeout)
+                
+                next_deadline = min(deadline for _, _, deadline in running.values())
+                for conn in wait(list(running), max(0.0, next_deadline - time.monotonic())):
+                    i, proc, _ = running.pop(conn)
+                    try:
+                        text = conn.recv()
+                    except EOFError:
+                        text = None  # Worker crashed; keep PyMuPDF text
+                    conn.close()
+                    proc.join()
+                    if text and len(text.strip()) > len(pages[i]['text'].strip()):
+                        pages[i]['text'] = text
+                        pages[i]['engine'] = "pdfminer"
+                
+                now = time.monotonic()
+                for conn, (i, proc, deadline) in list(running.items()):
+                    if deadline <= now:
+                        print(f"[pdfminer] Page {pages[i]['page']} exceeded {timeout}s budget, skipped")
+                        proc.terminate()
+                        proc.join()
+                        conn.close()
+                        del running[conn]
+        finally:
+            for conn, (_, proc, _) in running.items():
+                proc.terminate()
+                proc.join()
+                conn.close()
+
+    @staticmethod
+    def iter_page_text(input_path: str, page_range: Optional[Tuple[int, int]] = None,
+                       progress_callback=None) -> Iterator[Tuple[int, str]]:
+        """
+        Yield the text of a PDF one page at a time.
+        
+        Pages go through extract_page_texts TEXT_STREAM_PAGES at a time, so
+        garbled pages get the pdfminer retry, and pages with images but no
+        text are OCR'd when an OCR engine is installed; only one block of
+        pages is held in memory.
+        
+        Args:
+            input_path: Path to PDF file, or an in-memory file (pipeline
+                        stages), which is copied to a temporary file
+            page_range: Optional tuple of (start_page, end_page) (0-indexed)
+            progress_callback: Optional callable(str) for progress updates
+        
+        Yields:
+            Tuples of (page_number, page_text), page_number 0-indexed
+        
+        Raises:
+            RuntimeError: The document could not be read
+        """
+        temp_path = None
+        if hasattr(input_path, "read"):
+            # Extraction workers and OCR open the document by path
+            import tempfile
+            fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as f:
+                f.write(input_path.getvalue())
+            input_path = temp_path
+        doc = fitz.open(input_path)
+        try:
+            start, end = page_range or (0, len(doc))
+            end = min(end, len(doc))
+            for block_start in range(start, end, PDFProcessor.TEXT_STREAM_PAGES):
+                block_end = min(block_start + PDFProcessor.TEXT_STREAM_PAGES, end)
+                if progress_callback:
+                    progress_callback(f"Extracting pages {block_start + 1}-{block_end} of {end}...")
+                success, pages = PDFProcessor.extract_page_texts(input_path, (block_start, block_end))
+                if not success:
+                    raise RuntimeError(f"Text extraction failed: {pages}")
+                for page in pages:
+                    page_num, text = page['page'] - 1, page['text']
+                    if not text.strip() and OCR_AVAILABLE and doc[page_num].get_images():
+                        if progress_callback:
+                            progress_callback(f"Running OCR on page {page_num + 1} of {end}...")
+                        ocr_success, ocr_text = PDFProcessor.extract_text_with_ocr(input_path, (page_num, page_num + 1))
+                        if ocr_success and not ocr_text.startswith("[No text"):
+                            text = ocr_text
+                    yield page_num, text
+        finally:
+            doc.close()
+            if temp_path:
+                os.remove(temp_path)
+
+    @staticmethod
+    def _iter_pages(text) -> Iterator[str]:
+        """Accept either a full text string or an iterable of page texts."""
+        if isinstance(text, str):
+            yield from text.split(PDFProcessor.PAGE_BREAK)
+        else:
+            for page in text:
+                yield page[1] if isinstance(page, tuple) else page
+
+    @staticmethod
+    @instrumented
+    def export_to_txt(text, output_path: str) -> Tuple[bool, str]:
+        """
+        Export text to .txt file.
+        
+        The file is written next to output_path and only moved into place
+        once complete, so a failure never leaves a truncated file behind.
+        
+        Args:
+            text: Full text, or an iterable of page texts (e.g. iter_page_text),
+                  which is written page by page without being held in memory
+            output_path: Path to save the text file
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        partial_path = output_path + ".partial"
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                for i, page in enumerate(PDFProcessor._iter_pages(text)):
+                    if i:
+                        f.write(PDFProcessor.PAGE_BREAK)
+                    f.write(page)
+            os.replace(partial_path, output_path)
             return True, f"Text exported to {output_path}"
         except Exception as e:
             return False, f"Export failed: {str(e)}"
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
 
     @staticmethod
-    def export_to_docx(text: str, output_path: str) -> Tuple[bool, str]:
+    @instrumented
+    def export_to_docx(text, output_path: str) -> Tuple[bool, str]:
         """
         Export text to .docx file with basic formatting.
+        
+        Formatting is set once on the Normal style instead of per run, and
+        each source page starts on a new page in the document. Like
+        export_to_txt, nothing is written to output_path unless it succeeds.
+        
+        Args:
+            text: Full text, or an iterable of page texts (e.g. iter_page_text)
+            output_path: Path to save the document
+        
+        Returns:
+            Tuple of (success, message)
         """
         try:
+            from docx import Document
+            from docx.shared import Pt
+
             doc = Document()
             
-            # Split into paragraphs
-            paragraphs = text.split('\n\n')
+            style = doc.styles['Normal']
+            style.font.name = 'Calibri'
+            style.font.size = Pt(11)
             
-            for para in paragraphs:
-                if para.strip():
-                    p = doc.add_paragraph(para.strip())
-                    # Set font
-                    for run in p.runs:
-                        run.font.name = 'Calibri'
-                        run.font.size = Pt(11)
+            for i, page in enumerate(PDFProcessor._iter_pages(text)):
+                if i:
+                    doc.add_page_break()
+                for para in page.split('\n\n'):
+                    if para.strip():
+                        doc.add_paragraph(para.strip())
             
-            doc.save(output_path)
+            with stage("write"):
+                doc.save(output_path + ".partial")
+            os.replace(output_path + ".partial", output_path)
             return True, f"Document exported to {output_path}"
         except Exception as e:
+            if os.path.exists(output_path + ".partial"):
+                os.remove(output_path + ".partial")
             return False, f"Export failed: {str(e)}"
 
     @staticmethod
+    @instrumented
+    def export_pdf_text(input_path: str, output_path: str, page_range: Optional[Tuple[int, int]] = None,
+                        progress_callback=None) -> Tuple[bool, str]:
+        """
+        Stream the text of a PDF straight into a .txt or .docx file.
+        
+        Pages are pulled from iter_page_text (pdfminer retry and OCR included)
+        as they are written, so the full text of a large document never has
+        to be built as one string.
+        
+        Args:
+            input_path: Path to PDF file
+            output_path: Path to save the text (.txt) or Word (.docx) file
+            page_range: Optional tuple of (start_page, end_page) (0-indexed)
+            progress_callback: Optional callable(str) for progress updates
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        pages = PDFProcessor.iter_page_text(input_path, page_range, progress_callback)
+        if output_path.lower().endswith('.docx'):
+            return PDFProcessor.export_to_docx(pages, output_path)
+        return PDFProcessor.export_to_txt(pages, output_path)
+
+    @staticmethod
+    @instrumented
     def search_in_pdf(input_path: str, query: str, case_sensitive: bool = False) -> Tuple[bool, List[Dict]]:
         """
         Search for text in PDF and return matches with page numbers.
@@ -378,13 +859,14 @@ class PDFProcessor:
             Tuple of (success, list of matches with page numbers and context)
         """
         try:
-            reader = PdfReader(input_path)
+            reader = pypdf.PdfReader(input_path)
             matches = []
             
             search_query = query if case_sensitive else query.lower()
             
             for page_num, page in enumerate(reader.pages):
-                page_text = page.extract_text()
+                with stage("extract"):
+                    page_text = page.extract_text()
                 search_text = page_text if case_sensitive else page_text.lower()
                 
                 # Find all occurrences
@@ -415,6 +897,7 @@ class PDFProcessor:
             return False, []
 
     @staticmethod
+    @instrumented
     def rotate_pages(input_path: str, output_path: str, pages: List[int], angle: int) -> Tuple[bool, str]:
         """
         Rotate specific pages in PDF.
@@ -429,22 +912,23 @@ class PDFProcessor:
             Tuple of (success, message)
         """
         try:
-            reader = PdfReader(input_path)
-            writer = PdfWriter()
+            reader = pypdf.PdfReader(input_path)
+            writer = pypdf.PdfWriter()
             
             for i, page in enumerate(reader.pages):
                 if (i + 1) in pages:
                     page.rotate(angle)
                 writer.add_page(page)
             
-            with open(output_path, 'wb') as f:
-                writer.write(f)
+            with stage("write"):
+                PDFProcessor._write_pdf(writer, output_path)
             
             return True, f"Rotated {len(pages)} page(s) by {angle}°"
         except Exception as e:
             return False, f"Rotation failed: {str(e)}"
 
     @staticmethod
+    @instrumented
     def add_password(input_path: str, output_path: str, password: str) -> Tuple[bool, str]:
         """
         Add password protection to PDF.
@@ -458,24 +942,26 @@ class PDFProcessor:
             Tuple of (success, message)
         """
         try:
-            reader = PdfReader(input_path)
-            writer = PdfWriter()
+            reader = pypdf.PdfReader(input_path)
+            writer = pypdf.PdfWriter()
             
             # Add all pages
             for page in reader.pages:
                 writer.add_page(page)
             
             # Encrypt
-            writer.encrypt(password)
+            with stage("encode"):
+                writer.encrypt(password)
             
-            with open(output_path, 'wb') as f:
-                writer.write(f)
+            with stage("write"):
+                PDFProcessor._write_pdf(writer, output_path)
             
             return True, "PDF password protected successfully!"
         except Exception as e:
             return False, f"Password protection failed: {str(e)}"
 
     @staticmethod
+    @instrumented
     def remove_password(input_path: str, output_path: str, password: str) -> Tuple[bool, str]:
         """
         Remove password from PDF.
@@ -489,23 +975,24 @@ class PDFProcessor:
             Tuple of (success, message)
         """
         try:
-            reader = PdfReader(input_path)
+            reader = pypdf.PdfReader(input_path)
             
             if reader.is_encrypted:
                 reader.decrypt(password)
             
-            writer = PdfWriter()
+            writer = pypdf.PdfWriter()
             for page in reader.pages:
                 writer.add_page(page)
             
-            with open(output_path, 'wb') as f:
-                writer.write(f)
+            with stage("write"):
+                PDFProcessor._write_pdf(writer, output_path)
             
             return True, "Password removed successfully!"
         except Exception as e:
             return False, f"Password removal failed: {str(e)}"
     
     @staticmethod
+    @instrumented
     def extract_text_with_ocr(input_path: str, page_range: Optional[Tuple[int, int]] = None, progress_callback=None) -> Tuple[bool, str]:
         """
         Extract text from image-based PDFs using OCR.
@@ -570,7 +1057,8 @@ class PDFProcessor:
                                 progress_callback(f"Processing Page {i+1}/{total_pages} (Image {img_index+1}/{len(image_list)})...")
                             
                             xref = img[0]
-                            base_image = doc.extract_image(xref)
+                            with stage("render"):
+                                base_image = doc.extract_image(xref)
                             image_bytes = base_image["image"]
                             
                             # Save to temp file
@@ -579,18 +1067,20 @@ class PDFProcessor:
                                 img_file.write(image_bytes)
                             
                             # --- ADVANCED PREPROCESSING ---
-                            processed_img_path = OCRProcessor.preprocess_image(temp_img_path)
+                            with stage("preprocess"):
+                                processed_img_path = OCRProcessor.preprocess_image(temp_img_path)
                             
                             # Perform OCR
-                            if use_easyocr:
-                                result = reader.readtext(processed_img_path, detail=0)
-                                ocr_text = "\n".join(result)
-                            else:
-                                # Fallback to pytesseract
-                                import pytesseract
-                                from PIL import Image
-                                img = Image.open(processed_img_path)
-                                ocr_text = pytesseract.image_to_string(img)
+                            with stage("ocr"):
+                                if use_easyocr:
+                                    result = reader.readtext(processed_img_path, detail=0)
+                                    ocr_text = "\n".join(result)
+                                else:
+                                    # Fallback to pytesseract
+                                    import pytesseract
+                                    from PIL import Image
+                                    img = Image.open(processed_img_path)
+                                    ocr_text = pytesseract.image_to_string(img)
                             
                             # --- POST-PROCESSING ---
                             ocr_text = OCRProcessor.clean_text(ocr_text)
@@ -604,22 +1094,25 @@ class PDFProcessor:
                     # No images, render page as image (slower but covers everything)
                     try:
                         # OPTIMIZED: Lower DPI to 200 for faster processing
-                        pix = page.get_pixmap(dpi=200) 
+                        with stage("render"):
+                            pix = page.get_pixmap(dpi=200) 
                         temp_img_path = os.path.join(temp_dir, f"page_{page_num}_full.png")
                         pix.save(temp_img_path)
                         
                         # --- ADVANCED PREPROCESSING ---
-                        processed_img_path = OCRProcessor.preprocess_image(temp_img_path)
+                        with stage("preprocess"):
+                            processed_img_path = OCRProcessor.preprocess_image(temp_img_path)
                         
                         # Perform OCR
-                        if use_easyocr:
-                            result = reader.readtext(processed_img_path, detail=0)
-                            ocr_text = "\n".join(result)
-                        else:
-                            import pytesseract
-                            from PIL import Image
-                            img = Image.open(processed_img_path)
-                            ocr_text = pytesseract.image_to_string(img)
+                        with stage("ocr"):
+                            if use_easyocr:
+                                result = reader.readtext(processed_img_path, detail=0)
+                                ocr_text = "\n".join(result)
+                            else:
+                                import pytesseract
+                                from PIL import Image
+                                img = Image.open(processed_img_path)
+                                ocr_text = pytesseract.image_to_string(img)
                         
                         # --- POST-PROCESSING ---
                         ocr_text = OCRProcessor.clean_text(ocr_text)
@@ -637,7 +1130,7 @@ class PDFProcessor:
             doc.close()
             
             # Combine all pages
-            final_text = "\n\n--- Page Break ---\n\n".join(text_parts)
+            final_text = PDFProcessor.PAGE_BREAK.join(text_parts)
             
             if not final_text.strip():
                 return True, "[No text could be extracted via OCR]"
@@ -655,6 +1148,158 @@ class PDFProcessor:
                 pass  # Ignore cleanup errors
     
     @staticmethod
+    @instrumented
+    def make_searchable_pdf(input_path: str, output_path: str, dpi: int = 200, progress_callback=None) -> Tuple[bool, str]:
+        """
+        OCR a scanned PDF and embed the result as an invisible text layer.
+        
+        Each recognized line is written with render mode 3 (invisible) and
+        stretched over its OCR bounding box, so the page looks unchanged but
+        selection, search and page.get_text work without running OCR again.
+        Pages that already have a text layer are left alone. The output may
+        be the input file itself; it is then written to a temporary file and
+        renamed over the original.
+        
+        Args:
+            input_path: Path to PDF file
+            output_path: Path to save the searchable PDF
+            dpi: Resolution pages are rendered at for OCR
+            progress_callback: Optional callable(str) for progress updates
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        try:
+            with stage("parse"):
+                doc = PDFProcessor._open_fitz(input_path)
+            
+            reader = None
+            if EASYOCR_AVAILABLE:
+                try:
+                    if progress_callback:
+                        progress_callback("Loading OCR Model... (This may take time)...")
+                    reader = PDFProcessor.get_reader()
+                except Exception as e:
+                    print(f"EasyOCR failed to load: {e}, falling back to pytesseract")
+            
+            total_pages = len(doc)
+            ocr_pages = 0
+            for i, page in enumerate(doc):
+                if progress_callback:
+                    progress_callback(f"Processing Page {i+1} of {total_pages}...")
+                
+                if page.get_text("text").strip():
+                    continue  # Already searchable
+                
+                lines = PDFProcessor._ocr_page_lines(page, dpi, reader)
+                with stage("encode"):
+                    PDFProcessor._insert_text_layer(page, lines)
+                ocr_pages += 1
+            
+            # MuPDF can't save over the file it has open
+            in_place = (isinstance(input_path, str) and isinstance(output_path, str)
+                        and os.path.exists(output_path) and os.path.samefile(input_path, output_path))
+            target = output_path + ".partial" if in_place else output_path
+            with stage("write"):
+                doc.save(target, garbage=3, deflate=True)
+            doc.close()
+            if in_place:
+                os.replace(target, output_path)
+            return True, f"Searchable PDF saved ({ocr_pages} of {total_pages} pages OCR'd)"
+        except Exception as e:
+            return False, f"Searchable PDF failed: {str(e)}"
+
+    @staticmethod
+    @instrumented
+    def make_searchable_folder(input_dir: str, output_dir: str, dpi: int = 200, progress_callback=None) -> Tuple[bool, str]:
+        """
+        Run make_searchable_pdf on every PDF in a folder.
+        
+        Args:
+            input_dir: Folder containing PDF files
+            output_dir: Folder to save searchable PDFs (same file names); may be
+                        input_dir, in which case the files are replaced
+            dpi: Resolution pages are rendered at for OCR
+            progress_callback: Optional callable(str) for progress updates
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        try:
+            files = sorted(f for f in os.listdir(input_dir) if f.lower().endswith('.pdf'))
+            if not files:
+                return False, "No PDF files found in folder"
+            
+            os.makedirs(output_dir, exist_ok=True)
+            failed = []
+            for n, name in enumerate(files):
+                def file_progress(msg, n=n, name=name):
+                    if progress_callback:
+                        progress_callback(f"[{n+1}/{len(files)}] {name}: {msg}")
+                
+                success, msg = PDFProcessor.make_searchable_pdf(
+                    os.path.join(input_dir, name), os.path.join(output_dir, name), dpi, file_progress)
+                if not success:
+                    failed.append(f"{name}: {msg}")
+            
+            message = f"Created {len(files) - len(failed)} searchable PDF(s) in {output_dir}"
+            if failed:
+                message += f"\n{len(failed)} failed:\n" + "\n".join(failed)
+            return not failed, message
+        except Exception as e:
+            return False, f"Searchable PDF failed: {str(e)}"
+
+    @staticmethod
+    def _ocr_page_lines(page, dpi, reader=None) -> List[Tuple["fitz.Rect", str]]:
+        """
+        Render a page and OCR it, returning (rect, text) pairs.
+        Rects are in visible page coordinates (points, rotation applied).
+        """
+        with stage("render"):
+            pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        scale = page.rect.width / pix.width
+        
+        lines = []
+        with stage("ocr"):
+            if reader is not None:
+                for box, text, _ in reader.readtext(img, detail=1):
+                    xs = [pt[0] for pt in box]
+                    ys = [pt[1] for pt in box]
+                    rect = fitz.Rect(min(xs), min(ys), max(xs), max(ys)) * scale
+                    lines.append((rect, text))
+            else:
+                import pytesseract
+                data = pytesseract.image_to_data(Image.fromarray(img), output_type=pytesseract.Output.DICT)
+                for i, text in enumerate(data['text']):
+                    if text.strip():
+                        x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
+                        lines.append((fitz.Rect(x, y, x + w, y + h) * scale, text))
+        
+        # Raw recognized text (no clean_text) so the layer matches what is on the page
+        return [(rect, text.strip()) for rect, text in lines if text.strip() and not rect.is_empty]
+
+    @staticmethod
+    def _insert_text_layer(page, lines):
+        """Write invisible text stretched over each OCR bounding box."""
+        for rect, text in lines:
+            fontsize = rect.height * 0.85
+            width = fitz.get_text_length(text, fontname="helv", fontsize=fontsize)
+            if width <= 0:
+                continue
+            
+            # Origin on the baseline, mapped to unrotated page space
+            origin = fitz.Point(rect.x0, rect.y1 - rect.height * 0.2) * page.derotation_matrix
+            
+            # Horizontal stretch in visible space, conjugated into page space
+            stretch = page.rotation_matrix * fitz.Matrix(rect.width / width, 1) * page.derotation_matrix
+            stretch.e = stretch.f = 0
+            
+            page.insert_text(origin, text, fontsize=fontsize, fontname="helv", render_mode=3,
+                             rotate=page.rotation, morph=(origin, stretch))
+
+    @staticmethod
+    @instrumented
     def get_pdf_info(input_path: str) -> Dict:
         """
         Get PDF metadata and information.
@@ -666,8 +1311,9 @@ class PDFProcessor:
             Dictionary with PDF information
         """
         try:
-            reader = PdfReader(input_path)
-            doc = fitz.open(input_path)
+            with stage("parse"):
+                reader = pypdf.PdfReader(input_path)
+                doc = fitz.open(input_path)
             
             info = {
                 'pages': len(reader.pages),
@@ -686,6 +1332,7 @@ class PDFProcessor:
             return {'error': 'Could not read PDF information'}
 
     @staticmethod
+    @instrumented
     def split_by_interval(input_path: str, output_dir: str, interval: int) -> Tuple[bool, str]:
         """
         Split PDF every X pages.
@@ -699,25 +1346,75 @@ class PDFProcessor:
             Tuple of (success, message)
         """
         try:
-            reader = PdfReader(input_path)
+            reader = pypdf.PdfReader(input_path)
             base_name = os.path.basename(input_path).replace(".pdf", "")
             
             total_pages = len(reader.pages)
             file_count = 0
             
             for start_idx in range(0, total_pages, interval):
-                writer = PdfWriter()
+                writer = pypdf.PdfWriter()
                 end_idx = min(start_idx + interval, total_pages)
                 
                 for i in range(start_idx, end_idx):
                     writer.add_page(reader.pages[i])
                 
                 file_count += 1
-                out_file = os.path.join(output_dir, f"{base_name}_part_{file_count}.pdf")
-                with open(out_file, "wb") as f:
-                    writer.write(f)
+                with stage("write"):
+                    out_file = os.path.join(output_dir, f"{base_name}_part_{file_count}.pdf")
+                    with open(out_file, "wb") as f:
+                        writer.write(f)
             
             return True, f"Split into {file_count} files (every {interval} pages)"
         except Exception as e:
             return False, f"Split failed: {str(e)}"
 
+
+def _extract_text_pages(doc, page_nums) -> List[Tuple[str, bool]]:
+    """
+    PyMuPDF text plus a has-fonts flag for each page number.
+    
+    Fonts are only looked up for pages whose text looks suspicious (the only
+    ones pdfminer may retry); the flag is False for every other page.
+    """
+    results = []
+    for page_num in page_nums:
+        page = doc[page_num]
+        text = page.get_text("text")
+        has_fonts = PDFProcessor._is_suspicious_text(text) and bool(page.get_fonts())
+        results.append((text, has_fonts))
+    return results
+
+
+# Document opened once per text-extraction worker process (see _open_text_worker)
+_worker_doc = None
+
+
+def _open_text_worker(input_path: str):
+    """Pool initializer: open the document once for all chunks this worker gets."""
+    global _worker_doc
+    _worker_doc = fitz.open(input_path)
+
+
+def _extract_text_chunk(page_nums) -> List[Tuple[str, bool]]:
+    """Worker entry point: extract one chunk of pages from the worker's document."""
+    return _extract_text_pages(_worker_doc, page_nums)
+
+
+def _pdfminer_page_text(input_path: str, page_num: int) -> str:
+    """Extract a single page with pdfminer (module level so worker processes can pickle it)."""
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+    from pdfminer.layout import LAParams
+
+    laparams = LAParams(line_margin=0.5, word_margin=0.1, char_margin=2.0)
+    return pdfminer_extract_text(input_path, page_numbers=[page_num], laparams=laparams)
+
+
+def _pdfminer_page_worker(input_path: str, page_num: int, conn):
+    """Process entry point: send one page's pdfminer text (None on failure) back through conn."""
+    try:
+        text = _pdfminer_page_text(input_path, page_num)
+    except Exception:
+        text = None
+    conn.send(text)
+    conn.close()
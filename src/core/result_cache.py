@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from core.batch_engine import BatchJob, job_output_files, job_output_targets
+from core.instrumentation import count
+from core.app_paths import default_cache_dir
+
+# Bump when operations change in a way that makes old outputs stale
+CACHE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT PRIMARY KEY,
+    outputs TEXT NOT NULL,
+    message TEXT,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class ResultCache:
+    """
+    Remembers finished batch jobs so unchanged work can be skipped.
+
+    A job's fingerprint covers the content of its input files, its operation
+    and parameters, and its output location. A job is up to date when a
+    result with the same fingerprint was recorded and every output file
+    recorded with it still exists unmodified. Input hashes are themselves
+    cached by (size, mtime), so unchanged inputs are not re-read.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (or create) a result cache.
+
+        Args:
+            db_path: SQLite database path (default: <user cache>/ExcodePDF/results.db)
+        """
+        self.db_path = db_path or os.path.join(default_cache_dir(), "results.db")
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # --- Fingerprints -------------------------------------------------------------
+
+    def file_hash(self, path: str) -> str:
+        """SHA-256 of a file's content, reusing the stored hash if size and mtime match."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self.lock:
+            row = self.conn.execute("SELECT size, mtime_ns, sha256 FROM file_hashes WHERE path = ?",
+                                    (path,)).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                              (path, st.st_size, st.st_mtime_ns, digest))
+        return digest
+
+    def fingerprint(self, job: BatchJob, processor_name: str = "") -> str:
+        """
+        Fingerprint a job by input content, operation, parameters and outputs.
+
+        Args:
+            job: The job
+            processor_name: Identifies the function that runs the job, so a
+                            custom processor never reuses built-in results
+        """
+        key = {
+            "version": CACHE_VERSION,
+            "processor": processor_name,
+            "operation": job.operation_type.value,
+            "params": job.params,
+            "inputs": [self.file_hash(path) for path in job.input_files],
+            "outputs": [os.path.abspath(path) for path in job_output_targets(job)],
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+    # --- Results ------------------------------------------------------------------
+
+    @staticmethod
+    def _snapshot(path: str) -> dict:
+        st = os.stat(path)
+        return {"path": os.path.abspath(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def record(self, fingerprint: str, job: BatchJob, message: str, started_at: float):
+        """
+        Store a successful job's outputs under its fingerprint.
+
+        Directory targets (e.g. split) record the files the job wrote there
+        (see job_output_files).
+        """
+        outputs = [self._snapshot(path) for path in job_output_files(job, started_at)]
+        if not outputs:
+            return
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO results (fingerprint, outputs, message, created_at) VALUES (?, ?, ?, ?)",
+                              (fingerprint, json.dumps(outputs), message, time.time()))
+
+    def lookup(self, fingerprint: str) -> Optional[str]:
+        """
+        Return the recorded message if the job is up to date, else None.
+
+        Up to date means every recorded output still exists with the size
+        and modification time it had when it was produced.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT outputs, message FROM results WHERE fingerprint = ?",
+                                    (fingerprint,)).fetchone()
+        if not row:
+            count("result_cache.miss")
+            return None
+        for output in json.loads(row[0]):
+            try:
+                st = os.stat(output["path"])
+            except OSError:
+                count("result_cache.miss")
+                return None
+            if st.st_size != output["size"] or st.st_mtime_ns != output["mtime_ns"]:
+                count("result_cache.miss")
+                return None
+        count("result_cache.hit")
+        return row[1]
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM results")
+            self.conn.execute("DELETE FROM file_hashes")
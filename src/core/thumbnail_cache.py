@@ -0,0 +1,270 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+from typing import Dict, Optional
+
+from core.app_paths import default_cache_dir
+from core.instrumentation import count
+from core.lazy_import import lazy_import
+
+fitz = lazy_import("fitz")  # PyMuPDF, loaded on first use
+
+# Object references inside a PDF object's source, e.g. "12 0 R"
+_REF_RE = re.compile(r"(\d+) 0 R")
+
+# Back-references that would pull the whole page tree into a page's hash
+_BACKREF_RE = re.compile(r"/(Parent|P) \d+ 0 R")
+
+# Stream dictionary entries that change when a saved file is (re)compressed
+_VOLATILE_RE = re.compile(r"/Length \d+|/DecodeParms\s*<<\s*>>")
+_FLATE_RE = re.compile(r"/Filter\s*(/FlateDecode|\[\s*/FlateDecode\s*\])")
+
+
+class PageHasher:
+    """
+    Hashes what a page looks like, independent of where its objects sit in the file.
+
+    Object numbers change whenever a PDF is rewritten, so referenced objects
+    are hashed by content: each "N 0 R" is replaced with the referenced
+    object's own hash. Shared resources (fonts, images) are hashed once per
+    document. References to other pages (link destinations, actions) are
+    not followed, so editing one page never changes another page's key.
+    Flate-compressed and uncompressed streams are hashed decoded,
+    so saving with deflate does not invalidate them; other filters (JPEG,
+    CCITT, ...) are never re-encoded on save and are hashed as stored.
+    """
+
+    def __init__(self, doc: "fitz.Document"):
+        self.doc = doc
+        self.memo: Dict[int, str] = {}
+        self._stops: Dict[int, Optional[str]] = {}
+
+    def _stop_token(self, xref: int) -> Optional[str]:
+        """Token used instead of following a reference, or None to follow it."""
+        token = self._stops.get(xref, "")
+        if token == "":
+            token = None
+            if not 0 < xref < self.doc.xref_length():
+                token = "null"
+            else:
+                kind, value = self.doc.xref_get_key(xref, "Type")
+                if kind == "name" and value in ("/Page", "/Pages"):
+                    token = "page"
+            self._stops[xref] = token
+        return token
+
+    def _start(self, xref: int) -> list:
+        """Hash the object's stream and return its traversal frame: [xref, sha1, source, refs, next ref]."""
+        h = hashlib.sha1()
+        source = _BACKREF_RE.sub("", self.doc.xref_object(xref, compressed=True))
+        if self.doc.xref_is_stream(xref):
+            source = _VOLATILE_RE.sub("", source)
+            plain = "/Filter" not in source
+            if not plain and "/DecodeParms" not in source and _FLATE_RE.search(source):
+                source = _FLATE_RE.sub("", source)
+                plain = "/Filter" not in source
+            h.update(((self.doc.xref_stream(xref) if plain else self.doc.xref_stream_raw(xref)) or b""))
+        return [xref, h, source, [int(ref) for ref in _REF_RE.findall(source)], 0]
+
+    def object_hash(self, xref: int) -> str:
+        """
+        Content hash of an object and everything it references.
+
+        Depth-first without recursion, so long reference chains can't
+        overflow the stack. A reference back into the current path gets a
+        placeholder; hashes that depend on one are not memoized, so a key
+        never depends on which page happened to be hashed first.
+        """
+        if xref in self.memo:
+            return self.memo[xref]
+        done: Dict[int, str] = {}  # Hashes from this call, including ones not safe to memoize
+        cyclic = set()  # Objects whose hash used a cycle placeholder
+        path = {xref}
+        stack = [self._start(xref)]
+        while stack:
+            frame = stack[-1]
+            refs = frame[3]
+            if frame[4] < len(refs):
+                ref = refs[frame[4]]
+                frame[4] += 1
+                if ref in self.memo or ref in done or self._stop_token(ref):
+                    continue
+                if ref in path:
+                    cyclic.add(frame[0])
+                    continue
+                path.add(ref)
+                stack.append(self._start(ref))
+                continue
+
+            stack.pop()
+            current, h, source = frame[0], frame[1], frame[2]
+            path.discard(current)
+
+            def resolve(match):
+                ref = int(match.group(1))
+                token = self._stop_token(ref) or self.memo.get(ref) or done.get(ref) or "cycle"
+                return "<" + token + ">"
+
+            h.update(_REF_RE.sub(resolve, source).encode())
+            done[current] = h.hexdigest()
+            if current in cyclic:
+                if stack:
+                    cyclic.add(stack[-1][0])
+            else:
+                self.memo[current] = done[current]
+        return done[xref]
+
+    def page_key(self, page_num: int, zoom: float) -> str:
+        """
+        Cache key for a page rendered at the given zoom.
+
+        Covers the content streams, resources and annotations, plus the
+        geometry that changes the rendered image (rotation, media/crop box).
+        """
+        page = self.doc[page_num]
+        page_xref = page.xref
+        h = hashlib.sha1(f"v1|{zoom:.4f}|{page.rotation}|{tuple(page.mediabox)}|{tuple(page.cropbox)}".encode())
+
+        for key in ("Contents", "Resources", "Annots"):
+            kind, value = self.doc.xref_get_key(page_xref, key)
+            if key == "Resources" and kind == "null":
+                # Inherited from an ancestor in the page tree
+                kind, value = self.doc.xref_get_key(page_xref, "Parent/Resources")
+            refs = _REF_RE.findall(value) if kind in ("xref", "array", "dict") else []
+            h.update(f"|{key}|{_REF_RE.sub('R', value)}".encode())
+            for ref in refs:
+                h.update(self.object_hash(int(ref)).encode())
+        return h.hexdigest()
+
+
+class ThumbnailCache:
+    """On-disk PNG cache of page thumbnails with a size cap and LRU eviction."""
+
+    # Default cap on the total size of cached thumbnails
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+    # Eviction trims the cache down to this fraction of the cap
+    PRUNE_TARGET = 0.8
+
+    # prune_if_due() walks the cache at most this often (seconds); put()
+    # enforces the cap in between
+    PRUNE_INTERVAL = 24 * 60 * 60
+
+    # Empty file whose modification time records the last prune
+    PRUNE_STAMP = ".last_prune"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cached PNGs (default: <user cache>/ExcodePDF/thumbnails)
+            max_bytes: Size cap; the least recently used thumbnails are removed above it
+        """
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "thumbnails")
+        self.max_bytes = max_bytes
+        self._size = None  # Bytes on disk, counted on the first write
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".png")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached PNG for a key, or None on a miss.
+
+        Hits refresh the file's modification time, which is what eviction
+        orders by.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            count("thumbnail_cache.hit")
+            return data
+        except OSError:
+            count("thumbnail_cache.miss")
+            return None
+
+    def put(self, key: str, png: bytes):
+        """Store a PNG under a key, evicting old entries if the cap is exceeded."""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so a reader never sees a half-written file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Thumbnail cache write failed: {e}")
+            return
+
+        if self._size is None:
+            self._size = self._disk_usage()
+        else:
+            self._size += len(png)
+        if self._size > self.max_bytes:
+            self.prune()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name == self.PRUNE_STAMP:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def _disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def prune(self):
+        """Remove least recently used thumbnails until the cache is below PRUNE_TARGET of the cap."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.PRUNE_TARGET
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+        try:
+            with open(os.path.join(self.cache_dir, self.PRUNE_STAMP), "w"):
+                pass
+        except OSError:
+            pass  # No cache directory yet
+
+    def prune_if_due(self) -> bool:
+        """
+        Prune unless the last prune was less than PRUNE_INTERVAL ago.
+
+        Returns:
+            True if the cache was pruned
+        """
+        try:
+            last = os.stat(os.path.join(self.cache_dir, self.PRUNE_STAMP)).st_mtime
+            if time.time() - last < self.PRUNE_INTERVAL:
+                return False
+        except OSError:
+            pass
+        self.prune()
+        return True
+
+    def clear(self):
+        """Delete every cached thumbnail."""
+        for path, _, _ in list(self._entries()):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._size = 0
@@ -0,0 +1,273 @@
+"""
+Headless command-line interface.
+
+Runs PDFProcessor operations without a display and without importing
+PySide6. Core modules are imported inside the command that needs them, so
+`--help` and argument errors return immediately.
+
+Examples (from the src directory):
+    python -m excode compress scans/*.pdf -o compressed/ --workers 4
+    python -m excode merge a.pdf b.pdf -o merged.pdf
+    python -m excode ocr "inbox/**/*.pdf" -o searchable/ --json
+    python -m excode serve --workers 4 &     # warm job server (see excode.server)
+    python -m excode ocr scan.pdf --server   # run on it instead of locally
+    python -m excode watch inbox/ -o done/ --step ocr --step compress -j 4
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+# Per-file commands: (BatchOperationType value, suffix for default output names, output extension)
+PER_FILE_COMMANDS = {
+    "compress": ("compress", "_compressed", ".pdf"),
+    "ocr": ("ocr", "_searchable", ".pdf"),
+    "rotate": ("rotate", "_rotated", ".pdf"),
+    "encrypt": ("add_password", "_protected", ".pdf"),
+    "decrypt": ("remove_password", "_unlocked", ".pdf"),
+    "extract-text": ("extract_text", "", ".txt"),
+    "split": ("split", None, None),
+}
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expand glob patterns (shells on Windows don't), keeping plain paths and order."""
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise SystemExit(f"error: no files match {pattern}")
+            paths.extend(matches)
+        else:
+            paths.append(pattern)
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        raise SystemExit(f"error: file not found: {missing[0]}")
+    return paths
+
+
+def output_for(input_path: str, output: Optional[str], suffix: str, ext: str, many: bool) -> str:
+    """
+    Output path of a per-file command.
+
+    -o is a directory when it exists as one, ends with a path separator or
+    there are several inputs; without -o the output goes next to the input.
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    if output and (many or os.path.isdir(output) or output.endswith(("/", os.sep))):
+        os.makedirs(output, exist_ok=True)
+        return os.path.join(output, stem + ext)
+    if output:
+        return output
+    return os.path.join(os.path.dirname(input_path), stem + suffix + ext)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="excode", description="Excode PDF Tool (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name, help_text, output_help="Output file or directory"):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("inputs", nargs="+", help="Input files or glob patterns")
+        p.add_argument("-o", "--output", help=output_help)
+        p.add_argument("--json", action="store_true", help="Print results as JSON")
+        p.add_argument("-j", "--workers", type=int, default=1, help="Parallel worker processes (default: 1)")
+        p.add_argument("--server", nargs="?", const="", metavar="ADDRESS",
+                       help="Run on a job server (socket path or HOST:PORT; default: the local server)")
+        return p
+
+    add("merge", "Merge PDFs into one file", "Output PDF (required)")
+    add("split", "Split PDFs into pages", "Output directory (default: next to each input)").add_argument(
+        "--range", dest="page_range", help="Extract only this range, e.g. 2-5")
+    add("compress", "Compress PDFs").add_argument("--quality", choices=["low", "medium", "high"], default="medium")
+    add("ocr", "Make scanned PDFs searchable").add_argument("--dpi", type=int, default=200)
+    p = add("rotate", "Rotate pages")
+    p.add_argument("--pages", required=True, help="Comma-separated 1-based page numbers")
+    p.add_argument("--angle", type=int, default=90, choices=[90, 180, 270])
+    add("encrypt", "Add a password").add_argument("--password", required=True)
+    add("decrypt", "Remove a password").add_argument("--password", required=True)
+    add("extract-text", "Extract text to .txt (or .docx)")
+    add("images-to-pdf", "Create a PDF from images", "Output PDF (required)")
+    add("info", "Show PDF information")
+
+    p = sub.add_parser("serve", help="Run a job server that keeps workers warm")
+    p.add_argument("--address", help="Socket path or HOST:PORT, HOST being a loopback address (default: per-user socket)")
+    p.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count, max 4)")
+    p.add_argument("--max-queue", type=int, default=64, help="Queued jobs before clients are told to wait")
+    p.add_argument("--warm-ocr", action="store_true", help="Load the OCR model in every worker at start-up")
+    p.add_argument("--status", action="store_true", help="Show a running server's queue and exit")
+    p.add_argument("--stop", action="store_true", help="Stop a running server")
+
+    p = sub.add_parser("watch", help="Process files dropped into a folder")
+    p.add_argument("inbox", help="Folder to watch")
+    p.add_argument("-o", "--output", required=True, help="Folder for results")
+    p.add_argument("--quarantine", help="Folder for files that failed (default: <inbox>/quarantine)")
+    p.add_argument("--archive", help="Move processed inputs here (default: leave them in the inbox)")
+    p.add_argument("--step", action="append", required=True, metavar="OP[:KEY=VALUE,...]",
+                   help="Pipeline step, repeatable, e.g. --step ocr --step compress:quality=low")
+    p.add_argument("-j", "--workers", type=int, default=None, help="Files processed at once (default: CPU count, max 4)")
+    p.add_argument("--pattern", default="*.pdf", help="File names to pick up (default: *.pdf)")
+    p.add_argument("--settle", type=float, default=2.0, help="Seconds a file must be unchanged before processing")
+    p.add_argument("--ledger", help="Ledger database (default: <inbox>/.excode-watch.db)")
+    return parser
+
+
+def job_params(args) -> Dict:
+    if args.command == "split":
+        return {"mode": "range", "page_range": args.page_range} if args.page_range else {"mode": "all"}
+    if args.command == "compress":
+        return {"quality": args.quality}
+    if args.command == "ocr":
+        return {"dpi": args.dpi}
+    if args.command == "rotate":
+        return {"pages": [int(p) for p in args.pages.split(",") if p.strip()], "angle": args.angle}
+    if args.command in ("encrypt", "decrypt"):
+        return {"password": args.password}
+    return {}
+
+
+def run_jobs(jobs, workers: int, server: Optional[str] = None) -> List[Dict]:
+    """
+    Run batch jobs inline, in a worker pool when there are several and
+    workers > 1, or on a job server when `server` is given ("" = default address).
+    """
+    from core.batch_engine import BatchEngine, JobMetrics, execute_job
+
+    results = [None] * len(jobs)
+    if server is not None:
+        from excode.server import parse_address, run_remote
+
+        for index, (success, message, metrics) in enumerate(run_remote(parse_address(server), jobs)):
+            results[index] = (success, message)
+            jobs[index].metrics = JobMetrics(**metrics) if metrics else None
+    elif workers > 1 and len(jobs) > 1:
+        # Every job gets a worker slot: --workers is an explicit choice, so
+        # the GUI's per-operation caps don't apply
+        engine = BatchEngine(max_workers=workers, operation_limits={})
+
+        def on_completed(index, success, message):
+            results[index] = (success, message)
+
+        engine.run(jobs, on_completed=on_completed)
+    else:
+        for index, job in enumerate(jobs):
+            try:
+                results[index] = execute_job(job)
+            except Exception as e:
+                results[index] = (False, str(e))
+
+    return [{"input": job.input_files[0] if len(job.input_files) == 1 else job.input_files,
+             "output": job.output_path, "success": bool(success), "message": message,
+             "metrics": job.metrics.to_dict() if job.metrics else None}
+            for job, (success, message) in zip(jobs, results)]
+
+
+def serve(args) -> int:
+    from excode.server import JobServer, parse_address, request_once
+
+    address = parse_address(args.address)
+    if args.status or args.stop:
+        try:
+            reply = request_once(address, {"command": "status" if args.status else "shutdown"})
+        except OSError as e:
+            print(f"error: no job server at {address}: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps(reply, indent=2))
+        return 0
+    JobServer(address, args.workers, args.max_queue, warm_ocr=args.warm_ocr).serve_forever()
+    return 0
+
+
+def watch(args) -> int:
+    from core.batch_engine import BatchOperationType
+    from excode.watcher import FolderWatcher, parse_step
+
+    stages = [parse_step(spec) for spec in args.step]
+    for stage in stages:
+        try:
+            BatchOperationType(stage["op"])
+        except ValueError:
+            raise SystemExit(f"error: unknown operation in --step: {stage['op']}")
+    if not os.path.isdir(args.inbox):
+        raise SystemExit(f"error: not a folder: {args.inbox}")
+    FolderWatcher(args.inbox, args.output, args.quarantine or os.path.join(args.inbox, "quarantine"), stages,
+                  workers=args.workers, pattern=args.pattern, archive_dir=args.archive,
+                  ledger_path=args.ledger, settle=args.settle).run()
+    return 0
+
+
+def run_command(args) -> List[Dict]:
+    inputs = expand_inputs(args.inputs)
+    if args.server is not None and args.command in ("info", "images-to-pdf"):
+        raise SystemExit(f"error: {args.command} does not run on a job server")
+
+    if args.command == "info":
+        from core.pdf_processor import PDFProcessor
+        return [{"input": path, "success": "error" not in info, "info": info}
+                for path, info in ((path, PDFProcessor.get_pdf_info(path)) for path in inputs)]
+
+    if args.command == "images-to-pdf":
+        if not args.output:
+            raise SystemExit("error: images-to-pdf needs -o OUTPUT.pdf")
+        from core.pdf_processor import PDFProcessor
+        success, message = PDFProcessor.create_from_images(inputs, args.output)
+        return [{"input": inputs, "output": args.output, "success": success, "message": message}]
+
+    from core.batch_engine import BatchJob, BatchOperationType
+
+    if args.command == "merge":
+        if not args.output:
+            raise SystemExit("error: merge needs -o OUTPUT.pdf")
+        return run_jobs([BatchJob(BatchOperationType.MERGE, inputs, args.output)], 1, args.server)
+
+    op, suffix, ext = PER_FILE_COMMANDS[args.command]
+    params = job_params(args)
+    many = len(inputs) > 1
+    jobs = []
+    for path in inputs:
+        if args.command == "split":
+            output = args.output or os.path.dirname(os.path.abspath(path))
+            os.makedirs(output, exist_ok=True)
+        else:
+            output = output_for(path, args.output, suffix, ext, many)
+        jobs.append(BatchJob(BatchOperationType(op), [path], output, params))
+    return run_jobs(jobs, args.workers, args.server)
+
+
+def print_results(results: List[Dict], as_json: bool):
+    if as_json:
+        json.dump(results, sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
+        return
+    for result in results:
+        inputs = result["input"]
+        name = inputs if isinstance(inputs, str) else f"{len(inputs)} files"
+        if "info" in result:
+            print(f"{name}:")
+            for key, value in result["info"].items():
+                print(f"  {key}: {value}")
+        else:
+            print(f"{'OK  ' if result['success'] else 'FAIL'} {name}: {result['message']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point; returns the process exit code (0 when every file succeeded)."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    address = args.address if args.command == "serve" else getattr(args, "server", None)
+    if address:
+        from excode.server import parse_address
+        try:
+            parse_address(address)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.command == "serve":
+        return serve(args)
+    if args.command == "watch":
+        return watch(args)
+    results = run_command(args)
+    print_results(results, args.json)
+    return 0 if all(r["success"] for r in results) else 1
@@ -0,0 +1,575 @@
+"""
+Local job server.
+
+A long-running process that keeps a pool of warm worker processes (PDF
+libraries imported, optionally the OCR model loaded) and accepts jobs from
+local clients, so feeding it one file at a time doesn't pay the start-up
+cost per file.
+
+Clients connect to a Unix domain socket (or 127.0.0.1:PORT where Unix
+sockets aren't available) and exchange newline-delimited JSON. Each request
+line is one job:
+
+    {"ref": 1, "op": "compress", "inputs": ["/abs/a.pdf"], "output": "/abs/a_small.pdf",
+     "params": {"quality": "low"}, "priority": 0}
+
+"op" is a BatchOperationType value; a pipeline is sent as
+{"op": "pipeline", "inputs": [...], "stages": [...], "output": ...}. The server
+answers with events carrying the request's "ref":
+
+    {"event": "queued", "ref": 1, "id": 7, "position": 3}
+    {"event": "busy", "ref": 1, "queued": 64, "max_queue": 64}   -> not accepted, retry later
+    {"event": "started", "ref": 1, "id": 7}
+    {"event": "completed", "ref": 1, "id": 7, "success": true, "message": "...", "metrics": {...}}
+
+If a worker process dies (e.g. killed for running out of memory), the jobs
+that were running are queued again and then run one at a time, so only the
+job that crashes on its own fails; the others get {"event": "requeued", ...}
+and complete normally.
+
+{"command": "status"} reports queue and worker counts, {"command": "shutdown"}
+stops the server. Paths are resolved by the server, so send absolute paths.
+
+There is no authentication: any client can make the server read and write
+files as the user running it. TCP addresses are therefore limited to
+loopback hosts, and the Unix socket lives in the user's cache directory.
+"""
+import heapq
+import ipaddress
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+Address = Union[str, Tuple[str, int]]
+
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_PORT = 8765
+BUSY_RETRY_DELAY = 0.5  # Client wait before resubmitting a job the server was too busy for
+
+
+def default_address() -> Address:
+    """Unix socket in the user cache directory, or a localhost port on Windows."""
+    if not hasattr(socket, "AF_UNIX"):
+        return ("127.0.0.1", DEFAULT_PORT)
+    from core.app_paths import default_cache_dir
+    return os.path.join(default_cache_dir(), "server.sock")
+
+
+def _check_loopback(host: str):
+    """Raise ValueError unless host is localhost or a loopback address."""
+    if host == "localhost":
+        return
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Job server address must be a loopback host (e.g. 127.0.0.1), not {host!r}: "
+                         "the server has no authentication")
+
+
+def parse_address(text: Optional[str]) -> Address:
+    """
+    "HOST:PORT" or ":PORT" means TCP (host defaults to 127.0.0.1); anything else is a socket path.
+
+    Raises:
+        ValueError: HOST is not a loopback host
+    """
+    if not text:
+        return default_address()
+    host, sep, port = text.rpartition(":")
+    if sep and port.isdigit() and os.sep not in host:
+        host = host.strip("[]") or "127.0.0.1"  # [::1]:PORT
+        _check_loopback(host)
+        return (host, int(port))
+    return text
+
+
+def connect(address: Address) -> socket.socket:
+    if isinstance(address, tuple):
+        return socket.create_connection(address)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+def _send(wfile, lock: threading.Lock, message: Dict) -> bool:
+    """Write one NDJSON line; False if the peer has gone away."""
+    data = (json.dumps(message, default=str) + "\n").encode()
+    with lock:
+        try:
+            wfile.write(data)
+            wfile.flush()
+            return True
+        except OSError:
+            return False
+
+
+# --- Worker side ----------------------------------------------------------------
+
+def _init_worker(slots, warm_ocr: bool):
+    """Pool initializer: share operation slots and pay the import/model cost once."""
+    from core.batch_engine import init_worker
+    init_worker(slots)
+    from core.pdf_processor import EASYOCR_AVAILABLE, PDFProcessor
+    if warm_ocr and EASYOCR_AVAILABLE:
+        try:
+            PDFProcessor.get_reader()
+        except Exception as e:
+            print(f"Server worker {os.getpid()}: could not load OCR model: {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _serve_job(job):
+    from core.batch_engine import execute_job, measure_job
+    return measure_job(execute_job, job, job.job_id)
+
+
+# --- Server ---------------------------------------------------------------------
+
+class _ServerJob:
+    __slots__ = ("job", "ref", "send", "connection", "crashes")
+
+    def __init__(self, job, ref, send: Callable[[Dict], bool], connection: "_Connection"):
+        self.job = job
+        self.ref = ref
+        self.send = send
+        self.connection = connection
+        self.crashes = 0  # Worker crashes this job was running during
+
+
+class _Connection:
+    """Jobs a client connection is still waiting on, so its handler can wait for them."""
+
+    def __init__(self):
+        self.outstanding = 0
+        self.cond = threading.Condition()
+
+    def add(self):
+        with self.cond:
+            self.outstanding += 1
+
+    def done(self):
+        with self.cond:
+            self.outstanding -= 1
+            self.cond.notify_all()
+
+    def wait(self):
+        with self.cond:
+            self.cond.wait_for(lambda: self.outstanding == 0)
+
+
+class JobServer:
+    """
+    Accepts jobs from local clients and runs them on a warm process pool.
+
+    At most `max_workers` jobs run at once, higher priorities first, with the
+    same per-operation caps as BatchEngine. The queue holds at most
+    `max_queue` waiting jobs; beyond that a submission is answered with a
+    "busy" event instead of being accepted, so clients slow down rather than
+    the server growing without bound.
+    """
+
+    def __init__(self, address: Optional[Address] = None, max_workers: Optional[int] = None,
+                 max_queue: int = DEFAULT_MAX_QUEUE, operation_limits: Optional[Dict] = None,
+                 warm_ocr: bool = False):
+        """
+        Create the server (call serve_forever() to run it).
+
+        Args:
+            address: Unix socket path or (loopback host, port) (default: default_address())
+            max_workers: Worker processes (default: CPU count, max 4)
+            max_queue: Waiting jobs accepted before clients are told the server is busy
+            operation_limits: Per-operation caps (default: DEFAULT_OPERATION_LIMITS)
+            warm_ocr: Load the OCR model in every worker at start-up
+
+        Raises:
+            ValueError: The address is a TCP address on a non-loopback host
+        """
+        import multiprocessing
+        from core.batch_engine import DEFAULT_OPERATION_LIMITS
+
+        self.address = address or default_address()
+        if isinstance(self.address, tuple):
+            _check_loopback(self.address[0])
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.operation_limits = dict(DEFAULT_OPERATION_LIMITS if operation_limits is None else operation_limits)
+        self.warm_ocr = warm_ocr
+
+        self._ctx = multiprocessing.get_context()
+        self._slots = {}
+        self._pool = None
+        self._cond = threading.Condition()
+        self._pending = []  # Heap of (-priority, seq, _ServerJob)
+        self._seq = itertools.count(1)
+        self._running = 0
+        self._active = {}  # Operation type -> running count
+        self._isolated = False  # A job that was running during a crash is running on its own
+        self._stats = {"completed": 0, "failed": 0, "rejected": 0}
+        self._stopping = False
+        self._server = None
+
+    # --- Pool ---------------------------------------------------------------------
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Fresh operation slots too: a worker that died holding one never released it
+        self._slots = {op: self._ctx.BoundedSemaphore(limit) for op, limit in self.operation_limits.items()}
+        return ProcessPoolExecutor(self.max_workers, mp_context=self._ctx,
+                                   initializer=_init_worker, initargs=(self._slots, self.warm_ocr))
+
+    def warm_up(self):
+        """Start every worker now so the first jobs don't wait for imports."""
+        self._pool = self._pool or self._new_pool()
+        pings = [self._pool.submit(_ping) for _ in range(self.max_workers)]
+        pids = {f.result() for f in pings}
+        print(f"Job server: {len(pids)} worker(s) ready")
+
+    # --- Queue --------------------------------------------------------------------
+
+    def submit(self, job, ref=None, send: Callable[[Dict], bool] = lambda m: True,
+               connection: Optional[_Connection] = None) -> Dict:
+        """Queue a job; returns the "queued" or "busy" event for the client."""
+        with self._cond:
+            if self._stopping:
+                return {"event": "error", "ref": ref, "message": "Server is shutting down"}
+            if len(self._pending) >= self.max_queue:
+                self._stats["rejected"] += 1
+                return {"event": "busy", "ref": ref, "queued": len(self._pending), "max_queue": self.max_queue}
+            seq = next(self._seq)
+            job.job_id = seq
+            connection = connection or _Connection()
+            connection.add()
+            heapq.heappush(self._pending, (-job.priority, seq, _ServerJob(job, ref, send, connection)))
+            position = len(self._pending)
+            self._cond.notify_all()
+        return {"event": "queued", "ref": ref, "id": seq, "position": position}
+
+    def status(self) -> Dict:
+        with self._cond:
+            return {"event": "status", "queued": len(self._pending), "running": self._running,
+                    "workers": self.max_workers, "max_queue": self.max_queue, **self._stats}
+
+    def _next_job(self) -> Optional[_ServerJob]:
+        """
+        Block until a worker is free and a queued job's operation has a slot.
+
+        A job that was running when a worker crashed only starts once nothing
+        else is running, and nothing else starts while it runs, so a second
+        crash can be blamed on it alone.
+        """
+        with self._cond:
+            while True:
+                if self._stopping:
+                    return None
+                if self._running < self.max_workers and not self._isolated:
+                    deferred = []
+                    picked = None
+                    while self._pending:
+                        entry = heapq.heappop(self._pending)
+                        if entry[2].crashes:
+                            deferred.append(entry)
+                            if self._running:
+                                break  # Let the running jobs drain first
+                            self._isolated = True
+                            picked = deferred.pop()[2]
+                            break
+                        op = entry[2].job.operation_type
+                        limit = self.operation_limits.get(op)
+                        if limit is not None and self._active.get(op, 0) >= limit:
+                            deferred.append(entry)
+                            continue
+                        picked = entry[2]
+                        break
+                    for entry in deferred:
+                        heapq.heappush(self._pending, entry)
+                    if picked:
+                        op = picked.job.operation_type
+                        self._running += 1
+                        self._active[op] = self._active.get(op, 0) + 1
+                        return picked
+                self._cond.wait()
+
+    def _dispatch_loop(self):
+        while True:
+            item = self._next_job()
+            if item is None:
+                return
+            item.job.status = "running"
+            item.send({"event": "started", "ref": item.ref, "id": item.job.job_id})
+            pool = self._pool
+            try:
+                future = pool.submit(_serve_job, item.job)
+            except BrokenProcessPool:
+                self._requeue(item, pool, crashed=False)  # Broken by another job
+                continue
+            except RuntimeError as e:
+                self._finish(item, pool, False, f"Worker pool unavailable: {e}", None)
+                continue
+            future.add_done_callback(lambda f, item=item, pool=pool: self._on_done(item, pool, f))
+
+    def _on_done(self, item: _ServerJob, pool, future):
+        try:
+            success, message, metrics = future.result()
+        except BrokenProcessPool:
+            if not item.crashes:
+                # Any of the jobs running at the time may have caused it
+                self._requeue(item, pool, crashed=True)
+                return
+            success, message, metrics = False, "Worker process crashed", None
+        except Exception as e:
+            success, message, metrics = False, str(e), None
+        self._finish(item, pool, success, message, metrics)
+
+    def _release(self, item: _ServerJob, pool):
+        """Give back a job's worker (caller holds self._cond)."""
+        self._running -= 1
+        self._active[item.job.operation_type] -= 1
+        if item.crashes:
+            self._isolated = False
+        # A crashed worker breaks the whole executor; replace it once
+        if pool is self._pool and getattr(pool, "_broken", False) and not self._stopping:
+            self._pool = self._new_pool()
+
+    def _requeue(self, item: _ServerJob, pool, crashed: bool):
+        """Queue a job again after its worker pool broke."""
+        if self._stopping:
+            self._finish(item, pool, False, "Worker process crashed", None)
+            return
+        item.job.status = "pending"
+        with self._cond:
+            self._release(item, pool)
+            item.crashes += crashed
+            heapq.heappush(self._pending, (-item.job.priority, item.job.job_id, item))
+            self._cond.notify_all()
+        item.send({"event": "requeued", "ref": item.ref, "id": item.job.job_id,
+                   "message": "Worker process crashed; running the job again"})
+
+    def _finish(self, item: _ServerJob, pool, success: bool, message: str, metrics: Optional[Dict]):
+        job = item.job
+        job.status = "completed" if success else "failed"
+        with self._cond:
+            self._release(item, pool)
+            self._stats["completed" if success else "failed"] += 1
+            self._cond.notify_all()
+        item.send({"event": "completed", "ref": item.ref, "id": job.job_id, "success": success,
+                   "message": message, "metrics": metrics})
+        item.connection.done()
+
+    # --- Socket -------------------------------------------------------------------
+
+    def handle_request(self, request: Dict, send: Callable[[Dict], bool], connection: _Connection) -> Dict:
+        """Answer one request line from a client."""
+        command = request.get("command", "submit")
+        ref = request.get("ref")
+        if command == "status":
+            return {**self.status(), "ref": ref}
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"event": "shutting_down", "ref": ref}
+        if command != "submit":
+            return {"event": "error", "ref": ref, "message": f"Unknown command: {command}"}
+        try:
+            job = job_from_request(request)
+        except (KeyError, ValueError, TypeError) as e:
+            return {"event": "error", "ref": ref, "message": f"Invalid job: {e}"}
+        return self.submit(job, ref, send, connection)
+
+    def _make_server(self) -> socketserver.BaseServer:
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                lock = threading.Lock()
+                connection = _Connection()
+
+                def send(message):
+                    return _send(self.wfile, lock, message)
+
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        send({"event": "error", "message": f"Invalid JSON: {e}"})
+                        continue
+                    send(server.handle_request(request, send, connection))
+                # The client may close its sending side and still wait for results
+                connection.wait()
+
+        if isinstance(self.address, tuple):
+            class TCPServer(socketserver.ThreadingTCPServer):
+                daemon_threads = True
+                allow_reuse_address = True
+            return TCPServer(self.address, Handler)
+
+        if os.path.exists(self.address):
+            # Leftover from a server that didn't exit cleanly, unless one is still listening
+            try:
+                connect(self.address).close()
+                raise RuntimeError(f"A server is already listening on {self.address}")
+            except ConnectionRefusedError:
+                os.remove(self.address)
+        os.makedirs(os.path.dirname(os.path.abspath(self.address)), exist_ok=True)
+
+        class UnixServer(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+        return UnixServer(self.address, Handler)
+
+    def serve_forever(self):
+        """Warm up the workers and serve clients until shutdown() or Ctrl+C."""
+        self._server = self._make_server()
+        self.warm_up()
+        dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        dispatcher.start()
+        print(f"Job server listening on {self.address}")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with self._cond:
+                self._stopping = True
+                dropped, self._pending = self._pending, []
+                self._cond.notify_all()
+            for _, _, item in dropped:
+                item.send({"event": "completed", "ref": item.ref, "id": item.job.job_id, "success": False,
+                           "message": "Server stopped", "metrics": None})
+                item.connection.done()
+            self._server.server_close()
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.remove(self.address)
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            print("Job server stopped")
+
+    def shutdown(self):
+        """Stop accepting connections; running jobs finish, queued ones are dropped."""
+        if self._server:
+            self._server.shutdown()
+
+
+def job_from_request(request: Dict):
+    """Build a BatchJob from a submit request."""
+    from core.batch_engine import BatchJob, BatchOperationType, pipeline_job
+
+    inputs = request["inputs"]
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    output = request.get("output", "")
+    priority = int(request.get("priority", 0))
+    if "stages" in request:
+        return pipeline_job(inputs[0], request["stages"], output, priority)
+    return BatchJob(BatchOperationType(request["op"]), list(inputs), output,
+                    request.get("params") or {}, priority)
+
+
+def job_request(job, ref=None) -> Dict:
+    """Submit request for a BatchJob, with paths made absolute for the server."""
+    params = job.params
+    stages = params.get("stages")
+    if stages:
+        params = {**params, "stages": [{**stage, "output": stage["output"] and os.path.abspath(stage["output"])}
+                                       for stage in stages]}
+    return {"ref": ref, "op": job.operation_type.value,
+            "inputs": [os.path.abspath(path) for path in job.input_files],
+            "output": os.path.abspath(job.output_path) if job.output_path else "",
+            "params": params, "priority": job.priority}
+
+
+# --- Client ---------------------------------------------------------------------
+
+def run_remote(address: Address, jobs: List, on_event: Optional[Callable[[Dict], None]] = None
+               ) -> List[Tuple[bool, str, Optional[Dict]]]:
+    """
+    Run jobs on a job server and wait for all of them.
+
+    Jobs the server is too busy to accept are resubmitted once one of ours
+    finishes (or after BUSY_RETRY_DELAY), so a client never overfills the queue.
+
+    Args:
+        address: Server address
+        jobs: BatchJobs to run
+        on_event: Optional callable(event) for every event received (progress)
+
+    Returns:
+        (success, message, metrics) per job, in order
+    """
+    sock = connect(address)
+    events = queue.Queue()
+    reader = sock.makefile("rb")
+
+    def read_events():
+        try:
+            for line in reader:
+                events.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        events.put(None)
+
+    threading.Thread(target=read_events, daemon=True).start()
+    wfile = sock.makefile("wb")
+    lock = threading.Lock()
+
+    results = [None] * len(jobs)
+    waiting = deque(range(len(jobs)))
+    acked = True   # The last submission was answered
+    retry_at = 0.0  # Set while the server is busy
+    try:
+        while any(result is None for result in results):
+            if acked and waiting and time.monotonic() >= retry_at:
+                index = waiting.popleft()
+                if not _send(wfile, lock, job_request(jobs[index], index)):
+                    raise ConnectionError("Job server closed the connection")
+                acked = False
+
+            timeout = max(0.05, retry_at - time.monotonic()) if acked and waiting else None
+            try:
+                event = events.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if event is None:
+                raise ConnectionError("Job server closed the connection")
+            if on_event:
+                on_event(event)
+
+            kind, ref = event.get("event"), event.get("ref")
+            if kind == "busy":
+                waiting.appendleft(ref)
+                acked = True
+                retry_at = time.monotonic() + BUSY_RETRY_DELAY
+            elif kind == "queued":
+                acked = True
+            elif kind == "error":
+                acked = True
+                if ref is not None:
+                    results[ref] = (False, event.get("message", "Error"), None)
+            elif kind == "completed":
+                results[ref] = (event["success"], event["message"], event.get("metrics"))
+                retry_at = 0.0  # A slot opened up
+    finally:
+        sock.close()
+    return results
+
+
+def request_once(address: Address, request: Dict) -> Dict:
+    """Send one command (e.g. status, shutdown) and return the reply."""
+    with connect(address) as sock:
+        sock.sendall((json.dumps(request) + "\n").encode())
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("Job server closed the connection")
+    return json.loads(line)
@@ -0,0 +1,371 @@
+"""
+Hot-folder watcher.
+
+Watches an inbox folder (e.g. where scanner stations drop PDFs) and runs a
+fixed pipeline of PDFProcessor operations on every new file through the
+BatchEngine. Results go to an output folder; files that fail are moved to a
+quarantine folder next to a .error.txt explaining why.
+
+A file is only picked up once it is completely written: its size and
+modification time must stay the same for `settle` seconds and a PDF must
+end with its %%EOF trailer. New files are noticed through watchdog
+(inotify/FSEvents/ReadDirectoryChangesW) when it is installed, otherwise by
+polling.
+
+A ledger (SQLite) records every file by content hash, so a restart never
+processes a file twice: finished files are skipped even if they are still in
+the inbox, and files that were being processed when the watcher stopped are
+run again. Outputs are written under a temporary name and renamed only after
+the ledger records them, so a crash can't leave a file both half-written and
+marked done.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+DEFAULT_SETTLE = 2.0          # Seconds a file must stay unchanged before it is processed
+DEFAULT_POLL_INTERVAL = 5.0   # Folder scan interval without watchdog
+WATCHDOG_POLL_INTERVAL = 60.0  # Safety-net scan interval with watchdog
+PARTIAL_PREFIX = ".partial-"   # Outputs being written
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    output TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_path ON files (path);
+"""
+
+
+def parse_step(spec: str) -> Dict[str, Any]:
+    """
+    Parse a pipeline step like "compress:quality=low" or "add_password:password=secret".
+
+    Numeric values become ints; "pages=1;2;3" becomes a list.
+    """
+    op, _, args = spec.partition(":")
+    params = {}
+    for pair in filter(None, args.split(",")):
+        key, _, value = pair.partition("=")
+        if ";" in value:
+            params[key] = [int(v) if v.isdigit() else v for v in value.split(";") if v]
+        else:
+            params[key] = int(value) if value.isdigit() else value
+    return {"op": op.strip(), "params": params}
+
+
+class WatchLedger:
+    """Which inbox files (by content) have been processed, in SQLite (WAL mode)."""
+
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def status_of(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Status of the file last seen at this path with this size and mtime, if any."""
+        with self.lock:
+            row = self.conn.execute("SELECT status FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                                    (path, st.st_size, st.st_mtime_ns)).fetchone()
+        return row[0] if row else None
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT path, status, output, error FROM files WHERE sha256 = ?",
+                                    (sha256,)).fetchone()
+        return dict(zip(("path", "status", "output", "error"), row)) if row else None
+
+    def set(self, sha256: str, path: str, st: os.stat_result, status: str,
+            output: Optional[str] = None, error: Optional[str] = None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (sha256, path, size, mtime_ns, status, output, error, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha256, path, st.st_size, st.st_mtime_ns, status, output, error, time.time()))
+
+    def finished_outputs(self) -> List[str]:
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT output FROM files WHERE status = 'done'")]
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _partial_path(output: str) -> str:
+    folder, name = os.path.split(output)
+    return os.path.join(folder, PARTIAL_PREFIX + name)
+
+
+def _unique_path(path: str, tag: str) -> str:
+    if not os.path.exists(path):
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{tag}{ext}"
+
+
+class _Candidate:
+    __slots__ = ("size", "mtime_ns", "since")
+
+    def __init__(self, st: os.stat_result, now: float):
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.since = now
+
+
+class FolderWatcher:
+    """
+    Runs a pipeline on every file that lands in an inbox folder.
+
+    Scanning runs on the calling thread (run()); jobs run on a BatchEngine
+    in follow mode on a second thread, so files keep being picked up while
+    earlier ones are processed, up to `workers` at a time.
+    """
+
+    def __init__(self, inbox: str, output_dir: str, quarantine_dir: str, stages: List[Dict[str, Any]],
+                 workers: Optional[int] = None, pattern: str = "*.pdf", archive_dir: Optional[str] = None,
+                 ledger_path: Optional[str] = None, settle: float = DEFAULT_SETTLE,
+                 poll_interval: Optional[float] = None, operation_limits: Optional[Dict] = None):
+        """
+        Configure a watcher.
+
+        Args:
+            inbox: Folder to watch (not recursive)
+            output_dir: Where results are written, under the input's file name
+            quarantine_dir: Where failed inputs are moved
+            stages: Pipeline stages (see pipeline_job); a plain list runs as a chain
+            workers: Files processed at once (default: CPU count, max 4)
+            pattern: Which file names to pick up
+            archive_dir: Move inputs here once processed (default: leave them in the inbox)
+            ledger_path: Ledger database (default: <inbox>/.excode-watch.db)
+            settle: Seconds a file must stay unchanged before it is picked up
+            poll_interval: Seconds between folder scans (default depends on watchdog)
+            operation_limits: Per-operation caps for the engine (default: none, so
+                              every worker can run the slowest step)
+        """
+        from core.batch_engine import BatchEngine
+
+        self.inbox = os.path.abspath(inbox)
+        self.output_dir = os.path.abspath(output_dir)
+        self.quarantine_dir = os.path.abspath(quarantine_dir)
+        self.archive_dir = os.path.abspath(archive_dir) if archive_dir else None
+        self.stages = stages
+        self.pattern = pattern.lower()
+        self.settle = settle
+        self.poll_interval = poll_interval or (WATCHDOG_POLL_INTERVAL if WATCHDOG_AVAILABLE else DEFAULT_POLL_INTERVAL)
+        for folder in filter(None, (self.output_dir, self.quarantine_dir, self.archive_dir)):
+            os.makedirs(folder, exist_ok=True)
+
+        self.ledger = WatchLedger(ledger_path or os.path.join(self.inbox, ".excode-watch.db"))
+        self.engine = BatchEngine(max_workers=workers, operation_limits=operation_limits or {})
+        self.jobs = []       # Grows as the engine appends added jobs
+        self.sources = {}    # id(job) -> (path, sha256, stat)
+        self.in_flight = set()  # Paths queued or running
+        self.candidates = {}    # Path -> _Candidate being watched for stability
+        self.duplicates = set()  # (path, size, mtime_ns) of copies of processed files
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.stats = {"done": 0, "failed": 0, "skipped": 0}
+
+    # --- Output naming ------------------------------------------------------------
+
+    def _output_for(self, path: str, sha256: str) -> str:
+        name = os.path.basename(path)
+        last_op = self.stages[-1]["op"]
+        last_op = getattr(last_op, "value", last_op)
+        if last_op == "extract_text":
+            name = os.path.splitext(name)[0] + ".txt"
+        # A scanner reusing a file name for a new document must not overwrite the old result
+        return _unique_path(os.path.join(self.output_dir, name), sha256[:8])
+
+    def recover(self):
+        """Finish renames interrupted by a crash after the ledger recorded them."""
+        for output in self.ledger.finished_outputs():
+            partial = _partial_path(output)
+            if output and not os.path.exists(output) and os.path.exists(partial):
+                os.replace(partial, output)
+
+    # --- Detecting complete files -----------------------------------------------------
+
+    @staticmethod
+    def _looks_complete(path: str) -> bool:
+        """A PDF is only complete once its trailer has been written."""
+        try:
+            with open(path, "rb") as f:
+                if not path.lower().endswith(".pdf"):
+                    return True
+                f.seek(max(0, os.fstat(f.fileno()).st_size - 1024))
+                return b"%%EOF" in f.read()
+        except OSError:  # Still locked by the writer (Windows)
+            return False
+
+    def scan(self):
+        """Look at the inbox once and queue every file that has become complete."""
+        now = time.monotonic()
+        try:
+            entries = [e for e in os.scandir(self.inbox) if e.is_file() and fnmatch(e.name.lower(), self.pattern)]
+        except OSError as e:
+            print(f"Watcher: cannot read {self.inbox}: {e}")
+            return
+
+        present = set()
+        for entry in entries:
+            path = entry.path
+            present.add(path)
+            with self.lock:
+                if path in self.in_flight:
+                    continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if (path, st.st_size, st.st_mtime_ns) in self.duplicates or self.ledger.status_of(path, st) == "done":
+                continue
+
+            candidate = self.candidates.get(path)
+            if candidate is None or (candidate.size, candidate.mtime_ns) != (st.st_size, st.st_mtime_ns):
+                self.candidates[path] = _Candidate(st, now)
+                continue
+            if now - candidate.since < self.settle or st.st_size == 0 or not self._looks_complete(path):
+                continue
+            del self.candidates[path]
+            self._queue(path, st)
+
+        for path in set(self.candidates) - present:
+            del self.candidates[path]
+
+    def _queue(self, path: str, st: os.stat_result):
+        from core.batch_engine import pipeline_job
+
+        sha256 = file_sha256(path)
+        record = self.ledger.get(sha256)
+        if record and record["status"] == "done":
+            # Same content already processed (e.g. copied in again under another name);
+            # remembered by path so later scans don't hash it again
+            self.duplicates.add((path, st.st_size, st.st_mtime_ns))
+            print(f"Watcher: skipping {os.path.basename(path)}, already processed as {record['output']}")
+            self.stats["skipped"] += 1
+            return
+
+        output = self._output_for(path, sha256)
+        self.ledger.set(sha256, path, st, "processing", output)
+        job = pipeline_job(path, self.stages, _partial_path(output))
+        with self.lock:
+            self.in_flight.add(path)
+            self.sources[id(job)] = (path, sha256, st, output)
+        self.engine.add(job)
+
+    # --- Results ------------------------------------------------------------------
+
+    def _on_completed(self, index: int, success: bool, message: str):
+        job = self.jobs[index]
+        with self.lock:
+            path, sha256, st, output = self.sources.pop(id(job))
+        name = os.path.basename(path)
+        partial = job.output_path
+        try:
+            if job.status == "cancelled":
+                # Stopped mid-way: left as "processing", so it runs again on restart
+                if os.path.exists(partial):
+                    os.remove(partial)
+                return
+            if success:
+                self.ledger.set(sha256, path, st, "done", output)
+                os.replace(partial, output)
+                if self.archive_dir:
+                    shutil.move(path, _unique_path(os.path.join(self.archive_dir, name), sha256[:8]))
+                self.stats["done"] += 1
+                print(f"Watcher: {name} -> {output}")
+            else:
+                self.ledger.set(sha256, path, st, "failed", None, message)
+                if os.path.exists(partial):
+                    os.remove(partial)
+                target = _unique_path(os.path.join(self.quarantine_dir, name), sha256[:8])
+                shutil.move(path, target)
+                with open(target + ".error.txt", "w", encoding="utf-8") as f:
+                    f.write(message + "\n")
+                self.stats["failed"] += 1
+                print(f"Watcher: {name} failed, moved to quarantine: {message}")
+        except OSError as e:
+            print(f"Watcher: could not finish {name}: {e}")
+        finally:
+            with self.lock:
+                self.in_flight.discard(path)
+
+    # --- Running ------------------------------------------------------------------
+
+    def _start_observer(self):
+        if not WATCHDOG_AVAILABLE:
+            return None
+        wake = self.wake
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+
+        observer = Observer()
+        observer.schedule(Handler(), self.inbox, recursive=False)
+        observer.start()
+        return observer
+
+    def run(self):
+        """Watch until stop() or Ctrl+C."""
+        self.recover()
+        engine_thread = threading.Thread(target=self.engine.run, args=(self.jobs,),
+                                         kwargs={"on_completed": self._on_completed, "follow": True}, daemon=True)
+        engine_thread.start()
+        observer = self._start_observer()
+        print(f"Watching {self.inbox} ({'watchdog' if observer else 'polling'}, "
+              f"{self.engine.max_workers} worker(s))")
+        try:
+            while not self.stopping.is_set():
+                self.scan()
+                # Re-check soon while files are settling; otherwise wait for an event or the next poll
+                timeout = self.settle / 2 if self.candidates else self.poll_interval
+                self.wake.wait(timeout)
+                self.wake.clear()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+            self.engine.stop()
+            engine_thread.join()
+            self.ledger.close()
+            print(f"Watcher stopped: {self.stats['done']} done, {self.stats['failed']} failed, "
+                  f"{self.stats['skipped']} duplicates skipped")
+
+    def stop(self):
+        self.stopping.set()
+        self.wake.set()
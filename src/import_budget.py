@@ -0,0 +1,98 @@
+"""
+Import-time budget for cold start.
+
+Imports each entry module in a fresh interpreter with `-X importtime`,
+compares the cumulative time against its budget, and checks that the heavy
+libraries (loaded lazily) were not actually imported. Exits with 1 if any
+budget is exceeded, so it can run in CI.
+
+Usage (from the src directory):
+    python import_budget.py            # check all budgets
+    python import_budget.py --top 20   # also list the slowest imports
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Milliseconds allowed for importing each module in a fresh interpreter
+IMPORT_BUDGETS_MS = {
+    "core.pdf_processor": 100,
+    "excode.cli": 50,
+    "ui.main_window": 800,
+}
+
+# Libraries that must stay unloaded until an operation needs them
+LAZY_MODULES = ("fitz", "pypdf", "pikepdf", "numpy", "PIL.Image", "qrcode", "requests",
+                "easyocr", "torch", "cv2", "docx", "pdfminer.high_level")
+
+# Each module is imported this many times; the fastest run counts (less noise)
+RUNS = 3
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+_PROBE = """
+import json, sys
+import {module}
+loaded = [name for name in {lazy!r}
+          if name in sys.modules and type(sys.modules[name]).__name__ != "_LazyModule"]
+print(json.dumps(loaded))
+"""
+
+
+def measure(module: str):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple of (total ms, [(cumulative ms, name) of the modules it imports], [eagerly loaded lazy modules])
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, lazy=LAZY_MODULES)],
+                          capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    # Children are listed before their parent; the module's own imports are the
+    # lines between the previous top-level entry (e.g. site) and its own
+    total = 0.0
+    block, imports = [], []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)) / 1000, len(match.group(3)), match.group(4)
+        if indent > 1:
+            block.append((cumulative, name))
+            continue
+        if name == module:
+            total, imports = cumulative, block
+        block = []
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return total, imports, loaded
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=0, help="List the N slowest imports of each module")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(RUNS)]
+        total, imports, loaded = min(runs, key=lambda run: run[0])
+        over = total > budget
+        print(f"{'FAIL' if over or loaded else 'OK  '} {module}: {total:.0f} ms (budget {budget} ms)")
+        if loaded:
+            print(f"     imported eagerly: {', '.join(loaded)}")
+        if args.top or over:
+            for cumulative, name in sorted(imports, reverse=True)[:args.top or 10]:
+                print(f"     {cumulative:8.1f} ms  {name}")
+        failed |= over or bool(loaded)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
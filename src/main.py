@@ -1,27 +1,80 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from ui.main_window import MainWindow
-from ui.startup import StartupScreen
+import argparse
+import multiprocessing
+
+def main(profiler=None, profile_args=None):
+    from PySide6.QtWidgets import QApplication
+    from ui.startup import StartupScreen, startup_settings, warm_up_in_background
 
-def main():
     app = QApplication(sys.argv)
     app.setStyle("Fusion") 
-    
-    # Show Splash
-    splash = StartupScreen()
+    if profiler:
+        profiler.mark("app_created")
     
     # Store window in a mutable object (list) to access it in nested function
     main_window_container = []
 
+    def build_main():
+        # Imported here so the splash is on screen while the views load
+        from ui.main_window import MainWindow
+        main_window_container.append(MainWindow(prebuild_views))
+        if profiler:
+            profiler.mark("main_window_built")
+
     def show_main():
-        window = MainWindow()
+        if not main_window_container:
+            app.exit(1)  # build_main failed; the error has been printed
+            return
+        window = main_window_container[0]
+        if profiler:
+            profiler.mark_first_paint(window, "main_window_first_paint", finish_profile)
         window.show()
-        main_window_container.append(window)
 
-    splash.finished.connect(show_main)
+    def finish_profile():
+        from ui.startup_profiler import finish
+        from ui.main_window import VIEW_CLASSES
+
+        # Build every other view now so each constructor is in the report;
+        # the import profile stops at first paint, like start-up itself
+        profiler.imports.uninstall()
+        window = main_window_container[0]
+        for route in VIEW_CLASSES:
+            window.get_view(route)
+        for route, seconds in window.view_build_times.items():
+            profiler.view_built(route, seconds)
+        app.exit(finish(profiler, profile_args.profile_startup, profile_args.baseline, profile_args.save_baseline))
+
+    # Show Splash while the main window is built; it closes as soon as that is done
+    min_splash_ms, preload_ocr, prebuild_views = startup_settings()
+    if profiler:
+        min_splash_ms, prebuild_views = 0, False  # Measure the app, not the settings
+    splash = StartupScreen([("Loading tools...", build_main)], min_display_ms=min_splash_ms)
+    splash.ready.connect(show_main)
+    if profiler:
+        profiler.mark_first_paint(splash, "splash_first_paint")
     splash.show()
+    warm_up_in_background(preload_ocr)
     
     sys.exit(app.exec())
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Excode PDF Tool")
+    parser.add_argument("--profile-startup", nargs="?", const="", metavar="REPORT.json",
+                        help="Profile start-up (imports, views, first paint), print a summary, "
+                             "optionally write the JSON report, then exit")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="Baseline report to compare with (default: <user cache>/ExcodePDF/startup_baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Save this profile as the new baseline")
+    # Anything else (e.g. Qt's -platform) is left for QApplication
+    args, sys.argv[1:] = parser.parse_known_args()
+    return args
+
 if __name__ == "__main__":
-    main()
+    multiprocessing.freeze_support()  # Worker processes in the frozen .exe
+    args = parse_args()
+    profiler = None
+    if args.profile_startup is not None:
+        from ui.startup_profiler import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.start()
+    main(profiler, args)
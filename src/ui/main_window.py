@@ -1,31 +1,38 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QStackedWidget, QFrame, QLabel, QSizeGrip
-from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup
-from PySide6.QtGui import QIcon
-import qtawesome as qta
-
-from ui.views.home_view import HomeView
-from ui.views.create_view import CreateView
-from ui.views.tools_view import ToolsView
-from ui.views.text_view import TextView
-from ui.views.file_view import FileView
-from ui.views.qr_view import QRView
-from ui.views.info_view import InfoView
+import importlib
+import time
 
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QStackedWidget, QFrame, QLabel, QSizeGrip, QButtonGroup
-from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup
+from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QTimer
 from PySide6.QtGui import QIcon
 import qtawesome as qta
 
-from ui.views.home_view import HomeView
-from ui.views.create_view import CreateView
-from ui.views.tools_view import ToolsView
-from ui.views.text_view import TextView
-from ui.views.file_view import FileView
-from ui.views.qr_view import QRView
-from ui.views.info_view import InfoView
+# Views are imported and built the first time they are navigated to.
+# Route -> (module, class); "split" and "compress" are tabs of the "merge" (tools) view.
+VIEW_CLASSES = {
+    "home": ("ui.views.home_view", "HomeView"),
+    "create": ("ui.views.create_view", "CreateView"),
+    "merge": ("ui.views.tools_view", "ToolsView"),
+    "text": ("ui.views.text_view", "TextView"),
+    "file": ("ui.views.file_view", "FileView"),
+    "qr": ("ui.views.qr_view", "QRView"),
+    "info": ("ui.views.info_view", "InfoView"),
+    "settings": ("ui.views.settings_view", "SettingsView"),
+}
+ROUTE_ALIASES = {"split": "merge", "compress": "merge"}
+TOOLS_TABS = {"merge": 0, "split": 1, "compress": 2}
+
+# Delay after start-up before idle-time prebuilding starts, and between views
+PREBUILD_DELAY_MS = 1500
+PREBUILD_INTERVAL_MS = 200
+
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, prebuild_views=False):
+        """
+        Args:
+            prebuild_views: Build the views not visited yet in the background
+                            once the window is idle, so switching to them is instant
+        """
         super().__init__()
         self.setWindowTitle("Advanced PDF Tool - Premium Edition")
         self.resize(1200, 800)
@@ -90,6 +97,7 @@ class MainWindow(QMainWindow):
         self.sidebar_layout.addStretch()
         
         # Bottom Actions
+        self.add_nav_btn("Settings", "settings", "fa5s.cog")
         self.add_nav_btn("Premium / About", "info", "fa5s.crown")
         
         # Add Sidebar to Main Layout
@@ -99,9 +107,10 @@ class MainWindow(QMainWindow):
         self.content_stack = QStackedWidget()
         self.main_layout.addWidget(self.content_stack)
         
-        # Views
+        # Views (built on first navigation, see get_view)
         self.views = {}
-        self.init_views()
+        self.view_build_times = {}
+        self.init_views(prebuild_views)
         
         # Styles
         with open("src/ui/styles.qss", "r") as f:
@@ -164,36 +173,36 @@ class MainWindow(QMainWindow):
                 btn.setStyleSheet("") # Revert to .qss default (left aligned)
                 btn.setToolTip("")
 
-    def init_views(self):
-        self.home_view = HomeView(self.navigate)
-        self.content_stack.addWidget(self.home_view)
-        self.views["home"] = self.home_view
-        
-        self.create_view = CreateView()
-        self.content_stack.addWidget(self.create_view)
-        self.views["create"] = self.create_view
-        
-        self.tools_view = ToolsView()
-        self.content_stack.addWidget(self.tools_view)
-        self.views["merge"] = self.tools_view
-        self.views["split"] = self.tools_view
-        self.views["compress"] = self.tools_view
-        
-        self.text_view = TextView()
-        self.content_stack.addWidget(self.text_view)
-        self.views["text"] = self.text_view
+    def init_views(self, prebuild=False):
+        # Only the start page is built now; the rest on demand or when idle
+        self.get_view("home")
+        if prebuild:
+            self.prebuild_timer = QTimer(self)
+            self.prebuild_timer.setInterval(PREBUILD_INTERVAL_MS)
+            self.prebuild_timer.timeout.connect(self.prebuild_next_view)
+            QTimer.singleShot(PREBUILD_DELAY_MS, self.prebuild_timer.start)
 
-        self.file_view = FileView()
-        self.content_stack.addWidget(self.file_view)
-        self.views["file"] = self.file_view
-        
-        self.qr_view = QRView()
-        self.content_stack.addWidget(self.qr_view)
-        self.views["qr"] = self.qr_view
-        
-        self.info_view = InfoView()
-        self.content_stack.addWidget(self.info_view)
-        self.views["info"] = self.info_view
+    def get_view(self, route):
+        """The view for a route, importing and building it on first use."""
+        key = ROUTE_ALIASES.get(route, route)
+        view = self.views.get(key)
+        if view is None and key in VIEW_CLASSES:
+            start = time.perf_counter()
+            module_name, class_name = VIEW_CLASSES[key]
+            view_class = getattr(importlib.import_module(module_name), class_name)
+            view = view_class(self.navigate) if key == "home" else view_class()
+            self.content_stack.addWidget(view)
+            self.views[key] = view
+            self.view_build_times[key] = time.perf_counter() - start  # For --profile-startup
+        return view
+
+    def prebuild_next_view(self):
+        # One view per tick, so the window stays responsive in between
+        for key in VIEW_CLASSES:
+            if key not in self.views:
+                self.get_view(key)
+                return
+        self.prebuild_timer.stop()
 
     def navigate(self, route, sender_btn=None):
         # Update Button States (Visuals)
@@ -204,11 +213,9 @@ class MainWindow(QMainWindow):
         
         # Resolve target button if not explicit or if navigating to sub-route
         if not target_btn:
+            key = ROUTE_ALIASES.get(route, route)
             for btn, r, _, _ in self.nav_buttons:
-                mapped = r
-                if route in ["split", "compress"]: mapped = "merge"
-                
-                if r == mapped or (route in ["split", "compress"] and r == "merge"):
+                if r == key:
                     target_btn = btn
                     break
 
@@ -219,16 +226,11 @@ class MainWindow(QMainWindow):
                 color = "#FFFFFF" if btn == target_btn else "#909090"
                 btn.setIcon(qta.icon(icon, color=color))
 
-        # Switch Switch View
-        if route in self.views:
-            self.content_stack.setCurrentWidget(self.views[route])
+        # Switch View (built on first visit)
+        view = self.get_view(route)
+        if view is not None:
+            self.content_stack.setCurrentWidget(view)
             
             # Handle Tab Switching in Tools View
-            if route == "merge" and hasattr(self.views[route], "set_current_tab"):
-                 self.views[route].set_current_tab(0)
-            elif route == "split" and hasattr(self.views[route], "set_current_tab"):
-                 self.views[route].set_current_tab(1)
-            elif route == "compress" and hasattr(self.views[route], "set_current_tab"):
-                 self.views[route].set_current_tab(2)
-
-
+            if route in TOOLS_TABS and hasattr(view, "set_current_tab"):
+                 view.set_current_tab(TOOLS_TABS[route])
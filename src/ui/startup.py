@@ -1,8 +1,10 @@
 import sys
 import math
 import random
+import threading
+from collections import deque
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGraphicsOpacityEffect, QApplication
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, Signal, QRectF, QPointF
+from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, Signal, QRectF, QPointF, QElapsedTimer, QSettings
 from PySide6.QtGui import QFont, QColor, QPainter, QLinearGradient, QBrush, QPen, QRadialGradient
 
 class Particle:
@@ -26,10 +28,58 @@ class Particle:
         if self.y < 0: self.y = h
         if self.y > h: self.y = 0
 
+# QSettings keys (organization "Excode", application "PDFTool")
+MIN_SPLASH_MS_KEY = "startup/min_splash_ms"  # Minimum splash time; 0 closes as soon as ready
+PRELOAD_OCR_KEY = "startup/preload_ocr"      # Load the OCR model in the background at start-up
+PREBUILD_VIEWS_KEY = "startup/prebuild_views"  # Build unvisited views when the main window is idle
+
+
+def startup_settings():
+    """(minimum splash time in ms, preload OCR model, prebuild views) from the user's settings."""
+    settings = QSettings("Excode", "PDFTool")
+
+    def flag(key):
+        return str(settings.value(key, "false")).lower() in ("1", "true")
+
+    return int(settings.value(MIN_SPLASH_MS_KEY, 0)), flag(PRELOAD_OCR_KEY), flag(PREBUILD_VIEWS_KEY)
+
+
+def warm_up_in_background(preload_ocr: bool = False) -> threading.Thread:
+    """
+    Load what the first operations will need on a daemon thread.
+
+    Imports PyMuPDF, trims the thumbnail cache when it is due, and with
+    preload_ocr loads the OCR model, so the first PDF a user opens doesn't
+    wait for them.
+    """
+    def warm_up():
+        try:
+            import pymupdf  # The module behind the lazily imported fitz
+            from core.thumbnail_cache import ThumbnailCache
+            ThumbnailCache().prune_if_due()
+            if preload_ocr:
+                from core.pdf_processor import EASYOCR_AVAILABLE, PDFProcessor
+                if EASYOCR_AVAILABLE:
+                    PDFProcessor.get_reader()
+        except Exception as e:
+            print(f"Start-up warm-up failed: {e}")
+
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
 class StartupScreen(QWidget):
-    finished = Signal()
+    ready = Signal()     # Every task has run and the minimum time has passed
+    finished = Signal()  # The fade-out is done
 
-    def __init__(self):
+    def __init__(self, tasks=None, min_display_ms=0):
+        """
+        Args:
+            tasks: List of (label, callable) run one per event-loop turn while
+                   the splash animates, e.g. building the main window
+            min_display_ms: Keep the splash up at least this long (0 = close when ready)
+        """
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -48,11 +98,17 @@ class StartupScreen(QWidget):
         # Internal Timer for sequence
         self.sequence_step = 0
         QTimer.singleShot(500, self.next_sequence) # Start fade in text
-        QTimer.singleShot(4500, self.close_animation) # End
 
         # UI Setup (Text Overlay)
         self.setup_ui()
 
+        # Start-up work; the splash closes once it is done
+        self.tasks = deque(tasks or [])
+        self.min_display_ms = min_display_ms
+        self.elapsed = QElapsedTimer()
+        self.elapsed.start()
+        QTimer.singleShot(0, self.run_next_task)
+
     def setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -83,8 +139,17 @@ class StartupScreen(QWidget):
             padding-bottom: 20px;
         """)
         
+        self.lbl_status = QLabel("")
+        self.lbl_status.setAlignment(Qt.AlignCenter)
+        self.lbl_status.setStyleSheet("""
+            color: rgba(255, 255, 255, 140);
+            font-family: 'Segoe UI', sans-serif;
+            font-size: 11px;
+        """)
+
         layout.addWidget(self.lbl_logo)
         layout.addWidget(self.lbl_sub)
+        layout.addWidget(self.lbl_status)
         
         # Opacity for fade in
         self.op_logo = QGraphicsOpacityEffect(self.lbl_logo)
@@ -101,6 +166,28 @@ class StartupScreen(QWidget):
         qr.moveCenter(cp)
         self.move(qr.topLeft())
 
+    def run_next_task(self):
+        if not self.tasks:
+            # Done: close now, or once the minimum display time is up
+            remaining = self.min_display_ms - self.elapsed.elapsed()
+            QTimer.singleShot(max(0, remaining), self.on_ready)
+            return
+        label, task = self.tasks.popleft()
+        self.lbl_status.setText(label)
+        # Run it on the next turn so the label and animation get painted first
+        QTimer.singleShot(0, lambda: self.run_task(task))
+
+    def run_task(self, task):
+        try:
+            task()
+        except Exception as e:
+            print(f"Start-up task failed: {e}")
+        self.run_next_task()
+
+    def on_ready(self):
+        self.ready.emit()
+        self.close_animation()
+
     def update_animation(self):
         self.hue_shift += 0.5
         if self.hue_shift > 360:
@@ -0,0 +1,289 @@
+"""
+Start-up profiling (python main.py --profile-startup).
+
+Records how long every module import takes, how long each view takes to
+build and when the splash and the main window first paint, then writes a
+JSON report and compares it with a saved baseline. Only the standard
+library is imported at module level, so the profiler can be installed
+before anything else is imported.
+"""
+import importlib.abc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+REPORT_VERSION = 1
+
+# A milestone, view or import counts as a regression when it is slower than
+# the baseline by both this factor and this many milliseconds. Start-up times
+# vary between runs, so compare against a baseline taken on the same machine.
+REGRESSION_RATIO = 1.20
+REGRESSION_MIN_MS = 10.0
+
+# Imports listed in the comparison (slowest by cumulative time)
+COMPARE_TOP_IMPORTS = 25
+
+
+class _TimedLoader:
+    """
+    Wraps a module loader to time create_module and exec_module; everything
+    else is delegated.
+
+    Extension modules do most of their work in create_module, so its time is
+    added to the module's exec_module frame. The two are timed separately
+    because exec_module may run much later: importlib.util.LazyLoader (see
+    core.lazy_import) calls create_module at import and exec_module on first
+    attribute access.
+    """
+
+    def __init__(self, loader, timer: "ImportTimer", name: str):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+        self._created = (0.0, 0.0)  # create_module's (cumulative, nested) seconds
+
+    def create_module(self, spec):
+        self._timer.begin(self._name)
+        try:
+            module = self._loader.create_module(spec)
+        except BaseException:
+            self._timer.end(self._name)
+            raise
+        self._created = self._timer.suspend()
+        return module
+
+    def exec_module(self, module):
+        self._timer.begin(self._name, *self._created)
+        self._created = (0.0, 0.0)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.end(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Times every module executed while installed, like `python -X importtime`
+    but in-process (so it also works in the frozen app).
+
+    Sits first on sys.meta_path, asks the remaining finders for the spec and
+    wraps its loader. Nested imports are tracked per thread, so imports on
+    the background warm-up thread don't distort the main thread's numbers.
+    """
+
+    def __init__(self):
+        self.records = []  # (name, thread, depth, cumulative s, self s) in completion order
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self, name)
+            return spec
+        return None
+
+    def _stack(self) -> List[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, name: str, elapsed: float = 0.0, nested: float = 0.0):
+        """Open a frame, crediting it with time already spent (see suspend())."""
+        # [name, start, time spent in nested imports]
+        self._stack().append([name, time.perf_counter() - elapsed, nested])
+
+    def suspend(self):
+        """Close the current frame without recording it; returns its (cumulative, nested) seconds."""
+        _, start, nested = self._stack().pop()
+        return time.perf_counter() - start, nested
+
+    def end(self, name: str):
+        stack = self._stack()
+        _, start, nested = stack.pop()
+        cumulative = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += cumulative
+        with self._lock:
+            self.records.append((name, threading.current_thread().name, len(stack), cumulative, cumulative - nested))
+
+    def report(self) -> List[Dict]:
+        with self._lock:
+            records = list(self.records)
+        return [{"module": name, "thread": thread, "depth": depth,
+                 "cumulative_ms": round(cumulative * 1000, 2), "self_ms": round(own * 1000, 2)}
+                for name, thread, depth, cumulative, own in records]
+
+
+class StartupProfiler:
+    """Collects start-up timings relative to when the profiler was created."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.imports = ImportTimer()
+        self.milestones = {}
+        self.views = {}
+
+    def start(self):
+        self.imports.install()
+
+    def mark(self, name: str):
+        """Record a milestone (first occurrence wins)."""
+        self.milestones.setdefault(name, round((time.perf_counter() - self.t0) * 1000, 2))
+
+    def view_built(self, route: str, seconds: float):
+        self.views[route] = round(seconds * 1000, 2)
+
+    def mark_first_paint(self, widget, name: str, callback=None):
+        """Mark `name` when the widget first paints, then call callback()."""
+        from PySide6.QtCore import QEvent, QObject
+
+        profiler = self
+
+        class PaintWatcher(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    obj.removeEventFilter(self)
+                    profiler.mark(name)
+                    if callback:
+                        callback()
+                return False
+
+        watcher = PaintWatcher(widget)
+        widget.installEventFilter(watcher)
+
+    def report(self) -> Dict:
+        imports = self.imports.report()
+        main_imports = [r for r in imports if r["thread"] == "MainThread"]
+        return {
+            "version": REPORT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "milestones_ms": self.milestones,
+            "views_ms": self.views,
+            "import_total_ms": round(sum(r["cumulative_ms"] for r in main_imports if r["depth"] == 0), 2),
+            "imports": imports,
+        }
+
+
+def _regression(current: float, baseline: float) -> bool:
+    return current > baseline * REGRESSION_RATIO and current - baseline > REGRESSION_MIN_MS
+
+
+def compare(report: Dict, baseline: Dict) -> Dict:
+    """
+    Compare a report with a baseline report.
+
+    Returns:
+        {"rows": [{"section", "name", "baseline_ms", "current_ms", "delta_ms", "regression"}],
+         "regressions": count}
+    """
+    rows = []
+
+    def add(section, name, current, base):
+        if current is None or base is None:
+            return
+        rows.append({"section": section, "name": name, "baseline_ms": base, "current_ms": current,
+                     "delta_ms": round(current - base, 2), "regression": _regression(current, base)})
+
+    for name, value in report["milestones_ms"].items():
+        add("milestone", name, value, baseline.get("milestones_ms", {}).get(name))
+    for name, value in report["views_ms"].items():
+        add("view", name, value, baseline.get("views_ms", {}).get(name))
+    add("imports", "total", report.get("import_total_ms"), baseline.get("import_total_ms"))
+
+    def top_level(rep):
+        return {r["module"]: r["cumulative_ms"] for r in rep.get("imports", [])
+                if r["thread"] == "MainThread" and r["depth"] == 0}
+
+    current_imports, base_imports = top_level(report), top_level(baseline)
+    slowest = sorted(current_imports, key=current_imports.get, reverse=True)[:COMPARE_TOP_IMPORTS]
+    for name in slowest:
+        add("import", name, current_imports[name], base_imports.get(name))
+
+    return {"rows": rows, "regressions": sum(row["regression"] for row in rows)}
+
+
+def print_summary(report: Dict, comparison: Optional[Dict] = None):
+    print("Start-up profile")
+    for name, value in report["milestones_ms"].items():
+        print(f"  {name:<24} {value:9.1f} ms")
+    print(f"  {'imports (main thread)':<24} {report['import_total_ms']:9.1f} ms")
+    for name, value in report["views_ms"].items():
+        print(f"  view {name:<19} {value:9.1f} ms")
+
+    top = sorted((r for r in report["imports"] if r["thread"] == "MainThread"),
+                 key=lambda r: r["self_ms"], reverse=True)[:10]
+    print("  slowest imports (self time):")
+    for r in top:
+        print(f"    {r['module']:<40} {r['self_ms']:8.1f} ms")
+
+    if comparison:
+        print(f"Compared with baseline: {comparison['regressions']} regression(s)")
+        for row in comparison["rows"]:
+            if row["regression"] or row["section"] == "milestone":
+                flag = "SLOWER" if row["regression"] else ""
+                print(f"  {row['section']:<9} {row['name']:<28} {row['baseline_ms']:9.1f} -> "
+                      f"{row['current_ms']:9.1f} ms ({row['delta_ms']:+.1f}) {flag}")
+
+
+def default_baseline_path() -> str:
+    from core.app_paths import default_cache_dir
+    return os.path.join(default_cache_dir(), "startup_baseline.json")
+
+
+def finish(profiler: StartupProfiler, report_path: Optional[str], baseline_path: Optional[str],
+           save_baseline: bool) -> int:
+    """
+    Write the report, compare with the baseline and optionally save it as the new baseline.
+
+    Returns:
+        Process exit code: 1 if a regression against the baseline was found
+    """
+    profiler.imports.uninstall()
+    report = profiler.report()
+    baseline_path = baseline_path or default_baseline_path()
+
+    comparison = None
+    if os.path.exists(baseline_path):
+        try:
+            with open(baseline_path, "r", encoding="utf-8") as f:
+                comparison = compare(report, json.load(f))
+            report["comparison"] = {"baseline": baseline_path, **comparison}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read baseline {baseline_path}: {e}")
+
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {report_path}")
+    print_summary(report, comparison)
+
+    if save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        baseline = {key: value for key, value in report.items() if key != "comparison"}
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+    return 1 if comparison and comparison["regressions"] else 0
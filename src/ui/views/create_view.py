@@ -1,8 +1,47 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem, QFileDialog, QMessageBox, QFrame, QProgressBar
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QThread, Signal
 from PySide6.QtGui import QIcon
 from core.pdf_processor import PDFProcessor
 import os
+import threading
+import time
+
+# Worker thread so large image batches don't freeze the GUI
+class ImageToPDFThread(QThread):
+    finished = Signal(bool, str)  # success, message
+    cancelled = Signal()  # Emitted instead of finished when cancel() stopped the conversion
+    progress = Signal(int, int, float)  # done, total, images per second
+    
+    def __init__(self, image_paths, output_path):
+        super().__init__()
+        self.image_paths = list(image_paths)
+        self.output_path = output_path
+        self.cancel_event = threading.Event()
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    def run(self):
+        try:
+            start = time.perf_counter()
+            last_emit = [0.0]
+            
+            def progress_callback(done, total):
+                # Throttle signals so thousands of images don't flood the event loop
+                now = time.perf_counter()
+                if done == total or now - last_emit[0] >= 0.1:
+                    last_emit[0] = now
+                    self.progress.emit(done, total, done / max(now - start, 1e-6))
+            
+            success, msg = PDFProcessor.create_from_images(self.image_paths, self.output_path,
+                                                           progress_callback=progress_callback,
+                                                           cancel_event=self.cancel_event)
+            if not success and self.cancel_event.is_set():
+                self.cancelled.emit()
+            else:
+                self.finished.emit(success, msg)
+        except Exception as e:
+            self.finished.emit(False, str(e))
 
 class CreateView(QWidget):
     def __init__(self):
@@ -60,6 +99,17 @@ class CreateView(QWidget):
         
         footer.addStretch()
         
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedWidth(220)
+        self.progress_bar.setVisible(False)
+        footer.addWidget(self.progress_bar)
+        
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setStyleSheet("background: transparent; color: #FF5555; border: 1px solid #FF5555; border-radius: 6px; padding: 8px;")
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.clicked.connect(self.cancel_convert)
+        footer.addWidget(self.btn_cancel)
+        
         self.btn_convert = QPushButton("Convert to PDF")
         self.btn_convert.setProperty("class", "PrimaryButton")
         self.btn_convert.setStyleSheet("background-color: #28a745;") # Green override
@@ -69,7 +119,7 @@ class CreateView(QWidget):
         layout.addLayout(footer)
 
     def add_images(self):
-        files, _ = QFileDialog.getOpenFileNames(self, "Select Images", "", "Images (*.jpg *.jpeg *.png *.bmp *.webp)")
+        files, _ = QFileDialog.getOpenFileNames(self, "Select Images", "", "Images (*.jpg *.jpeg *.png *.bmp *.webp *.tif *.tiff)")
         if files:
             self.selected_files.extend(files)
             self.update_list()
@@ -94,18 +144,40 @@ class CreateView(QWidget):
         if out_path:
             self.status_lbl.setText("Converting...")
             self.btn_convert.setEnabled(False)
+            self.btn_cancel.setEnabled(True)
+            self.btn_cancel.setVisible(True)
+            self.progress_bar.setRange(0, len(self.selected_files))
+            self.progress_bar.setValue(0)
+            self.progress_bar.setVisible(True)
             
-            # Using QCoreApplication.processEvents() to allow UI update if this was sync
-            # Ideally this runs in a thread. For now, simple sync.
-            from PySide6.QtWidgets import QApplication
-            QApplication.processEvents()
-            
-            success, msg = PDFProcessor.create_from_images(self.selected_files, out_path)
-            
-            self.status_lbl.setText(msg)
-            self.btn_convert.setEnabled(True)
-            
-            if success:
-                QMessageBox.information(self, "Success", "PDF Created Successfully!")
-            else:
-                QMessageBox.critical(self, "Error", msg)
+            self.convert_thread = ImageToPDFThread(self.selected_files, out_path)
+            self.convert_thread.progress.connect(self.on_convert_progress)
+            self.convert_thread.finished.connect(self.on_convert_finish)
+            self.convert_thread.cancelled.connect(self.on_convert_cancelled)
+            self.convert_thread.start()
+
+    def cancel_convert(self):
+        if hasattr(self, 'convert_thread') and self.convert_thread.isRunning():
+            self.convert_thread.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.status_lbl.setText("Cancelling...")
+
+    def on_convert_progress(self, done, total, rate):
+        self.progress_bar.setValue(done)
+        self.status_lbl.setText(f"Converting {done}/{total} ({rate:.1f} images/s)")
+
+    def reset_convert_controls(self, status):
+        self.status_lbl.setText(status)
+        self.btn_convert.setEnabled(True)
+        self.btn_cancel.setVisible(False)
+        self.progress_bar.setVisible(False)
+
+    def on_convert_finish(self, success, msg):
+        self.reset_convert_controls(msg)
+        if success:
+            QMessageBox.information(self, "Success", "PDF Created Successfully!")
+        else:
+            QMessageBox.critical(self, "Error", msg)
+
+    def on_convert_cancelled(self):
+        self.reset_convert_controls("Conversion cancelled")
@@ -1,10 +1,95 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                                 QListWidget, QListWidgetItem, QFileDialog, QMessageBox, QFrame, QScrollArea)
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QIcon, QPixmap, QImage, QColor
+                                 QListWidget, QListWidgetItem, QFileDialog, QMessageBox, QFrame, QScrollArea, QApplication)
+from PySide6.QtCore import Qt, QSize, QThread, QTimer, Signal
+from PySide6.QtGui import QIcon, QPixmap, QImage, QColor, QTransform, QKeySequence, QShortcut
 import fitz # PyMuPDF
 from core.pdf_processor import PDFProcessor
+from core.thumbnail_cache import PageHasher, ThumbnailCache
+from core.edit_session import EditSession
+from collections import OrderedDict
 import os
+import threading
+
+THUMB_SIZE = QSize(100, 140)
+THUMB_ZOOM = 0.2
+
+# Rendered thumbnails kept in memory; least recently shown pages are dropped first
+THUMB_CACHE_LIMIT = 300
+
+# Pixels above/below the viewport whose pages are rendered ahead of scrolling
+THUMB_PRELOAD_MARGIN = 400
+
+# Renders page thumbnails off the GUI thread, nearest-to-viewport pages first.
+# PyMuPDF documents are not thread-safe, so a single thread owns the document.
+# Pages whose content is unchanged since an earlier render come from the disk cache.
+class ThumbnailThread(QThread):
+    rendered = Signal(int, QImage)  # original page index, thumbnail
+    
+    def __init__(self, pdf_path, disk_cache=None):
+        super().__init__()
+        self.pdf_path = pdf_path
+        self.disk_cache = disk_cache
+        self.pending = []
+        self.stopped = False
+        self.condition = threading.Condition()
+    
+    def request(self, pages):
+        # Replace the queue: pages scrolled out of view are no longer worth rendering
+        with self.condition:
+            self.pending = list(pages)
+            self.condition.notify()
+    
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.pending = []
+            self.condition.notify()
+        self.wait()
+    
+    def run(self):
+        try:
+            doc = fitz.open(self.pdf_path)
+        except Exception as e:
+            print(f"Thumbnail thread failed to open PDF: {e}")
+            return
+        
+        hasher = PageHasher(doc)
+        try:
+            while True:
+                with self.condition:
+                    while not self.pending and not self.stopped:
+                        self.condition.wait()
+                    if self.stopped:
+                        break
+                    page_num = self.pending.pop(0)
+                
+                try:
+                    self.rendered.emit(page_num, self.render(doc, hasher, page_num))
+                except Exception as e:
+                    print(f"Thumbnail render failed for page {page_num + 1}: {e}")
+        finally:
+            doc.close()
+    
+    def render(self, doc, hasher, page_num):
+        key = None
+        if self.disk_cache:
+            try:
+                key = hasher.page_key(page_num, THUMB_ZOOM)
+                png = self.disk_cache.get(key)
+                if png:
+                    img = QImage.fromData(png, "PNG")
+                    if not img.isNull():
+                        return img
+            except Exception as e:
+                # Damaged objects can break hashing; rendering may still work
+                print(f"Thumbnail cache lookup failed for page {page_num + 1}: {e}")
+                key = None
+        
+        pix = doc.load_page(page_num).get_pixmap(matrix=fitz.Matrix(THUMB_ZOOM, THUMB_ZOOM), alpha=False)
+        if key:
+            self.disk_cache.put(key, pix.tobytes("png"))
+        # copy() detaches the image from pix.samples before pix is freed
+        return QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888).copy()
 
 class EditView(QWidget):
     def __init__(self):
@@ -12,10 +97,15 @@ class EditView(QWidget):
         self.current_pdf = None
         self.page_count = 0
         
-        # Actions
-        self.pending_rotations = {} # original_idx -> angle
-        self.pending_deletes = set() # original_indices
-        self.page_order = [] # list of original_indices
+        # Edits are recorded in the session and only written on save
+        self.session = EditSession(0)
+        
+        # Thumbnails
+        self.thumb_thread = None
+        self.thumb_cache = OrderedDict() # original_idx -> QPixmap, in LRU order
+        self.items_by_page = {} # original_idx -> QListWidgetItem
+        self.disk_cache = ThumbnailCache() # Survives reloads and sessions
+        self.placeholder_icon = self.make_placeholder_icon()
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -35,6 +125,19 @@ class EditView(QWidget):
         btn_open.clicked.connect(self.open_pdf)
         header.addWidget(btn_open)
         
+        self.btn_undo = QPushButton("Undo")
+        self.btn_undo.setProperty("class", "NavButton")
+        self.btn_undo.clicked.connect(self.undo)
+        header.addWidget(self.btn_undo)
+        
+        self.btn_redo = QPushButton("Redo")
+        self.btn_redo.setProperty("class", "NavButton")
+        self.btn_redo.clicked.connect(self.redo)
+        header.addWidget(self.btn_redo)
+        
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+        
         btn_save = QPushButton("Save Changes")
         btn_save.setProperty("class", "PrimaryButton")
         btn_save.setStyleSheet("background-color: #28a745;")
@@ -49,10 +152,14 @@ class EditView(QWidget):
         
         # Left: Pages List
         self.list_widget = QListWidget()
-        self.list_widget.setIconSize(QSize(100, 140))
+        self.list_widget.setIconSize(THUMB_SIZE)
         self.list_widget.setSpacing(10)
         self.list_widget.setViewMode(QListWidget.IconMode)
         self.list_widget.setResizeMode(QListWidget.Adjust)
+        # Every item has the same size, so layout never has to measure 1000s of items
+        self.list_widget.setUniformItemSizes(True)
+        self.list_widget.setLayoutMode(QListWidget.Batched)
+        self.list_widget.setBatchSize(200)
         self.list_widget.setDragDropMode(QListWidget.InternalMove) # Enable Drag Drop Reorder!
         self.list_widget.setStyleSheet("""
             QListWidget {
@@ -72,6 +179,20 @@ class EditView(QWidget):
         """)
         main_layout.addWidget(self.list_widget, stretch=2)
         
+        # Coalesce scroll/resize events into one thumbnail request
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(50)
+        self.visible_timer.timeout.connect(self.request_visible_thumbnails)
+        # (lambdas: these signals carry arguments that QTimer.start would take as msec)
+        self.list_widget.verticalScrollBar().valueChanged.connect(lambda _: self.visible_timer.start())
+        self.list_widget.model().layoutChanged.connect(lambda *_: self.visible_timer.start())
+        self.list_widget.model().rowsMoved.connect(lambda *_: self.record_list_order())
+        
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop_thumbnails)
+        
         # Right: Actions Panel
         self.action_panel = QFrame()
         self.action_panel.setFixedWidth(250)
@@ -114,6 +235,8 @@ class EditView(QWidget):
         
         main_layout.addWidget(self.action_panel)
         layout.addLayout(main_layout)
+        
+        self.update_undo_buttons()
 
     def open_pdf(self):
         f, _ = QFileDialog.getOpenFileName(self, "Open PDF", "", "PDF Files (*.pdf)")
@@ -121,49 +244,196 @@ class EditView(QWidget):
             self.current_pdf = f
             self.load_pages(f)
 
+    def make_placeholder_icon(self):
+        pix = QPixmap(THUMB_SIZE)
+        pix.fill(QColor("#333333"))
+        return QIcon(pix)
+
     def load_pages(self, path):
+        self.stop_thumbnails()
         self.list_widget.clear()
-        self.pending_rotations = {}
-        self.pending_deletes = set()
+        self.thumb_cache.clear()
+        self.items_by_page = {}
         
         doc = fitz.open(path)
         self.page_count = len(doc)
+        doc.close()
         
-        # Initialize default order [0, 1, 2...]
-        self.page_order = list(range(len(doc)))
+        self.session = EditSession(self.page_count)
+        self.update_undo_buttons()
         
-        for i in range(len(doc)):
-            page = doc.load_page(i)
-            pix = page.get_pixmap(matrix=fitz.Matrix(0.2, 0.2)) 
-            img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-            qpix = QPixmap.fromImage(img)
-            
-            item = QListWidgetItem(f"Page {i+1}")
-            item.setIcon(QIcon(qpix))
+        # Items start with a placeholder; thumbnails arrive as they scroll into view
+        for i in range(self.page_count):
+            item = QListWidgetItem(self.placeholder_icon, f"Page {i+1}")
             item.setData(Qt.UserRole, i) # Store ORIGINAL index
             self.list_widget.addItem(item)
-            
-        doc.close()
+            self.items_by_page[i] = item
+        
+        self.thumb_thread = ThumbnailThread(path, self.disk_cache)
+        self.thumb_thread.rendered.connect(self.on_thumbnail_rendered)
+        self.thumb_thread.start()
+        self.visible_timer.start()
+
+    def stop_thumbnails(self):
+        if self.thumb_thread:
+            self.thumb_thread.rendered.disconnect(self.on_thumbnail_rendered)
+            self.thumb_thread.stop()
+            self.thumb_thread = None
+
+    def visible_rows(self):
+        """Return the (first, last) list rows inside the viewport plus the preload margin."""
+        count = self.list_widget.count()
+        if not count:
+            return 0, -1
+        
+        viewport = self.list_widget.viewport().rect()
+        top = viewport.top() - THUMB_PRELOAD_MARGIN
+        bottom = viewport.bottom() + THUMB_PRELOAD_MARGIN
+        
+        def rect(row):
+            return self.list_widget.visualItemRect(self.list_widget.item(row))
+        
+        # Rows are laid out in order, so both ends can be found by bisection.
+        # Rows the batched layout has not reached yet report an empty rect.
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            r = rect(mid)
+            if r.isValid() and r.bottom() < top:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        
+        lo, hi = first, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            r = rect(mid)
+            if r.isValid() and r.top() <= bottom:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, max(first, lo - 1)
+
+    def request_visible_thumbnails(self):
+        if not self.thumb_thread:
+            return
+        
+        first, last = self.visible_rows()
+        wanted = []
+        for row in range(first, last + 1):
+            page = self.list_widget.item(row).data(Qt.UserRole)
+            if page in self.thumb_cache:
+                self.thumb_cache.move_to_end(page)
+            else:
+                wanted.append(page)
+        self.thumb_thread.request(wanted)
+
+    def on_thumbnail_rendered(self, page, img):
+        item = self.items_by_page.get(page)
+        if item is None:
+            return
+        
+        self.thumb_cache[page] = QPixmap.fromImage(img)
+        self.thumb_cache.move_to_end(page)
+        item.setIcon(self.preview_icon(page))
+        
+        # Evict the least recently shown thumbnails back to the placeholder
+        while len(self.thumb_cache) > THUMB_CACHE_LIMIT:
+            old_page, _ = self.thumb_cache.popitem(last=False)
+            old_item = self.items_by_page.get(old_page)
+            if old_item is not None:
+                old_item.setIcon(self.placeholder_icon)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.visible_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.visible_timer.start()
+
+    def preview_icon(self, page):
+        """Thumbnail for a page with its pending rotation applied, or the placeholder."""
+        pix = self.thumb_cache.get(page)
+        if pix is None:
+            return self.placeholder_icon
+        angle = self.session.rotations.get(page, 0)
+        if angle:
+            pix = pix.transformed(QTransform().rotate(angle))
+        return QIcon(pix)
+
+    def item_label(self, page):
+        label = f"Page {page+1}"
+        angle = self.session.rotations.get(page, 0)
+        if angle:
+            label += f" (Rot {angle}°)"
+        if self.session.text_count(page):
+            label += " (+Text)"
+        return label
+
+    def refresh_items(self, pages=None):
+        """Update labels and previews of the given pages (default: all) from the session."""
+        for page in (self.items_by_page if pages is None else pages):
+            item = self.items_by_page.get(page)
+            if item is not None:
+                item.setText(self.item_label(page))
+                item.setIcon(self.preview_icon(page))
+
+    def list_order(self):
+        return [self.list_widget.item(i).data(Qt.UserRole) for i in range(self.list_widget.count())]
+
+    def record_list_order(self):
+        # A drag & drop move is only visible in the list; record it as an operation
+        self.session.set_order(self.list_order())
+        self.update_undo_buttons()
+        self.visible_timer.start()
+
+    def sync_list(self):
+        """Rebuild the list's rows to match the session's page order (after undo/redo)."""
+        if self.list_order() == self.session.order:
+            return
+        self.list_widget.setUpdatesEnabled(False)
+        while self.list_widget.count():
+            self.list_widget.takeItem(0)
+        for page in self.session.order:
+            self.list_widget.addItem(self.items_by_page[page])
+        self.list_widget.doItemsLayout()
+        self.list_widget.setUpdatesEnabled(True)
+        self.visible_timer.start()
+
+    def update_undo_buttons(self):
+        self.btn_undo.setEnabled(self.session.can_undo())
+        self.btn_redo.setEnabled(self.session.can_redo())
+
+    def undo(self):
+        if self.session.undo():
+            self.sync_list()
+            self.refresh_items()
+            self.update_undo_buttons()
+
+    def redo(self):
+        if self.session.redo():
+            self.sync_list()
+            self.refresh_items()
+            self.update_undo_buttons()
 
     def rotate_selection(self, angle):
         items = self.list_widget.selectedItems()
         if not items: return
         
-        for item in items:
-            orig_idx = item.data(Qt.UserRole)
-            curr = self.pending_rotations.get(orig_idx, 0)
-            self.pending_rotations[orig_idx] = curr + angle
-            item.setText(f"Page {orig_idx+1} (Rot {self.pending_rotations[orig_idx]}°)")
+        pages = [item.data(Qt.UserRole) for item in items]
+        self.session.rotate(pages, angle)
+        self.refresh_items(pages)
+        self.update_undo_buttons()
 
     def delete_selection(self):
         items = self.list_widget.selectedItems()
         if not items: return
         
-        for item in items:
-            orig_idx = item.data(Qt.UserRole)
-            self.pending_deletes.add(orig_idx)
-            row = self.list_widget.row(item)
-            self.list_widget.takeItem(row)
+        self.session.delete([item.data(Qt.UserRole) for item in items])
+        self.sync_list()
+        self.update_undo_buttons()
 
     def add_text_dialog(self):
         items = self.list_widget.selectedItems()
@@ -205,66 +475,27 @@ class EditView(QWidget):
              if "Bottom-Right" in pos: x, y = 400, 780
              
              # Queue Action for Backend
-             # We need to store this separately or integrate into save_pdf logic.
-             # Current save_pdf rebuilds actions list. We need a way to persist these text actions.
-             # Let's add a list for text_actions.
-             if not hasattr(self, 'text_actions'): self.text_actions = []
-             
-             self.text_actions.append({
-                 "type": "add_text", 
-                 "page": orig_idx, 
-                 "text": text,
-                 "x": x, "y": y,
-                 "fontsize": 12,
-                 "color": (0, 0, 0)
-             })
-             
-             items[0].setText(f"Page {orig_idx+1} (+Text)")
+             self.session.add_text(orig_idx, text, x, y, fontsize=12, color=(0, 0, 0))
+             self.refresh_items([orig_idx])
+             self.update_undo_buttons()
 
     def save_pdf(self):
         if not self.current_pdf: return
         
-        # Calculate current order from List Widget (handles Drag & Drop moves)
-        final_order_actions = [] 
-        
-        # We need to construct the 'actions' list for pdf_processor
-        # Logic: 
-        # 1. 'move' is implicitly handled by the order of items in list_widget
-        # 2. 'rotate' is mapped by orig_idx
-        # 3. 'delete' is pages NOT in list_widget (or tracked in set)
-        
-        # Actually, our pdf_processor's 'modify_pdf' expects a list of operations including 'move' from src to dst.
-        # But since we have the FINAL desired order, it's easier to rewrite modification logic to accept "pages_list".
-        # Let's adjust the backend to be smarter or map this to moves.
-        
-        # EASIER: Send a 'reorder' action with the full list of indices.
-        
-        current_indices = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            current_indices.append(item.data(Qt.UserRole))
-            
-        # Construct actions
-        actions = []
-        
-        # Rotations
-        for idx, angle in self.pending_rotations.items():
-            actions.append({"type": "rotate", "page": idx, "angle": angle})
-            
-        # Add Text Actions (if any)
-        if hasattr(self, 'text_actions'):
-            actions.extend(self.text_actions)
-            
-        # We need to tell backend the NEW order.
-        actions.append({"type": "set_order", "order": current_indices})
+        # The whole edit log compiles to a single modify_pdf call (one write),
+        # with rotations collapsed per page and all moves/deletes as one set_order
+        self.session.set_order(self.list_order())
+        actions = self.session.compile_actions()
+        if not actions:
+            QMessageBox.information(self, "Info", "No changes to save.")
+            return
         
         out, _ = QFileDialog.getSaveFileName(self, "Save PDF", "", "PDF Files (*.pdf)")
         if out:
             success, msg = PDFProcessor.modify_pdf(self.current_pdf, out, actions)
             if success:
                 QMessageBox.information(self, "Success", "PDF Saved!")
-                self.load_pages(out) # Reload
-                # Clear text actions
-                self.text_actions = []
+                self.current_pdf = out
+                self.load_pages(out) # Reload; unchanged pages come from the thumbnail cache
             else:
                 QMessageBox.critical(self, "Error", msg)
@@ -1,9 +1,10 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QFileDialog, QMessageBox, QFrame, QGraphicsDropShadowEffect
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap, QImage, QPainter, QColor
-import qrcode
-from PIL import Image
 import io
+from core.lazy_import import lazy_import
+
+qrcode = lazy_import("qrcode")  # Loaded when the first code is generated
 
 class QRView(QWidget):
     def __init__(self):
@@ -1,6 +1,17 @@
+import time
+
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                                 QComboBox, QFrame, QMessageBox)
-from PySide6.QtCore import Qt
+                                 QComboBox, QFrame, QMessageBox, QTableWidget, QTableWidgetItem,
+                                 QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt, QTimer
+
+from core import instrumentation
+
+# How often the Performance section refreshes while the view is visible
+PERF_REFRESH_MS = 2000
+
+# Rows shown in the recent operations table
+PERF_ROWS = 50
 
 class SettingsView(QWidget):
     def __init__(self):
@@ -38,7 +49,93 @@ class SettingsView(QWidget):
         t_layout.addLayout(row)
         
         layout.addWidget(theme_frame)
-        layout.addStretch()
+        
+        layout.addSpacing(20)
+        
+        # Performance Section
+        perf_frame = QFrame()
+        perf_frame.setStyleSheet("background: #1A1A1A; border-radius: 8px; padding: 20px;")
+        p_layout = QVBoxLayout(perf_frame)
+        
+        p_header = QHBoxLayout()
+        p_lbl = QLabel("Performance")
+        p_lbl.setStyleSheet("font-size: 18px; font-weight: bold;")
+        p_header.addWidget(p_lbl)
+        p_header.addStretch()
+        
+        btn_refresh = QPushButton("Refresh")
+        btn_refresh.clicked.connect(self.refresh_performance)
+        p_header.addWidget(btn_refresh)
+        
+        btn_clear = QPushButton("Clear")
+        btn_clear.clicked.connect(self.clear_performance)
+        p_header.addWidget(btn_clear)
+        p_layout.addLayout(p_header)
+        
+        self.lbl_cache = QLabel()
+        self.lbl_cache.setStyleSheet("color: #A0A0A0;")
+        p_layout.addWidget(self.lbl_cache)
+        
+        self.perf_table = QTableWidget(0, 5)
+        self.perf_table.setHorizontalHeaderLabels(["Time", "Operation", "Duration", "Result", "Stages"])
+        self.perf_table.verticalHeader().setVisible(False)
+        self.perf_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.perf_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        header = self.perf_table.horizontalHeader()
+        for col in range(4):
+            header.setSectionResizeMode(col, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(4, QHeaderView.Stretch)
+        p_layout.addWidget(self.perf_table)
+        
+        layout.addWidget(perf_frame, 1)
+        
+        self.perf_timer = QTimer(self)
+        self.perf_timer.setInterval(PERF_REFRESH_MS)
+        self.perf_timer.timeout.connect(self.refresh_performance)
+        self.refresh_performance()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_performance()
+        self.perf_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.perf_timer.stop()
+
+    def refresh_performance(self):
+        """Show the most recent operations and the cache hit rates."""
+        rates = instrumentation.cache_hit_rates()
+        if rates:
+            parts = []
+            for cache, r in rates.items():
+                name = cache.replace("_", " ").capitalize()
+                rate = "-" if r["rate"] is None else f"{r['rate']:.0%}"
+                parts.append(f"{name}: {rate} hits ({r['hits']} of {r['hits'] + r['misses']})")
+            self.lbl_cache.setText("   ".join(parts))
+        else:
+            self.lbl_cache.setText("No cache lookups yet")
+        
+        records = instrumentation.recent.records()[:PERF_ROWS]
+        self.perf_table.setRowCount(len(records))
+        for row, record in enumerate(records):
+            name = record.name if record.parent is None else f"  {record.name} (in {record.parent})"
+            stages = ", ".join(f"{stage} {seconds * 1000:.0f} ms"
+                               for stage, seconds in sorted(record.stages.items(), key=lambda s: -s[1]))
+            result = "OK" if record.ok else f"Failed: {record.error}"
+            values = [time.strftime("%H:%M:%S", time.localtime(record.started)), name,
+                      f"{record.seconds * 1000:.0f} ms", result, stages]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 3 and not record.ok:
+                    item.setForeground(Qt.red)
+                    item.setToolTip(record.error)
+                self.perf_table.setItem(row, col, item)
+
+    def clear_performance(self):
+        instrumentation.recent.clear()
+        instrumentation.reset_counters()
+        self.refresh_performance()
 
     def change_theme(self, index):
         # We can swap QSS content here
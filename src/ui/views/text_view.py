@@ -30,6 +30,45 @@ class TextExtractionThread(QThread):
         except Exception as e:
             self.finished.emit(False, str(e))
 
+class TextExportThread(QThread):
+    """Streams a PDF's text into a .txt/.docx file page by page."""
+    finished = Signal(bool, str)
+    progress = Signal(str)
+    
+    def __init__(self, input_path, output_path):
+        super().__init__()
+        self.input_path = input_path
+        self.output_path = output_path
+    
+    def run(self):
+        try:
+            def cb(msg): self.progress.emit(msg)
+            success, msg = PDFProcessor.export_pdf_text(self.input_path, self.output_path, progress_callback=cb)
+            self.finished.emit(success, msg)
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
+class SearchablePDFThread(QThread):
+    finished = Signal(bool, str)
+    progress = Signal(str)
+    
+    def __init__(self, input_path, output_path):
+        super().__init__()
+        self.input_path = input_path
+        self.output_path = output_path
+    
+    def run(self):
+        try:
+            def cb(msg): self.progress.emit(msg)
+            
+            if os.path.isdir(self.input_path):
+                success, msg = PDFProcessor.make_searchable_folder(self.input_path, self.output_path, progress_callback=cb)
+            else:
+                success, msg = PDFProcessor.make_searchable_pdf(self.input_path, self.output_path, progress_callback=cb)
+            self.finished.emit(success, msg)
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
 class TextView(QWidget):
     def __init__(self):
         super().__init__()
@@ -81,6 +120,17 @@ class TextView(QWidget):
         btn_save.clicked.connect(self.save_ocr)
         act_box.addWidget(btn_save)
         
+        # Searchable PDF (embeds OCR text so it never has to run again)
+        btn_searchable = QPushButton("Make Searchable PDF")
+        btn_searchable.setProperty("class", "SecondaryButton")
+        btn_searchable.clicked.connect(self.make_searchable)
+        act_box.addWidget(btn_searchable)
+        
+        btn_searchable_dir = QPushButton("Searchable PDFs (Folder)")
+        btn_searchable_dir.setProperty("class", "SecondaryButton")
+        btn_searchable_dir.clicked.connect(self.make_searchable_folder)
+        act_box.addWidget(btn_searchable_dir)
+        
         layout.addLayout(act_box)
         self.tabs.addTab(tab, "OCR Extractor")
 
@@ -107,18 +157,76 @@ class TextView(QWidget):
         self.pd.close()
         if success:
             self.txt_ocr_out.setPlainText(text)
+            self.ocr_text_source = self.ocr_thread.path
             QMessageBox.information(self, "Success", "Text extracted.")
         else:
             QMessageBox.critical(self, "Error", text)
 
+    def make_searchable(self):
+        if not hasattr(self, 'ocr_file') or not self.ocr_file.lower().endswith('.pdf'):
+            QMessageBox.warning(self, "Warning", "Please select a PDF file first.")
+            return
+        
+        out_path, _ = QFileDialog.getSaveFileName(self, "Save Searchable PDF", "", "PDF Files (*.pdf)")
+        if out_path:
+            self.run_searchable(self.ocr_file, out_path)
+
+    def make_searchable_folder(self):
+        in_dir = QFileDialog.getExistingDirectory(self, "Select Folder with Scanned PDFs")
+        if not in_dir: return
+        
+        out_dir = QFileDialog.getExistingDirectory(self, "Select Output Directory")
+        if out_dir:
+            self.run_searchable(in_dir, out_dir)
+
+    def run_searchable(self, input_path, output_path):
+        self.pd = QProgressDialog("Processing...", "Cancel", 0, 0, self)
+        self.pd.setWindowModality(Qt.WindowModality.WindowModal)
+        self.pd.show()
+        
+        self.searchable_thread = SearchablePDFThread(input_path, output_path)
+        self.searchable_thread.progress.connect(self.pd.setLabelText)
+        self.searchable_thread.finished.connect(self.on_searchable_finish)
+        self.searchable_thread.start()
+
+    def on_searchable_finish(self, success, msg):
+        self.pd.close()
+        if success:
+            QMessageBox.information(self, "Success", msg)
+        else:
+            QMessageBox.critical(self, "Error", msg)
+
     def save_ocr(self):
         text = self.txt_ocr_out.toPlainText()
-        if not text: return
+        pdf = getattr(self, 'ocr_file', '')
+        # A PDF's text is exported straight from the file, page by page, unless
+        # the box shows something else (another file's text, or edits)
+        stream = pdf.lower().endswith('.pdf') and (
+            not text or (getattr(self, 'ocr_text_source', None) == pdf and not self.txt_ocr_out.document().isModified()))
+        if not text and not stream: return
         
-        path, _ = QFileDialog.getSaveFileName(self, "Save Text", "", "Text Files (*.txt)")
-        if path:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(text)
+        path, _ = QFileDialog.getSaveFileName(self, "Save Text", "", "Text Files (*.txt);;Word Documents (*.docx)")
+        if path and stream:
+            self.pd = QProgressDialog("Exporting...", "Cancel", 0, 0, self)
+            self.pd.setWindowModality(Qt.WindowModality.WindowModal)
+            self.pd.show()
+            
+            self.export_thread = TextExportThread(pdf, path)
+            self.export_thread.progress.connect(self.pd.setLabelText)
+            self.export_thread.finished.connect(self.on_export_finish)
+            self.export_thread.start()
+        elif path:
+            if path.lower().endswith('.docx'):
+                success, msg = PDFProcessor.export_to_docx(text, path)
+            else:
+                success, msg = PDFProcessor.export_to_txt(text, path)
+            if not success:
+                QMessageBox.critical(self, "Error", msg)
+
+    def on_export_finish(self, success, msg):
+        self.pd.close()
+        if not success:
+            QMessageBox.critical(self, "Error", msg)
 
     def init_word_count_tab(self):
         tab = QWidget()
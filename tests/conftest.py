@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app runs from src/ without being installed (see README)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,96 @@
+import fitz
+
+from core.edit_session import EditSession
+from core.pdf_processor import PDFProcessor
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"page {i}")
+    doc.save(path)
+    doc.close()
+
+
+def test_undo_redo_round_trip():
+    session = EditSession(4)
+    session.rotate([1], 90)
+    session.delete([2])
+    session.set_order([3, 0, 1])
+    session.add_text(0, "hello", 10, 20)
+    edited = session.compile_actions()
+
+    while session.can_undo():
+        session.undo()
+    assert session.compile_actions() == []
+    assert not session.modified
+    assert session.order == [0, 1, 2, 3]
+
+    while session.can_redo():
+        session.redo()
+    assert session.compile_actions() == edited
+    assert session.undo() == {"type": "add_text", "page": 0, "text": "hello",
+                              "x": 10, "y": 20, "fontsize": 12, "color": (0, 0, 0)}
+
+
+def test_new_edit_clears_redo():
+    session = EditSession(3)
+    session.rotate([0], 90)
+    session.undo()
+    session.delete([1])
+    assert not session.can_redo()
+    assert session.redo() is None
+
+
+def test_rotation_of_deleted_page_is_dropped():
+    session = EditSession(3)
+    session.rotate([0, 1], 90)
+    session.delete([1])
+    assert session.compile_actions() == [
+        {"type": "rotate", "page": 0, "angle": 90},
+        {"type": "set_order", "order": [0, 2]},
+    ]
+
+
+def test_rotations_that_cancel_out_are_dropped():
+    session = EditSession(2)
+    session.rotate([0], 90)
+    session.rotate([0], 270)
+    assert session.compile_actions() == []
+
+
+def test_single_set_order_only_when_order_changed():
+    session = EditSession(3)
+    session.set_order([0, 1, 2])
+    assert session.operations == []
+
+    session.set_order([2, 0, 1])
+    session.set_order([1, 2, 0])
+    orders = [a for a in session.compile_actions() if a["type"] == "set_order"]
+    assert orders == [{"type": "set_order", "order": [1, 2, 0]}]
+
+    session.set_order([0, 1, 2])
+    assert session.compile_actions() == []
+
+
+def test_compiled_actions_apply_through_modify_pdf(tmp_path):
+    source, output = str(tmp_path / "in.pdf"), str(tmp_path / "out.pdf")
+    make_pdf(source, 4)
+
+    session = EditSession(4)
+    session.rotate([3], 90)
+    session.rotate([1], 180)
+    session.delete([1])
+    session.set_order([3, 0, 2])
+    session.add_text(2, "stamped", 72, 200)
+
+    success, message = PDFProcessor.modify_pdf(source, output, session.compile_actions())
+    assert success, message
+
+    doc = fitz.open(output)
+    try:
+        assert [page.get_text().split("\n")[0] for page in doc] == ["page 3", "page 0", "page 2"]
+        assert [page.rotation for page in doc] == [90, 0, 0]
+        assert "stamped" in doc[2].get_text()
+    finally:
+        doc.close()
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+from PIL import Image
+
+from core import image_reader
+from core.image_reader import ImageReader, large_image_limit
+
+
+@pytest.fixture
+def small_limits(monkeypatch):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+    monkeypatch.setattr(image_reader, "LARGE_IMAGE_PIXELS", 10_000)
+
+
+def save_png(path, size):
+    Image.new("L", size).save(path)
+    return str(path)
+
+
+def test_large_images_open_inside_the_block(tmp_path, small_limits):
+    path = save_png(tmp_path / "drawing.png", (50, 50))
+    with pytest.raises(Image.DecompressionBombError):
+        Image.open(path)
+
+    assert ImageReader.probe(path)[0].width == 50
+    with large_image_limit(), Image.open(path) as img:
+        img.load()
+
+    huge = save_png(tmp_path / "huge.png", (250, 250))
+    with pytest.raises(Image.DecompressionBombError):
+        ImageReader.probe(huge)
+
+
+def test_other_threads_keep_the_default_limit(tmp_path, small_limits):
+    path = save_png(tmp_path / "drawing.png", (50, 50))
+    entered, checked = threading.Event(), threading.Event()
+
+    def convert():
+        with large_image_limit():
+            entered.set()
+            checked.wait(10)
+
+    converter = threading.Thread(target=convert)
+    converter.start()
+    try:
+        entered.wait(10)
+        assert Image.MAX_IMAGE_PIXELS == 100
+        with pytest.raises(Image.DecompressionBombError):
+            Image.open(path)
+    finally:
+        checked.set()
+        converter.join()
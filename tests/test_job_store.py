@@ -0,0 +1,98 @@
+import json
+import sqlite3
+
+import pytest
+
+from core.batch_engine import BatchJob, BatchOperationType, pipeline_job
+from core.batch_processor import BatchProcessor
+from core.job_store import JobStore, missing_secrets, redact_params, restore_secrets
+
+SECRET = "hunter2-secret"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def db_bytes(store):
+    store.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    with open(store.db_path, "rb") as f:
+        return f.read()
+
+
+def password_job(name="locked"):
+    return BatchJob(BatchOperationType.PASSWORD_ADD, [f"/tmp/{name}.pdf"], f"/tmp/{name}_out.pdf",
+                    {"password": SECRET})
+
+
+def test_recover_requeues_unfinished_jobs(store):
+    jobs = [BatchJob(BatchOperationType.COMPRESS, [f"/tmp/{n}.pdf"], f"/tmp/{n}_out.pdf") for n in range(4)]
+    store.add_jobs(jobs)
+    for job, status in zip(jobs, ["completed", "running", "cancelled", "failed"]):
+        job.status = status
+        job.attempts = 2
+        store.update(job)
+
+    assert store.recover(retry_failed=False) == 2
+    assert store.counts() == {"completed": 1, "pending": 2, "failed": 1}
+
+    assert store.recover() == 1
+    pending = store.load_jobs(["pending"])
+    assert [job.job_id for job in pending] == [jobs[1].job_id, jobs[2].job_id, jobs[3].job_id]
+    assert [job.attempts for job in pending] == [2, 2, 0]  # Failed jobs get a fresh set of retries
+
+
+def test_passwords_are_not_stored(store):
+    job = password_job()
+    store.add_job(job)
+    assert job.params["password"] == SECRET  # The running job keeps it
+    assert SECRET.encode() not in db_bytes(store)
+
+    stored = store.load_jobs()[0]
+    assert "password" not in stored.params
+    assert missing_secrets(stored.params) == ["password"]
+
+
+def test_pipeline_stage_passwords_are_redacted():
+    params = pipeline_job("/tmp/a.pdf", [{"op": "compress"}, {"op": "add_password", "params": {"password": SECRET}}],
+                          "/tmp/a_out.pdf").params
+    redacted = redact_params(params)
+    assert SECRET not in json.dumps(redacted)
+    assert missing_secrets(redacted) == ["password"]
+    assert restore_secrets(redacted, {}) is None
+    assert restore_secrets(redacted, {"password": SECRET}) == params
+
+
+def test_secrets_from_older_stores_are_scrubbed(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    JobStore(path).close()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("INSERT INTO jobs (operation, input_files, output_path, params, updated_at)"
+                     " VALUES ('add_password', '[\"/tmp/a.pdf\"]', '/tmp/a_out.pdf', ?, 0)",
+                     (json.dumps({"password": SECRET}),))
+    conn.close()
+
+    store = JobStore(path)
+    try:
+        assert SECRET.encode() not in db_bytes(store)
+        assert missing_secrets(store.load_jobs()[0].params) == ["password"]
+    finally:
+        store.close()
+
+
+def test_resume_needs_the_password_again(store):
+    store.add_jobs([password_job(), BatchJob(BatchOperationType.COMPRESS, ["/tmp/b.pdf"], "/tmp/b_out.pdf")])
+    processor = BatchProcessor(store=store)
+
+    assert processor.resume() == 1
+    assert processor.jobs[0].operation_type == BatchOperationType.COMPRESS
+    failed = store.load_jobs(["failed"])
+    assert len(failed) == 1 and "password" in failed[0].error
+
+    assert processor.resume(secrets={"password": SECRET}) == 2
+    assert processor.jobs[0].params == {"password": SECRET}
+    assert SECRET.encode() not in db_bytes(store)
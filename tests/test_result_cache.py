@@ -0,0 +1,84 @@
+import os
+import time
+
+import pytest
+
+from core.batch_engine import BatchJob, BatchOperationType
+from core.result_cache import ResultCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.db"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def job(tmp_path):
+    source = tmp_path / "in.pdf"
+    source.write_bytes(b"%PDF-1.4 input")
+    return BatchJob(BatchOperationType.COMPRESS, [str(source)], str(tmp_path / "out.pdf"), {"quality": "medium"})
+
+
+def run(cache, job):
+    """Record a finished run of the job; returns its fingerprint."""
+    started_at = time.time()
+    with open(job.output_path, "wb") as f:
+        f.write(b"%PDF-1.4 output")
+    fingerprint = cache.fingerprint(job)
+    cache.record(fingerprint, job, "Compressed", started_at)
+    return fingerprint
+
+
+def test_unchanged_rerun_is_a_hit(cache, job):
+    run(cache, job)
+    assert cache.lookup(cache.fingerprint(job)) == "Compressed"
+
+
+def test_changed_input_is_a_miss(cache, job):
+    fingerprint = run(cache, job)
+    with open(job.input_files[0], "ab") as f:
+        f.write(b" edited")
+    assert cache.fingerprint(job) != fingerprint
+    assert cache.lookup(cache.fingerprint(job)) is None
+
+
+def test_changed_params_are_a_miss(cache, job):
+    run(cache, job)
+    job.params["quality"] = "high"
+    assert cache.lookup(cache.fingerprint(job)) is None
+
+
+def test_touched_output_is_a_miss(cache, job):
+    fingerprint = run(cache, job)
+    st = os.stat(job.output_path)
+    os.utime(job.output_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup(fingerprint) is None
+
+
+def test_deleted_output_is_a_miss(cache, job):
+    fingerprint = run(cache, job)
+    os.remove(job.output_path)
+    assert cache.lookup(fingerprint) is None
+
+
+def test_split_records_only_its_own_files(cache, tmp_path):
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"%PDF-1.4 input")
+    out_dir = tmp_path / "split"
+    out_dir.mkdir()
+    (out_dir / "other_page_1.pdf").write_bytes(b"written by another job")
+    job = BatchJob(BatchOperationType.SPLIT, [str(source)], str(out_dir), {"mode": "pages"})
+
+    started_at = time.time()
+    for n in (1, 2):
+        (out_dir / f"report_page_{n}.pdf").write_bytes(b"page")
+    fingerprint = cache.fingerprint(job)
+    cache.record(fingerprint, job, "Split", started_at)
+    assert cache.lookup(fingerprint) == "Split"
+
+    os.remove(out_dir / "other_page_1.pdf")
+    assert cache.lookup(fingerprint) == "Split"
+    os.remove(out_dir / "report_page_2.pdf")
+    assert cache.lookup(fingerprint) is None
@@ -0,0 +1,75 @@
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from core.batch_engine import BatchJob, BatchOperationType, _operation_slot
+from excode import server as server_module
+from excode.server import JobServer
+
+
+def fake_serve(job):
+    """Stands in for _serve_job: holds the operation's slot, optionally dying with it."""
+    with _operation_slot(job.operation_type):
+        time.sleep(job.params.get("sleep", 0))
+        if job.params.get("crash"):
+            os._exit(1)
+    return True, f"done {job.params['name']}", None
+
+
+def job(op, name, priority=0, **params):
+    return BatchJob(op, [f"/tmp/{name}.pdf"], f"/tmp/{name}_out.pdf", {"name": name, **params}, priority)
+
+
+def run_jobs(server, jobs, timeout=60):
+    """Run jobs on the server without a socket; returns {ref: (success, message)}."""
+    events = queue.Queue()
+    server.warm_up()
+    threading.Thread(target=server._dispatch_loop, daemon=True).start()
+    try:
+        for ref, item in enumerate(jobs):
+            server.submit(item, ref, events.put)
+        results = {}
+        deadline = time.monotonic() + timeout
+        while len(results) < len(jobs):
+            event = events.get(timeout=max(0.1, deadline - time.monotonic()))
+            if event["event"] == "completed":
+                results[event["ref"]] = (event["success"], event["message"])
+        return results
+    finally:
+        with server._cond:
+            server._stopping = True
+            server._cond.notify_all()
+        server._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def test_worker_crash_fails_only_the_crashing_job(monkeypatch):
+    monkeypatch.setattr(server_module, "_serve_job", fake_serve)
+    server = JobServer(address=("127.0.0.1", 0), max_workers=2)
+    results = run_jobs(server, [
+        job(BatchOperationType.COMPRESS, "innocent", priority=1, sleep=1.0),
+        job(BatchOperationType.OCR, "crash", sleep=0.3, crash=True),
+        # Needs the OCR slot the crashed worker was holding
+        job(BatchOperationType.OCR, "after"),
+    ])
+
+    assert results[0] == (True, "done innocent")
+    assert results[1] == (False, "Worker process crashed")
+    assert results[2] == (True, "done after")
+    assert server.status()["running"] == 0
+
+
+@pytest.mark.parametrize("text", ["0.0.0.0:8765", "192.168.1.5:8765", "example.com:8765", "[::]:8765"])
+def test_remote_addresses_are_rejected(text):
+    with pytest.raises(ValueError):
+        server_module.parse_address(text)
+
+
+def test_loopback_addresses_are_accepted():
+    assert server_module.parse_address(":8765") == ("127.0.0.1", 8765)
+    assert server_module.parse_address("localhost:8765") == ("localhost", 8765)
+    assert server_module.parse_address("[::1]:8765") == ("::1", 8765)
+    with pytest.raises(ValueError):
+        JobServer(address=("0.0.0.0", 8765))
@@ -0,0 +1,25 @@
+import sys
+
+from core.lazy_import import lazy_import
+from ui.startup_profiler import ImportTimer
+
+
+def test_lazy_import_leaves_no_open_frame(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    timer = ImportTimer()
+    timer.install()
+    try:
+        colorsys = lazy_import("colorsys")
+        assert timer._stack() == []  # Not executed yet, nothing left open
+
+        import json.tool  # noqa: F401 - an unrelated import in between
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0  # Executed here
+    finally:
+        timer.uninstall()
+        sys.modules.pop("colorsys", None)
+
+    assert timer._stack() == []
+    records = [r for r in timer.report() if r["module"] == "colorsys"]
+    assert len(records) == 1
+    assert records[0]["depth"] == 0
+    assert records[0]["cumulative_ms"] >= records[0]["self_ms"] >= 0
@@ -0,0 +1,78 @@
+import os
+import time
+
+import fitz
+
+from core.thumbnail_cache import PageHasher, ThumbnailCache
+
+PAGES = 600
+ZOOM = 0.25
+
+
+def linked_pdf(path, pages=PAGES):
+    """Every page links to the previous and the next page."""
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {n + 1}")
+    for n, page in enumerate(doc):
+        if n + 1 < pages:
+            page.insert_link({"kind": fitz.LINK_GOTO, "page": n + 1, "from": fitz.Rect(500, 750, 580, 780)})
+        if n:
+            page.insert_link({"kind": fitz.LINK_GOTO, "page": n - 1, "from": fitz.Rect(20, 750, 100, 780)})
+    doc.save(path)
+    doc.close()
+
+
+def keys(path, order):
+    with fitz.open(path) as doc:
+        hasher = PageHasher(doc)
+        return {n: hasher.page_key(n, ZOOM) for n in order}
+
+
+def test_cross_linked_pages_do_not_recurse(tmp_path):
+    path = str(tmp_path / "linked.pdf")
+    linked_pdf(path)
+    with fitz.open(path) as doc:
+        assert PageHasher(doc).page_key(0, ZOOM)
+
+
+def test_keys_do_not_depend_on_visit_order(tmp_path):
+    path = str(tmp_path / "linked.pdf")
+    linked_pdf(path, pages=50)
+    assert keys(path, range(50)) == keys(path, reversed(range(50)))
+
+
+def test_editing_a_page_keeps_the_keys_of_pages_linking_to_it(tmp_path):
+    path, edited = str(tmp_path / "linked.pdf"), str(tmp_path / "edited.pdf")
+    linked_pdf(path, pages=50)
+    with fitz.open(path) as doc:
+        doc[10].insert_text((72, 144), "Changed")
+        doc.save(edited, garbage=3, deflate=True)
+
+    before, after = keys(path, range(50)), keys(edited, range(50))
+    assert before[10] != after[10]
+    assert all(before[n] == after[n] for n in range(50) if n != 10)
+
+
+def test_prune_only_when_due(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=1000)
+    for n in range(8):
+        cache.put(f"{n:02d}" * 32, b"x" * 100)
+    assert cache.prune_if_due()  # Never pruned before
+    assert cache._disk_usage() == 800
+
+    for n in range(8, 12):
+        path = cache._path(f"{n:02d}" * 32)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:  # Written by another instance, behind put()'s back
+            f.write(b"x" * 100)
+    assert not ThumbnailCache(str(tmp_path), max_bytes=1000).prune_if_due()
+    assert cache._disk_usage() == 1200
+
+    stamp = os.path.join(str(tmp_path), ThumbnailCache.PRUNE_STAMP)
+    old = time.time() - ThumbnailCache.PRUNE_INTERVAL - 1
+    os.utime(stamp, (old, old))
+    assert ThumbnailCache(str(tmp_path), max_bytes=1000).prune_if_due()
+    assert cache._disk_usage() == 800
+    assert os.path.exists(stamp)